@@ -1,89 +1,35 @@
 import { useState, useEffect } from 'react';
-import type { Item, MaterialQuantity } from './types';
+import type { Item, DataBundle, DataManifest, IconSprite } from './types';
 import MaterialSelector from './components/MaterialSelector';
 import ItemResultCard from './components/ItemResultCard';
 import { t } from './i18n';
 import { translateMaterialName } from './translations';
 
 const STORAGE_KEY = 'arc-raiders-needed-materials';
+// Used when there is no data-manifest.json (e.g. before build_data_manifest.py ran)
+const DEFAULT_DATA_FILES: DataManifest['files'] = {
+  bundle: '/data-bundle.json',
+  sprite: '/icons/build/sprite.json',
+};
 
-// Parse recycle string like "1x Wires, 2x Metal Parts" or "5x Chemicals 2x Oil" into MaterialQuantity[]
-// Handles both comma-separated and space-separated formats
-function parseRecycleString(recycleStr: string): MaterialQuantity[] {
-  if (recycleStr === 'Cannot be recycled' || !recycleStr) {
-    return [];
-  }
-  
-  const materials: MaterialQuantity[] = [];
-  
-  // Use regex to find all "Nx Material" patterns, even when commas are missing
-  // Pattern: (\d+)x\s+ followed by material name (until next \d+x or end of string)
-  const pattern = /(\d+)x\s+([^,\d]+?)(?=\s*\d+x\s+|,|$)/g;
-  let match;
-  
-  while ((match = pattern.exec(recycleStr)) !== null) {
-    const material = match[2].trim();
-    // Only add if material name is not empty
-    if (material) {
-      materials.push({
-        material: material,
-        quantity: parseInt(match[1], 10),
-      });
-    }
-  }
-  
-  return materials;
-}
-
-// Get all unique materials from all items
-function getAllMaterials(items: Item[]): string[] {
-  const materialsSet = new Set<string>();
-  
-  items.forEach(item => {
-    if (item.recycles && item.recycles !== 'Cannot be recycled') {
-      const materials = parseRecycleString(item.recycles);
-      materials.forEach(m => materialsSet.add(m.material));
-    }
-  });
-  
-  return Array.from(materialsSet).sort();
-}
-
-// Find items that produce a specific material
-function findItemsProducingMaterial(items: Item[], material: string): Array<{
+// Items that produce a material, most per item first (pre-sorted in the bundle)
+function findItemsProducingMaterial(bundle: DataBundle, material: string): Array<{
   item: Item;
   materialQuantity: number;
 }> {
-  const results: Array<{
-    item: Item;
-    materialQuantity: number;
-  }> = [];
-  
-  items.forEach(item => {
-    if (item.recycles && item.recycles !== 'Cannot be recycled') {
-      const materials = parseRecycleString(item.recycles);
-      const materialMatch = materials.find(m => m.material === material);
-      
-      if (materialMatch) {
-        results.push({
-          item,
-          materialQuantity: materialMatch.quantity,
-        });
-      }
-    }
-  });
-  
-  // Sort by material quantity (most per item first)
-  results.sort((a, b) => b.materialQuantity - a.materialQuantity);
-  
-  return results;
+  return (bundle.producers[material] ?? []).map(([itemIndex, quantity]) => ({
+    item: bundle.items[itemIndex],
+    materialQuantity: quantity,
+  }));
 }
 
 function App() {
-  const [items, setItems] = useState<Item[]>([]);
+  const [bundle, setBundle] = useState<DataBundle | null>(null);
   const [selectedMaterial, setSelectedMaterial] = useState<string>('');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [sprite, setSprite] = useState<IconSprite | null>(null);
+  const [dataFiles, setDataFiles] = useState<DataManifest['files'] | null>(null);
   
   // Language selection with auto-detection and localStorage persistence
   const [language, setLanguage] = useState<'de' | 'en'>(() => {
@@ -100,22 +46,29 @@ function App() {
     return 'en';
   });
 
+  // The manifest is small and cached briefly; the content-hashed files it names are cached for good
+  useEffect(() => {
+    fetch('/data-manifest.json')
+      .then(res => (res.ok ? res.json() : null))
+      .then((data: DataManifest | null) => setDataFiles(data?.files?.bundle ? data.files : DEFAULT_DATA_FILES))
+      .catch(() => setDataFiles(DEFAULT_DATA_FILES));
+  }, []);
+
   useEffect(() => {
+    if (!dataFiles) return;
     setLoading(true);
-    fetch('/items.json')
+    fetch(dataFiles.bundle)
       .then(res => {
         if (!res.ok) throw new Error(`HTTP error! status: ${res.status}`);
         return res.json();
       })
       .then(data => {
         // Validate data structure
-        if (!Array.isArray(data)) {
+        if (!data || !Array.isArray(data.items) || !Array.isArray(data.materials) || !data.producers) {
           throw new Error('Invalid data format');
         }
-        // Limit items to prevent memory issues (safety check)
-        const items = data.slice(0, 1000);
-        console.log('Items loaded:', items.length);
-        setItems(items);
+        console.log('Items loaded:', data.items.length);
+        setBundle(data);
         setLoading(false);
       })
       .catch(err => {
@@ -123,7 +76,16 @@ function App() {
         setError(err.message);
         setLoading(false);
       });
-  }, []);
+  }, [dataFiles]);
+
+  // Load the icon sprite map; without it the cards fall back to single images
+  useEffect(() => {
+    if (!dataFiles) return;
+    fetch(dataFiles.sprite ?? DEFAULT_DATA_FILES.sprite!)
+      .then(res => (res.ok ? res.json() : null))
+      .then(data => setSprite(data))
+      .catch(() => setSprite(null));
+  }, [dataFiles]);
 
   // Load saved material selection
   useEffect(() => {
@@ -152,9 +114,9 @@ function App() {
     localStorage.setItem('arc-raiders-language', language);
   }, [language]);
 
-  const allMaterials = getAllMaterials(items);
-  const itemsProducingMaterial = selectedMaterial
-    ? findItemsProducingMaterial(items, selectedMaterial)
+  const allMaterials = bundle ? bundle.materials : [];
+  const itemsProducingMaterial = bundle && selectedMaterial
+    ? findItemsProducingMaterial(bundle, selectedMaterial)
     : [];
 
   if (loading) {
@@ -243,6 +205,7 @@ function App() {
                     material={selectedMaterial}
                     materialQuantity={result.materialQuantity}
                     language={language}
+                    sprite={sprite}
                   />
                 ))}
               </div>
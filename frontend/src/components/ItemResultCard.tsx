@@ -1,11 +1,10 @@
-import type { Item } from '../types';
+import type { Item, IconSprite } from '../types';
 import { t } from '../i18n';
 import {
   translateItemName,
   translateMaterialName,
   translateCategoryName,
   translateRarityName,
-  materialTranslations,
 } from '../translations';
 
 interface ItemResultCardProps {
@@ -13,6 +12,7 @@ interface ItemResultCardProps {
   material: string;
   materialQuantity: number;
   language?: 'de' | 'en';
+  sprite?: IconSprite | null;
 }
 
 const rarityColors: Record<string, string> = {
@@ -21,7 +21,6 @@ const rarityColors: Record<string, string> = {
   Rare: 'bg-blue-500',
   Epic: 'bg-purple-500',
   Legendary: 'bg-yellow-500',
-  Uncomon: 'bg-green-500',
 };
 
 export default function ItemResultCard({
@@ -29,8 +28,11 @@ export default function ItemResultCard({
   material,
   materialQuantity,
   language = 'de',
+  sprite = null,
 }: ItemResultCardProps) {
   const rarityColor = rarityColors[item.rarity] || 'bg-gray-500';
+  const spriteIcon = item.image ? sprite?.icons[item.image] : undefined;
+  const spriteSheet = sprite && (window.devicePixelRatio > 1 ? sprite.sheets['2x'] : sprite.sheets['1x']);
   
   // Translate names based on language
   const translatedItemName = translateItemName(item.name, language);
@@ -38,25 +40,29 @@ export default function ItemResultCard({
   const translatedCategory = translateCategoryName(item.category, language);
   const translatedMaterial = translateMaterialName(material, language);
   
-  // Translate recycle string
-  const translateRecycleString = (recycleStr: string): string => {
-    if (recycleStr === 'Cannot be recycled' || !recycleStr) {
-      return language === 'de' ? 'Kann nicht recycelt werden' : recycleStr;
-    }
-    // Simple translation - replace material names in the string
-    let translated = recycleStr;
-    Object.entries(materialTranslations).forEach(([en, de]) => {
-      if (language === 'de') {
-        translated = translated.replace(new RegExp(en, 'g'), de);
-      }
-    });
-    return translated;
-  };
+  // Recycle yields are pre-parsed in the data bundle
+  const recycleText = item.recycles === null
+    ? '?'
+    : item.recycles.length === 0
+      ? (language === 'de' ? 'Kann nicht recycelt werden' : 'Cannot be recycled')
+      : item.recycles.map(m => `${m.quantity}x ${translateMaterialName(m.material, language)}`).join(', ');
+  const sellPrice = item.sell_price === null ? '?' : `$${item.sell_price.toLocaleString('en-US')}`;
 
   return (
     <div className="bg-gray-800 rounded-lg p-4 border border-gray-700 hover:border-gray-600 transition-colors">
       <div className="flex items-center gap-3 mb-3">
-        {item.image && !item.image.startsWith('data:') && (
+        {sprite && spriteIcon ? (
+          <div
+            role="img"
+            aria-label={translatedItemName}
+            className="w-16 h-16 flex-shrink-0"
+            style={{
+              backgroundImage: `url(${spriteSheet})`,
+              backgroundPosition: `-${spriteIcon.x}px -${spriteIcon.y}px`,
+              backgroundSize: `${sprite.width}px ${sprite.height}px`,
+            }}
+          />
+        ) : item.image && !item.image.startsWith('data:') && (
           <img
             src={item.image}
             alt={translatedItemName}
@@ -83,8 +89,8 @@ export default function ItemResultCard({
       </div>
 
       <div className="text-xs text-gray-500 space-y-1">
-        <div>{t('sell', language)}: {item.sell_price}</div>
-        <div className="text-gray-400">{t('recyclesTo', language)}: {translateRecycleString(item.recycles)}</div>
+        <div>{t('sell', language)}: {sellPrice}</div>
+        <div className="text-gray-400">{t('recyclesTo', language)}: {recycleText}</div>
       </div>
     </div>
   );
@@ -36,6 +36,5 @@ export const rarityTranslations: Record<string, string> = {
   "Rare": "Translation here",
   "Epic": "Translation here",
   "Legendary": "Translation here",
-  "Uncomon": "Translation here", // Typo in original data
 };
 
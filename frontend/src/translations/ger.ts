@@ -94,6 +94,5 @@ export const rarityTranslations: Record<string, string> = {
   "Rare": "Selten",
   "Epic": "Episch",
   "Legendary": "Legendär",
-  "Uncomon": "Ungewöhnlich", // Typo in original data
 };
 
@@ -1,8 +1,9 @@
+// Item as normalized by scripts/build_data_bundle.py
 export interface Item {
   name: string;
-  rarity: 'Common' | 'Uncommon' | 'Rare' | 'Epic' | 'Legendary' | 'Uncomon';
-  recycles: string;
-  sell_price: string;
+  rarity: 'Common' | 'Uncommon' | 'Rare' | 'Epic' | 'Legendary';
+  recycles: MaterialQuantity[] | null; // [] = cannot be recycled, null = unknown
+  sell_price: number | null;
   category: string;
   image?: string;
   url?: string;
@@ -10,7 +11,33 @@ export interface Item {
   keep_for_quests?: string;
 }
 
+// Sprite atlas built by scripts/build_icons.py (public/icons/build/sprite.json)
+export interface IconSprite {
+  size: number;
+  width: number;
+  height: number;
+  sheets: Record<string, string>;
+  icons: Record<string, { x: number; y: number }>;
+}
+
 export interface MaterialQuantity {
   material: string;
   quantity: number;
 }
+
+// Pre-indexed data bundle built by scripts/build_data_bundle.py (public/data-bundle.json)
+export interface DataBundle {
+  version: number;
+  items: Item[];
+  materials: string[]; // sorted
+  producers: Record<string, Array<[itemIndex: number, quantity: number]>>; // most per item first
+}
+
+// Content-hashed URLs of the data files (scripts/build_data_manifest.py, public/data-manifest.json)
+export interface DataManifest {
+  version: number;
+  files: {
+    bundle: string;
+    sprite?: string;
+  };
+}
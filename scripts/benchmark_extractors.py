@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmark the wiki extractors offline on recorded pages
+Runs every extractor (trader, workshop and project data, crafting and
+upgrade recipes) against recorded wiki pages instead of the network and
+reports pages/sec, table rows/sec and peak memory per extractor. The
+extracted records are compared with golden JSON files, so the scrapers can
+be optimized without changing their output.
+
+Fixtures live in benchmarks/fixtures/ (pages in the HTTP cache format plus
+a snapshot of workshop_level_ups.json), golden files in benchmarks/golden/.
+--record fetches the pages from the wiki again and rewrites both.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import http_cache
+import page_parser
+import wiki_api
+import extract_all_data
+import extract_crafting_recipes as crafting
+import extract_upgrade_recipes as upgrade
+import extract_recipes
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+BENCHMARK_DIR = os.path.join(project_root, 'benchmarks')
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+PAGES_DIR = os.path.join(FIXTURES_DIR, 'http')
+WORKSHOP_FIXTURE = os.path.join(FIXTURES_DIR, 'workshop_level_ups.json')
+GOLDEN_DIR = os.path.join(BENCHMARK_DIR, 'golden')
+ACTUAL_DIR = os.path.join(project_root, '.cache', 'benchmark')
+
+EXTRACTORS = {
+    'trader': extract_all_data.extract_trader_data,
+    'workshop': extract_all_data.extract_workshop_data,
+    'projects': extract_all_data.extract_projects_data,
+    'crafting': crafting.extract_crafting_recipes,
+    'upgrade': upgrade.extract_upgrade_recipes,
+    'recipes': extract_recipes.extract_recipes,
+}
+
+class RequestLog:
+    """Wraps http_cache.cached_get to count the pages an extractor requests"""
+
+    def __init__(self):
+        self.pages = []   # URLs answered with 200
+        self.queries = 0  # Title queries (see wiki_api)
+        self.misses = 0   # Everything else (not recorded, 404, ...)
+        self._get = None
+
+    def __enter__(self):
+        self._get = http_cache.cached_get
+
+        def cached_get(url, *args, **kwargs):
+            response = self._get(url, *args, **kwargs)
+            if 'action=query' in url:
+                self.queries += 1
+            elif response.status_code == 200:
+                self.pages.append(url)
+            else:
+                self.misses += 1
+            return response
+
+        http_cache.cached_get = cached_get
+        return self
+
+    def __exit__(self, *exc_info):
+        http_cache.cached_get = self._get
+
+def normalize(result):
+    """Extractor result as plain JSON data (tuples become lists)"""
+    return json.loads(json.dumps(result, ensure_ascii=False))
+
+def count_records(result):
+    """Extracted records: materials, projects, station levels or items with a recipe"""
+    if isinstance(result, dict) and 'stations' in result:
+        return sum(len(levels) for levels in result['stations'].values())
+    if isinstance(result, dict):
+        return sum(1 for recipe in result.values() if recipe.get('required_materials'))
+    if result and all(isinstance(value, dict) and 'material' not in value and 'name' not in value for value in result):
+        return sum(count_records(value) for value in result)  # (crafting, upgrade) of extract_recipes
+    return len(result)
+
+def run_extractor(extract, concurrency):
+    """Run an extractor once on a fresh copy of the fixtures.
+
+    Returns (result, seconds, request log). The copy keeps the parse cache of
+    earlier runs out of the measurement.
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        shutil.copytree(PAGES_DIR, cache_dir, dirs_exist_ok=True)
+        http_cache.configure(offline=True, cache_dir=cache_dir)
+        wiki_api.configure()  # Forget titles resolved in the previous run
+        kwargs = {} if extract.__module__ == 'extract_all_data' else {'concurrency': concurrency}
+        with RequestLog() as log, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = extract(**kwargs)
+            seconds = time.perf_counter() - start
+    return normalize(result), seconds, log
+
+def count_rows(urls):
+    """Table rows in the article content of the given recorded pages"""
+    cache = http_cache.HttpCache(PAGES_DIR, offline=True)
+    rows = 0
+    for url in urls:
+        _, body = cache.load(url)
+        main_content = page_parser.parse_main_content(body) if body else None
+        if main_content is not None:
+            rows += len(main_content.find_all('tr'))
+    return rows
+
+def measure_peak(extract, concurrency):
+    """tracemalloc peak in KiB of one extractor run (tracing slows the run, so it is not timed)"""
+    tracemalloc.start()
+    run_extractor(extract, concurrency)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def golden_path(name):
+    return os.path.join(GOLDEN_DIR, f"{name}.json")
+
+def load_golden(name):
+    try:
+        with open(golden_path(name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+def record_fixtures(names, concurrency):
+    """Fetch the pages the extractors read from the wiki and store them as fixtures"""
+    print(f"📼 Recording fixtures to {os.path.relpath(FIXTURES_DIR, project_root)}/ ...")
+    if os.path.exists(PAGES_DIR):
+        shutil.rmtree(PAGES_DIR)
+    os.makedirs(PAGES_DIR)
+    shutil.copy(os.path.join(project_root, 'data', 'workshop_level_ups.json'), WORKSHOP_FIXTURE)
+    # Fetching into an empty cache directory stores every page that answered 200
+    http_cache.configure(cache_dir=PAGES_DIR)
+    wiki_api.configure()
+    for name in names:
+        print(f"  {name}...")
+        with RequestLog() as log, contextlib.redirect_stdout(io.StringIO()):
+            extract = EXTRACTORS[name]
+            extract() if extract.__module__ == 'extract_all_data' else extract(concurrency=concurrency)
+        print(f"  ✓ {name}: {len(log.pages)} pages, {log.queries} title queries, {log.misses} missing")
+    for path in glob.glob(os.path.join(PAGES_DIR, '*.parsed.json')):
+        os.remove(path)
+    print(f"✓ Recorded {len(glob.glob(os.path.join(PAGES_DIR, '*.body')))} pages")
+
+def benchmark(names, repeat, concurrency, update_golden):
+    """Run and check every extractor; returns True if all match their golden files"""
+    print("=" * 60)
+    print(f"Extractor benchmark: {len(glob.glob(os.path.join(PAGES_DIR, '*.body')))} recorded pages, "
+          f"parser: {page_parser.get_backend()}, {'async x' + str(concurrency) if concurrency else 'sequential'}")
+    print("=" * 60)
+
+    ok = True
+    for name in names:
+        extract = EXTRACTORS[name]
+        times = []
+        for _ in range(repeat):
+            result, seconds, log = run_extractor(extract, concurrency)
+            times.append(seconds)
+        seconds = statistics.median(times)
+        rows = count_rows(log.pages)
+        peak = measure_peak(extract, concurrency)
+
+        golden = load_golden(name)
+        if update_golden:
+            write_json(golden_path(name), result)
+            status = '📝 golden updated'
+        elif golden is None:
+            ok = False
+            status = '✗ no golden file (accept the output with --update-golden)'
+        elif golden == result:
+            status = '✓ matches golden'
+        else:
+            ok = False
+            actual_path = os.path.join(ACTUAL_DIR, f"{name}.json")
+            write_json(actual_path, result)
+            status = f"✗ differs from golden (output: {os.path.relpath(actual_path, project_root)})"
+
+        pages = len(log.pages)
+        print(f"\n{name}: {count_records(result)} records, {pages} pages, {rows} rows, "
+              f"{log.queries} title queries, {log.misses} missing pages")
+        print(f"  {seconds * 1000:8.1f} ms  {pages / seconds:8.1f} pages/s  {rows / seconds:9.0f} rows/s  "
+              f"{peak:9.0f} KiB peak")
+        print(f"  {status}")
+
+    print(f"\n{'='*60}")
+    print("✓ All extractors match their golden files" if ok else "❌ Extracted records changed or unchecked")
+    print("Note: tracemalloc only sees Python allocations, not memory used inside lxml/lexbor.")
+    print(f"{'='*60}")
+    return ok
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the wiki extractors offline on recorded pages")
+    parser.add_argument('extractors', nargs='*', metavar='extractor',
+                        help=f"Extractors to run (default: all of {', '.join(EXTRACTORS)})")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per extractor (default: 3)")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="Run the recipe crawls async with this many requests per host")
+    parser.add_argument('--record', action='store_true',
+                        help="Fetch the pages from the wiki again and rewrite fixtures and golden files")
+    parser.add_argument('--update-golden', action='store_true',
+                        help="Accept the current output as the new golden files")
+    page_parser.add_parser_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    page_parser.configure_from_args(args)
+    names = args.extractors or list(EXTRACTORS)
+    unknown = [name for name in names if name not in EXTRACTORS]
+    if unknown:
+        raise SystemExit(f"Unknown extractor(s): {', '.join(unknown)} (available: {', '.join(EXTRACTORS)})")
+
+    # Recipe extractors read the item list from the recorded snapshot
+    crafting.WORKSHOP_FILE = WORKSHOP_FIXTURE
+    if args.record:
+        record_fixtures(names, args.concurrency)
+    elif not os.path.exists(WORKSHOP_FIXTURE) or not glob.glob(os.path.join(PAGES_DIR, '*.body')):
+        print("❌ No fixtures found - record them with: python3 scripts/benchmark_extractors.py --record")
+        sys.exit(1)
+
+    ok = benchmark(names, max(1, args.repeat), args.concurrency, args.update_golden or args.record)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
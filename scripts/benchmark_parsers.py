@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on real wiki pages
+Compares parse time and peak memory per page against the old full-page
+BeautifulSoup(html.parser) parse and checks that every backend extracts
+the same recipe records and table contents.
+
+Pages are taken from the HTTP cache (.cache/http/) unless HTML files are given.
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+import http_cache
+import page_parser
+import extract_crafting_recipes as crafting
+import extract_upgrade_recipes as upgrade
+
+def load_cached_pages(cache_dir):
+    """Yield (url, body) for every cached HTML page"""
+    for meta_path in sorted(glob.glob(os.path.join(cache_dir, '*.json'))):
+        if meta_path.endswith('.parsed.json'):
+            continue
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        content_type = {k.lower(): v for k, v in meta.get('headers', {}).items()}.get('content-type', '')
+        if 'text/html' not in content_type:
+            continue
+        with open(meta_path[:-len('.json')] + '.body', 'rb') as f:
+            yield meta['url'], f.read()
+
+def load_files(paths):
+    for path in paths:
+        with open(path, 'rb') as f:
+            yield path, f.read()
+
+def parse_full_html_parser(content):
+    """The pre-backend approach: build the whole page, then look up the article"""
+    soup = BeautifulSoup(content, 'html.parser')
+    return soup.find('div', class_='mw-parser-output')
+
+def extract_records(main_content, craftable_items, upgrade_items):
+    """Everything the scrapers read from a page: recipe records and table cell texts"""
+    if main_content is None:
+        return None
+    tables = []
+    for table in main_content.find_all('table'):
+        tables.append([
+            [cell.get_text(separator='\n').strip() for cell in row.find_all(['td', 'th'])]
+            for row in table.find_all('tr')
+        ])
+    return {
+        'crafting': [list(r) for r in crafting.parse_recipe_tables(main_content, craftable_items)],
+        'upgrade': [list(r) for r in upgrade.parse_upgrade_tables(main_content, upgrade_items)],
+        'tables': tables,
+    }
+
+def measure(parse, content, repeat):
+    """Median parse time in ms and tracemalloc peak in KiB"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(content)
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on wiki pages")
+    parser.add_argument('files', nargs='*', help="HTML files to benchmark (default: all pages in the HTTP cache)")
+    parser.add_argument('--cache-dir', default=http_cache.DEFAULT_CACHE_DIR)
+    parser.add_argument('--repeat', type=int, default=5, help="Parse runs per page and backend (default: 5)")
+    parser.add_argument('--limit', type=int, default=None, help="Only benchmark the first N pages")
+    args = parser.parse_args()
+
+    pages = list(load_files(args.files) if args.files else load_cached_pages(args.cache_dir))[:args.limit]
+    if not pages:
+        print("❌ No pages found - run a scraper first to fill the HTTP cache, or pass HTML files")
+        return
+
+    craftable_items = crafting.load_craftable_items()
+    upgrade_items = upgrade.add_upgrade_items(craftable_items)
+
+    backends = [('full html.parser', parse_full_html_parser)]
+    for name in page_parser.available_backends():
+        backends.append((name, lambda content, name=name: page_parser.parse_main_content(content, backend=name)))
+
+    print("=" * 60)
+    print(f"Parser benchmark: {len(pages)} pages, backends: {', '.join(name for name, _ in backends)}")
+    print("=" * 60)
+
+    totals = {name: {'ms': 0.0, 'kib': 0.0, 'mismatches': 0} for name, _ in backends}
+    for url, content in pages:
+        print(f"\n{url} ({len(content) // 1024} KiB)")
+        reference = extract_records(parse_full_html_parser(content), craftable_items, upgrade_items)
+        base_ms = None
+        for name, parse in backends:
+            ms, kib = measure(parse, content, args.repeat)
+            same = extract_records(parse(content), craftable_items, upgrade_items) == reference
+            if base_ms is None:
+                base_ms = ms
+            totals[name]['ms'] += ms
+            totals[name]['kib'] = max(totals[name]['kib'], kib)
+            if not same:
+                totals[name]['mismatches'] += 1
+            print(f"  {name:18} {ms:8.1f} ms  {kib:9.0f} KiB peak  {base_ms / ms:5.1f}x  {'✓' if same else '✗ records differ'}")
+
+    print(f"\n{'='*60}")
+    print("Summary (total parse time, max peak memory):")
+    base_total = totals['full html.parser']['ms']
+    for name, _ in backends:
+        t = totals[name]
+        status = '✓ identical records' if not t['mismatches'] else f"✗ {t['mismatches']} pages differ"
+        print(f"  {name:18} {t['ms']:9.1f} ms  {t['kib']:9.0f} KiB  {base_total / t['ms']:5.1f}x  {status}")
+    print("\nNote: tracemalloc only sees Python allocations, not memory used inside lxml/lexbor.")
+    print(f"{'='*60}")
+
+if __name__ == "__main__":
+    main()
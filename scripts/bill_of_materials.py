@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Resolve craft targets into a flattened bill of raw materials
+Expands crafting and upgrade recipes recursively: "Ferro IV" needs
+"Ferro III" (upgrade_from), which needs "Ferro II", ... down to the crafting
+recipe of "Ferro I"; refined materials with a recipe (Mechanical Components,
+...) are expanded into their own materials. The recipes are walked once in
+topological order and the bill of every recipe is memoized per unit, so any
+set of targets resolves in milliseconds. A recipe that (indirectly) needs
+itself raises RecipeCycleError.
+
+Usage:
+    python3 scripts/bill_of_materials.py "Ferro IV" "2x Kettle III"
+    python3 scripts/bill_of_materials.py --station Gunsmith --tier IV
+"""
+
+import argparse
+import json
+import re
+import time
+
+import catalog
+
+TARGET_PATTERN = re.compile(r'^(\d+)\s*x\s+(.+)$')  # "2x Ferro IV"
+
+
+class RecipeCycleError(ValueError):
+    """A recipe needs itself (directly or through other recipes)"""
+
+    def __init__(self, cycle):
+        super().__init__("Recipe cycle: " + ' -> '.join(cycle))
+        self.cycle = cycle
+
+
+class Bill:
+    """Result of a resolve: raw materials, crafted intermediates and items without a recipe"""
+    __slots__ = ('targets', 'raw', 'crafted', 'missing')
+
+    def __init__(self, targets, raw, crafted, missing):
+        self.targets = targets   # {item: quantity} as requested
+        self.raw = raw           # {material: quantity}, most first
+        self.crafted = crafted   # {item: quantity} crafted on the way (targets included)
+        self.missing = missing   # {item: quantity} needed but without a known recipe
+
+    def to_dict(self):
+        return {'targets': self.targets, 'raw_materials': self.raw,
+                'crafted': self.crafted, 'missing_recipes': self.missing}
+
+
+class BomResolver:
+    """Bill-of-materials resolver over a fixed set of recipes ({item: catalog.Recipe})"""
+
+    def __init__(self, recipes, keep=()):
+        self.recipes = recipes
+        self.keep = set(keep)  # Craftable items to treat as raw materials
+        self._units = {}       # item -> (raw, crafted, missing) for one unit, filled in topological order
+
+    @property
+    def expanded(self):
+        """Number of recipes whose bill is memoized"""
+        return len(self._units)
+
+    def inputs(self, item):
+        """(material, quantity) an item's recipe consumes, including the tier it upgrades from"""
+        recipe = self.recipes[item]
+        materials = list(recipe.materials)
+        if recipe.upgrade_from and all(material != recipe.upgrade_from for material, _ in materials):
+            materials.insert(0, (recipe.upgrade_from, 1))
+        return materials
+
+    def is_craftable(self, item):
+        recipe = self.recipes.get(item)
+        return recipe is not None and bool(recipe.materials) and item not in self.keep
+
+    def topological_order(self, items):
+        """Craftable items reachable from items, each after everything it needs"""
+        order = []
+        state = {}  # item -> 'visiting' | 'done'
+        for item in items:
+            if self.is_craftable(item):
+                self._visit(item, state, order, [])
+        return order
+
+    def _visit(self, item, state, order, path):
+        if state.get(item) == 'done' or item in self._units:
+            return
+        if state.get(item) == 'visiting':
+            raise RecipeCycleError(path[path.index(item):] + [item])
+        state[item] = 'visiting'
+        path.append(item)
+        for material, _ in self.inputs(item):
+            if self.is_craftable(material):
+                self._visit(material, state, order, path)
+        path.pop()
+        state[item] = 'done'
+        order.append(item)
+
+    def unit_bill(self, item):
+        """(raw, crafted, missing) for one unit of a craftable item"""
+        for node in self.topological_order([item]):
+            raw, crafted, missing = {}, {node: 1}, {}
+            for material, quantity in self.inputs(node):
+                if self.is_craftable(material):
+                    # Needed parts come first in the order, so their bills exist already
+                    for totals, sub_totals in zip((raw, crafted, missing), self._units[material]):
+                        for name, amount in sub_totals.items():
+                            totals[name] = totals.get(name, 0) + quantity * amount
+                elif material in self.recipes and material not in self.keep:
+                    missing[material] = missing.get(material, 0) + quantity
+                else:
+                    raw[material] = raw.get(material, 0) + quantity
+            self._units[node] = (raw, crafted, missing)
+        return self._units[item]
+
+    def resolve(self, targets):
+        """Bill for {item: quantity} (or a list of items, one each)"""
+        if not isinstance(targets, dict):
+            targets = {item: 1 for item in targets}
+        raw, crafted, missing = {}, {}, {}
+        for item, quantity in targets.items():
+            if self.is_craftable(item):
+                parts = self.unit_bill(item)
+            elif item in self.keep:
+                parts = ({item: 1}, {}, {})
+            else:
+                parts = ({}, {}, {item: 1})
+            for totals, sub_totals in zip((raw, crafted, missing), parts):
+                for name, amount in sub_totals.items():
+                    totals[name] = totals.get(name, 0) + quantity * amount
+        return Bill(dict(targets), sort_totals(raw), sort_totals(crafted), sort_totals(missing))
+
+
+def sort_totals(totals):
+    """Most first, then by name"""
+    return dict(sorted(totals.items(), key=lambda entry: (-entry[1], entry[0])))
+
+
+def parse_target(text):
+    """("Ferro IV", 1) of "Ferro IV", ("Ferro IV", 2) of "2x Ferro IV" """
+    match = TARGET_PATTERN.match(text.strip())
+    if match:
+        return match.group(2).strip(), int(match.group(1))
+    return text.strip(), 1
+
+
+def select_targets(data, station=None, level=None, tier=None):
+    """Listed items of a station/level; with tier, the given tier of every upgrade chain among them"""
+    targets = []
+    for listing in data.listings:
+        if (station and listing.station != station) or (level and listing.level != level):
+            continue
+        item = listing.item
+        if tier:
+            chain = data.chain_of.get(item)
+            if not chain:
+                continue
+            item = f"{chain[0][:-2]} {tier}"
+        if item not in targets:
+            targets.append(item)
+    return targets
+
+
+def print_bill(bill):
+    print(f"\n{'='*60}")
+    print(f"Bill of materials for {sum(bill.targets.values())} items:")
+    for item, quantity in bill.targets.items():
+        print(f"  🎯 {quantity}x {item}")
+    print(f"\n📦 Raw materials ({len(bill.raw)}):")
+    for material, quantity in bill.raw.items():
+        print(f"  {quantity:>6}x {material}")
+    intermediates = {item: quantity for item, quantity in bill.crafted.items() if item not in bill.targets}
+    if intermediates:
+        print(f"\n🔧 Crafted on the way ({len(intermediates)}):")
+        for item, quantity in intermediates.items():
+            print(f"  {quantity:>6}x {item}")
+    if bill.missing:
+        print(f"\n⚠️  No recipe known ({len(bill.missing)}), not expanded:")
+        for item, quantity in bill.missing.items():
+            print(f"  {quantity:>6}x {item}")
+    print(f"{'='*60}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Resolve craft targets into a flattened bill of raw materials")
+    parser.add_argument('targets', nargs='*', metavar='target',
+                        help='Items to craft, optionally with a count ("2x Ferro IV")')
+    parser.add_argument('--station', help="Add all items listed at this station (e.g. Gunsmith)")
+    parser.add_argument('--level', help='Only the items of this station level (e.g. "Level 2")')
+    parser.add_argument('--tier', choices=catalog.UPGRADE_TIERS,
+                        help="Take this tier of every upgrade chain among the selected items")
+    parser.add_argument('--keep', action='append', default=[], metavar='ITEM',
+                        help="Do not expand this craftable item (e.g. if you have it in stock); repeatable")
+    parser.add_argument('--json', metavar='FILE', help="Also write the bill as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    data = catalog.get_catalog()
+
+    targets = {}
+    for text in args.targets:
+        item, quantity = parse_target(text)
+        targets[item] = targets.get(item, 0) + quantity
+    if args.station or args.level or args.tier:
+        for item in select_targets(data, args.station, args.level, args.tier):
+            targets.setdefault(item, 1)
+    if not targets:
+        raise SystemExit("No targets: name items or select them with --station/--level/--tier")
+
+    resolver = BomResolver(data.recipes, keep=args.keep)
+    started = time.perf_counter()
+    try:
+        bill = resolver.resolve(targets)
+    except RecipeCycleError as e:
+        raise SystemExit(f"❌ {e}")
+    elapsed = time.perf_counter() - started
+
+    print_bill(bill)
+    print(f"⏱️  Resolved in {elapsed * 1000:.2f} ms ({resolver.expanded} recipes expanded)")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(bill.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"💾 Bill saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Build the pre-indexed data bundle the app loads instead of items.json
+Normalizes data/items.json once at build time: recycle strings become
+structured {material, quantity} yields, sell prices become numbers and
+rarities are canonical (the wiki's "Uncomon" typo becomes "Uncommon").
+Material spellings that only differ in case ("Metal parts") are merged.
+
+The bundle also carries the sorted material list and a material -> producers
+index (item index and quantity, most per item first), so the app looks up
+the items for a material without parsing anything.
+
+Output: frontend/public/data-bundle.json
+"""
+
+import argparse
+import json
+import os
+
+from catalog import canonical_rarity, material_spellings, merge_yields, parse_recycles, parse_sell_price
+
+# Configuration
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+ITEMS_JSON = os.path.join(project_root, 'data', 'items.json')
+BUNDLE_JSON = os.path.join(project_root, 'frontend', 'public', 'data-bundle.json')
+BUNDLE_VERSION = 1  # Bump when the bundle layout changes
+
+def build_bundle(items):
+    """The bundle: normalized items, sorted materials and the material -> producers index"""
+    parsed = [parse_recycles(item.get('recycles')) for item in items]
+    spellings = material_spellings(parsed)
+
+    bundle_items = []
+    producers = {}
+    for index, (item, yields) in enumerate(zip(items, parsed)):
+        rarity = canonical_rarity(item.get('rarity'))
+        if rarity is None:
+            print(f"  ⚠️  {item.get('name', 'Unknown')}: unknown rarity {item.get('rarity')!r}")
+            rarity = item.get('rarity')
+        recycles = None
+        if yields is not None:
+            merged = merge_yields(yields, spellings)
+            recycles = [{'material': material, 'quantity': quantity} for material, quantity in merged]
+            for material, quantity in merged:
+                producers.setdefault(material, []).append([index, quantity])
+        elif item.get('recycles'):
+            print(f"  ⚠️  {item.get('name', 'Unknown')}: cannot parse recycles {item['recycles']!r}")
+
+        bundle_item = dict(item, rarity=rarity, recycles=recycles,
+                           sell_price=parse_sell_price(item.get('sell_price')))
+        bundle_items.append(bundle_item)
+
+    materials = sorted(producers)
+    return {
+        'version': BUNDLE_VERSION,
+        'items': bundle_items,
+        'materials': materials,
+        # Most per item first; stable, so equal quantities keep the items.json order
+        'producers': {material: sorted(producers[material], key=lambda entry: -entry[1])
+                      for material in materials},
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the pre-indexed data bundle for the app")
+    parser.add_argument('--items', default=ITEMS_JSON, help="items.json to read (default: data/items.json)")
+    parser.add_argument('--output', default=BUNDLE_JSON,
+                        help="Bundle to write (default: frontend/public/data-bundle.json)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print(f"Loading {args.items}...")
+    with open(args.items, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+
+    bundle = build_bundle(items)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    # The app fetches the bundle on startup - keep it compact
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, separators=(',', ':'), ensure_ascii=False)
+
+    links = sum(len(entries) for entries in bundle['producers'].values())
+    print(f"✅ {len(bundle['items'])} items, {len(bundle['materials'])} materials, {links} producer entries")
+    print(f"💾 Saved to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
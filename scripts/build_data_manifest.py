@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Publish the data files the app loads under content-hashed names
+Copies the data bundle and the icon sprite map to
+frontend/public/data/<name>.<content hash>.json and writes
+frontend/public/data-manifest.json, which maps them to their current URLs.
+nginx serves /data/ as immutable for a year and the small manifest with a
+short TTL, so a data refresh only invalidates the files that changed.
+
+Files of the previous manifest are kept, so clients still holding it can
+finish loading; older ones are removed.
+"""
+
+import hashlib
+import json
+import os
+
+# Configuration
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+PUBLIC_DIR = os.path.join(project_root, 'frontend', 'public')
+DATA_DIR = os.path.join(PUBLIC_DIR, 'data')
+MANIFEST_JSON = os.path.join(PUBLIC_DIR, 'data-manifest.json')
+MANIFEST_VERSION = 1
+# Manifest key -> file below frontend/public
+DATA_FILES = {
+    'bundle': 'data-bundle.json',
+    'sprite': 'icons/build/sprite.json',
+}
+
+def public_path(path):
+    """URL path of a file below frontend/public"""
+    return '/' + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, '/')
+
+def publish_file(source):
+    """Copy a file to data/<stem>.<hash>.json unless it is there already; returns the copy's path"""
+    with open(source, 'rb') as f:
+        data = f.read()
+    stem, ext = os.path.splitext(os.path.basename(source))
+    path = os.path.join(DATA_DIR, f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}")
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        print(f"  📄 {public_path(path)}")
+    return path
+
+def load_manifest():
+    try:
+        with open(MANIFEST_JSON, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def remove_old_files(keep):
+    """Delete hashed files (and their .gz/.br) referenced by neither manifest; returns the count"""
+    removed = 0
+    for name in os.listdir(DATA_DIR):
+        base = name[:-3] if name.endswith(('.gz', '.br')) else name
+        if f"/data/{base}" not in keep:
+            os.remove(os.path.join(DATA_DIR, name))
+            removed += 1
+    return removed
+
+def build_manifest():
+    """Publish all data files and write the manifest; returns it"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    previous = load_manifest()
+    files = {}
+    for key, filename in DATA_FILES.items():
+        source = os.path.join(PUBLIC_DIR, filename)
+        if not os.path.exists(source):
+            print(f"  ⚠️  {filename} is missing, skipping")
+            continue
+        files[key] = public_path(publish_file(source))
+
+    manifest = {'version': MANIFEST_VERSION, 'files': files}
+    if manifest == previous:
+        print("✓ Data files are up to date")
+        return manifest
+
+    with open(MANIFEST_JSON, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    changed = [key for key, path in files.items() if previous.get('files', {}).get(key) != path]
+    print(f"✅ Manifest updated ({', '.join(changed) or 'layout'} changed)")
+
+    removed = remove_old_files(set(files.values()) | set(previous.get('files', {}).values()))
+    if removed:
+        print(f"🗑️  Removed {removed} old data files")
+    return manifest
+
+if __name__ == "__main__":
+    manifest = build_manifest()
+    for key, path in manifest['files'].items():
+        print(f"  {key}: {path}")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Build web-ready item icons after download_icons.py
+Resizes every icon used in items.json to the sizes ItemResultCard renders
+(w-16 = 64px, 128px for 2x screens) and packs them into one WebP sprite atlas
+per size with a JSON coordinate map, so the app loads two sprite files
+instead of one full-size image per item. --variants also writes every
+resized icon as its own WebP (and optionally AVIF) file; the app does not
+use them, so they are not built by default.
+
+Output goes to frontend/public/icons/build/; file names carry a content hash,
+so they can be cached forever. Requires Pillow (pip install pillow).
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+
+import icon_manifest
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+# Configuration
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+ITEMS_JSON = os.path.join(project_root, 'data', 'items.json')
+ICONS_DIR = os.path.join(project_root, 'frontend', 'public', 'icons')
+BUILD_DIR = os.path.join(ICONS_DIR, 'build')
+SPRITE_JSON = os.path.join(BUILD_DIR, 'sprite.json')  # loaded by the app
+BUILD_JSON = os.path.join(BUILD_DIR, 'build.json')    # variants and build state
+ICON_SIZE = 64  # ItemResultCard: w-16 h-16
+SCALES = (1, 2)
+ENCODER_PARAMS = {
+    'webp': {'quality': 85, 'method': 6},
+    'avif': {'quality': 60},
+}
+
+def public_path(path):
+    """URL path of a file below frontend/public"""
+    return '/' + os.path.relpath(path, os.path.dirname(ICONS_DIR)).replace(os.sep, '/')
+
+def load_icon_files(items):
+    """Icon files referenced by items, {'/icons/x.png': sha256}, sorted by path"""
+    manifest = icon_manifest.IconManifest.load(ICONS_DIR)
+    icons = {}
+    for item in items:
+        image = item.get('image') or ''
+        if not image.startswith('/icons/') or image in icons:
+            continue
+        filename = image[len('/icons/'):]
+        path = os.path.join(ICONS_DIR, filename)
+        if not os.path.exists(path):
+            print(f"  ⚠️  {item.get('name', 'Unknown')}: {image} is missing, skipping")
+            continue
+        # The manifest already knows the hash of unchanged icons
+        if manifest.is_valid(filename):
+            icons[image] = manifest.icons[filename]['sha256']
+        else:
+            icons[image] = icon_manifest.file_sha256(path)
+    return dict(sorted(icons.items()))
+
+def fit_to_square(image, size):
+    """Scale an icon to fit a size x size cell (like object-contain), centered on transparency"""
+    image = image.convert('RGBA')
+    scale = min(size / image.width, size / image.height)
+    width = max(1, round(image.width * scale))
+    height = max(1, round(image.height * scale))
+    image = image.resize((width, height), Image.LANCZOS)
+    cell = Image.new('RGBA', (size, size))
+    cell.paste(image, ((size - width) // 2, (size - height) // 2))
+    return cell
+
+def save_hashed(image, stem, fmt):
+    """Encode image and write it as <stem>.<content hash>.<fmt>; returns the file name"""
+    tmp_path = os.path.join(BUILD_DIR, f"{stem}.tmp.{fmt}")
+    image.save(tmp_path, fmt.upper(), **ENCODER_PARAMS[fmt])
+    with open(tmp_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:10]
+    filename = f"{stem}.{digest}.{fmt}"
+    os.replace(tmp_path, os.path.join(BUILD_DIR, filename))
+    return filename
+
+def build_icons(formats=('webp',), force=False, with_variants=False):
+    """Build the sprite atlases (and per-icon variants); returns (sprite map, build info)"""
+    if Image is None:
+        raise SystemExit("build_icons.py needs Pillow: pip install pillow")
+    for fmt in formats:
+        if not features.check(fmt):
+            raise SystemExit(f"This Pillow build cannot write {fmt.upper()} images")
+
+    print(f"Loading {ITEMS_JSON}...")
+    with open(ITEMS_JSON, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    sources = load_icon_files(items)
+    print(f"Found {len(sources)} icons for {len(items)} items")
+
+    # Skip the build if no icon and no setting changed
+    settings = {'size': ICON_SIZE, 'scales': list(SCALES), 'formats': list(formats) if with_variants else [],
+                'encoder': ENCODER_PARAMS}
+    try:
+        with open(SPRITE_JSON, 'r', encoding='utf-8') as f:
+            previous_sprite = json.load(f)
+        with open(BUILD_JSON, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = None
+    if (not force and previous and previous.get('sources') == sources
+            and previous.get('settings') == settings
+            and all(os.path.exists(os.path.join(BUILD_DIR, name)) for name in previous.get('files', []))):
+        print("✓ Icon build is up to date")
+        return previous_sprite, previous
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    columns = max(1, math.ceil(math.sqrt(len(sources))))
+    rows = max(1, math.ceil(len(sources) / columns))
+    sheets = {scale: Image.new('RGBA', (columns * ICON_SIZE * scale, rows * ICON_SIZE * scale))
+              for scale in SCALES}
+
+    icons = {}
+    variants = {}
+    files = []
+    for index, (image_path, sha256) in enumerate(sources.items()):
+        x = (index % columns) * ICON_SIZE
+        y = (index // columns) * ICON_SIZE
+        icons[image_path] = {'x': x, 'y': y}
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        with Image.open(os.path.join(ICONS_DIR, image_path[len('/icons/'):])) as source:
+            for scale in SCALES:
+                size = ICON_SIZE * scale
+                cell = fit_to_square(source, size)
+                sheets[scale].paste(cell, (x * scale, y * scale))
+                for fmt in settings['formats']:
+                    # Content hash of the source: unchanged icons keep their URLs
+                    filename = f"{stem}-{size}.{sha256[:10]}.{fmt}"
+                    path = os.path.join(BUILD_DIR, filename)
+                    if force or not os.path.exists(path):
+                        cell.save(path, fmt.upper(), **ENCODER_PARAMS[fmt])
+                    variants.setdefault(image_path, {}).setdefault(fmt, {})[str(size)] = public_path(path)
+                    files.append(filename)
+
+    sprite_sheets = {}
+    for scale, sheet in sheets.items():
+        filename = save_hashed(sheet, f"sprite-{ICON_SIZE * scale}", 'webp')
+        sprite_sheets[f"{scale}x"] = public_path(os.path.join(BUILD_DIR, filename))
+        files.append(filename)
+
+    sprite = {
+        'size': ICON_SIZE,
+        'width': columns * ICON_SIZE,
+        'height': rows * ICON_SIZE,
+        'sheets': sprite_sheets,
+        'icons': icons,
+    }
+    build = {
+        'variants': variants,
+        'sources': sources,
+        'settings': settings,
+        'files': sorted(files),
+    }
+    # The app fetches sprite.json on startup - keep it compact
+    with open(SPRITE_JSON, 'w', encoding='utf-8') as f:
+        json.dump(sprite, f, separators=(',', ':'), ensure_ascii=False)
+    with open(BUILD_JSON, 'w', encoding='utf-8') as f:
+        json.dump(build, f, indent=2, ensure_ascii=False)
+
+    # Remove images of earlier builds (other files, e.g. the .gz/.br of sprite.json, stay)
+    for name in os.listdir(BUILD_DIR):
+        if name.endswith(tuple(f".{fmt}" for fmt in ENCODER_PARAMS)) and name not in files:
+            os.remove(os.path.join(BUILD_DIR, name))
+
+    return sprite, build
+
+def print_report(sprite, build):
+    """Compare the bytes and requests of the sprite with the original icons"""
+    original = sum(os.path.getsize(os.path.join(ICONS_DIR, image[len('/icons/'):])) for image in build['sources'])
+    print(f"\n{'='*50}")
+    print("Summary:")
+    print(f"  🖼️  Icons: {len(sprite['icons'])} in a {sprite['width']}x{sprite['height']} sprite")
+    print(f"  📦 Originals: {len(build['sources'])} requests, {original / 1024:.0f} KiB")
+    for name, path in sprite['sheets'].items():
+        size = os.path.getsize(os.path.join(os.path.dirname(ICONS_DIR), path.lstrip('/')))
+        print(f"  📦 Sprite {name}: 1 request, {size / 1024:.0f} KiB ({path})")
+    print(f"{'='*50}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build resized WebP/AVIF icons and sprite atlases for the app")
+    parser.add_argument('--variants', action='store_true',
+                        help="Also write every resized icon as its own file (not used by the app)")
+    parser.add_argument('--avif', action='store_true',
+                        help="Write the variants also as AVIF (implies --variants, needs Pillow with AVIF support)")
+    parser.add_argument('--force', action='store_true', help="Rebuild everything, even if nothing changed")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    formats = ('webp', 'avif') if args.avif else ('webp',)
+    print_report(*build_icons(formats=formats, force=args.force, with_variants=args.variants or args.avif))
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+In-memory catalog of the data files, shared by the scripts.
+Loads workshop_level_ups.json, the recipe files, items.json and
+expedition_projects.json once per process into compact records and indexes
+them by item name, station, station level, material and upgrade chain.
+Every section is read on first use only, so a tool that needs the workshop
+data does not parse items.json.
+
+    import catalog
+    data = catalog.get_catalog()
+    data.listings_by_station['Gunsmith']
+    data.producers['Metal Parts']   # [(Item, quantity)], most per item first
+"""
+
+import functools
+import json
+import os
+import re
+from collections import Counter
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+DATA_DIR = os.path.join(project_root, 'data')
+
+UPGRADE_TIERS = ('II', 'III', 'IV')  # Tiers added for every listed "<name> I"
+RARITIES = ('Common', 'Uncommon', 'Rare', 'Epic', 'Legendary')
+RARITY_ALIASES = {'uncomon': 'Uncommon'}  # Typos in the wiki data
+# "1x Wires, 2x Metal Parts" or "5x Chemicals 2x Oil" (commas are sometimes missing)
+RECYCLE_PATTERN = re.compile(r'(\d+)x\s+([^,\d]+?)(?=\s*\d+x\s+|,|$)')
+NOT_RECYCLABLE = 'cannot be recycled'
+
+
+def upgrade_items(item_name):
+    """Names of the upgrade tiers of an item ("Ferro I" -> Ferro II/III/IV), [] if it has none"""
+    if not item_name.endswith(' I'):
+        return []
+    base_name = item_name[:-2].strip()
+    return [f"{base_name} {tier}" for tier in UPGRADE_TIERS]
+
+
+def canonical_rarity(rarity):
+    """Rarity with canonical spelling, None if unknown"""
+    key = (rarity or '').strip().lower()
+    for name in RARITIES:
+        if name.lower() == key:
+            return name
+    return RARITY_ALIASES.get(key)
+
+
+def parse_sell_price(sell_price):
+    """Sell price as an int ("$13,000" -> 13000), None if there is none"""
+    digits = re.sub(r'[$,\s]', '', str(sell_price or ''))
+    return int(digits) if digits.isdigit() else None
+
+
+def parse_recycles(recycles):
+    """[(material, quantity)] of a recycle string; [] if not recyclable, None if unknown ("?")"""
+    recycles = (recycles or '').strip()
+    if not recycles or recycles.lower() == NOT_RECYCLABLE:
+        return []
+    yields = [(match.group(2).strip(), int(match.group(1)))
+              for match in RECYCLE_PATTERN.finditer(recycles) if match.group(2).strip()]
+    return yields or None
+
+
+def material_spellings(parsed):
+    """{lower-case name: most used spelling} over all recycle yields"""
+    counts = Counter(material for yields in parsed if yields for material, _ in yields)
+    spellings = {}
+    # Most used first, ties alphabetically, so the result does not depend on item order
+    for material, _ in sorted(counts.items(), key=lambda entry: (-entry[1], entry[0])):
+        spellings.setdefault(material.lower(), material)
+    return spellings
+
+
+def merge_yields(yields, spellings):
+    """[(material, quantity)] with canonical material names, duplicates summed (first occurrence order)"""
+    quantities = {}
+    for material, quantity in yields:
+        material = spellings[material.lower()]
+        quantities[material] = quantities.get(material, 0) + quantity
+    return list(quantities.items())
+
+
+class Record:
+    """Base of the catalog records: fixed fields, no per-instance dict"""
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+
+class Listing(Record):
+    """An item crafted at a station level; upgrade=True for the II-IV tiers added for a listed "<name> I" """
+    __slots__ = ('item', 'station', 'level', 'upgrade')
+
+
+class Recipe(Record):
+    """Crafting or upgrade recipe; materials is a tuple of (material, quantity)"""
+    __slots__ = ('item', 'station', 'level', 'materials', 'upgrade_from')
+
+
+class Item(Record):
+    """An items.json entry; recycles is a tuple of (material, quantity), None if unknown"""
+    __slots__ = ('name', 'rarity', 'category', 'sell_price', 'recycles', 'image', 'url')
+
+
+class Project(Record):
+    """An expedition project stage; materials is a tuple of (material, quantity)"""
+    __slots__ = ('name', 'description', 'materials')
+
+
+def _materials(entries):
+    return tuple((entry['material'], entry['quantity']) for entry in entries or [])
+
+
+class Catalog:
+    """All data files of one data directory, loaded and indexed on first access"""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+
+    def _load(self, filename, default=None):
+        path = os.path.join(self.data_dir, filename)
+        if default is not None and not os.path.exists(path):
+            return default
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    # Workshop
+
+    @functools.cached_property
+    def stations(self):
+        """{station: [level data]} as in workshop_level_ups.json"""
+        return self._load('workshop_level_ups.json').get('stations', {})
+
+    @functools.cached_property
+    def listings(self):
+        """Every workshop listing in file order, then the upgrade tiers of the " I" items.
+        An upgrade tier is added per station unless that station already lists it."""
+        listings = []
+        for station_name, levels in self.stations.items():
+            for level_data in levels:
+                for item_name in level_data.get('crafts', []):
+                    listings.append(Listing(item_name, station_name, level_data.get('level', ''), False))
+
+        listed = {(listing.item, listing.station) for listing in listings}
+        for listing in list(listings):
+            for upgrade_item in upgrade_items(listing.item):
+                if (upgrade_item, listing.station) not in listed:
+                    listed.add((upgrade_item, listing.station))
+                    listings.append(Listing(upgrade_item, listing.station, listing.level, True))
+        return listings
+
+    @functools.cached_property
+    def listings_by_item(self):
+        return self._group(self.listings, lambda listing: listing.item)
+
+    @functools.cached_property
+    def listings_by_station(self):
+        """{station: [Listing]} of every station, also those without crafts"""
+        by_station = {station: [] for station in self.stations}
+        by_station.update(self._group(self.listings, lambda listing: listing.station))
+        return by_station
+
+    @functools.cached_property
+    def listings_by_level(self):
+        """{(station, level): [Listing]}"""
+        return self._group(self.listings, lambda listing: (listing.station, listing.level))
+
+    @functools.cached_property
+    def upgrade_chains(self):
+        """{"Ferro I": ["Ferro I", "Ferro II", "Ferro III", "Ferro IV"]} for every listed " I" item"""
+        return {item: [item] + upgrade_items(item)
+                for item in self.listings_by_item if upgrade_items(item)}
+
+    @functools.cached_property
+    def chain_of(self):
+        """{item: its upgrade chain} for every item in an upgrade chain"""
+        return {item: chain for chain in self.upgrade_chains.values() for item in chain}
+
+    def craftable_items(self, upgrades=False):
+        """{item: {'station', 'level'}} of the first listing per item (a new dict)"""
+        craftable = {}
+        for listing in self.listings:
+            if (upgrades or not listing.upgrade) and listing.item not in craftable:
+                craftable[listing.item] = {'station': listing.station, 'level': listing.level}
+        return craftable
+
+    # Recipes
+
+    def _recipes(self, filename):
+        return {
+            item_name: Recipe(item_name, data.get('station', ''), data.get('level', ''),
+                              _materials(data.get('required_materials')), data.get('upgrade_from'))
+            for item_name, data in self._load(filename, {}).items()
+        }
+
+    @functools.cached_property
+    def crafting_recipes(self):
+        return self._recipes('crafting_recipes.json')
+
+    @functools.cached_property
+    def upgrade_recipes(self):
+        return self._recipes('upgrade_recipes.json')
+
+    @functools.cached_property
+    def recipes(self):
+        """Crafting and upgrade recipes by item"""
+        return {**self.crafting_recipes, **self.upgrade_recipes}
+
+    @functools.cached_property
+    def recipes_by_material(self):
+        """{material: [Recipe]} of the recipes that need it"""
+        consumers = {}
+        for recipe in self.recipes.values():
+            for material, _ in recipe.materials:
+                consumers.setdefault(material, []).append(recipe)
+        return consumers
+
+    # Items
+
+    @functools.cached_property
+    def items(self):
+        """{name: Item} in items.json order, with recycle yields parsed and material names canonical"""
+        raw_items = self._load('items.json')
+        parsed = [parse_recycles(item.get('recycles')) for item in raw_items]
+        spellings = material_spellings(parsed)
+        items = {}
+        for item, yields in zip(raw_items, parsed):
+            recycles = tuple(merge_yields(yields, spellings)) if yields is not None else None
+            items[item['name']] = Item(
+                item['name'], canonical_rarity(item.get('rarity')) or item.get('rarity'), item.get('category'),
+                parse_sell_price(item.get('sell_price')), recycles, item.get('image'), item.get('url'),
+            )
+        return items
+
+    @functools.cached_property
+    def producers(self):
+        """{material: [(Item, quantity)]}, most per item first, then in items.json order"""
+        producers = {}
+        for item in self.items.values():
+            for material, quantity in item.recycles or ():
+                producers.setdefault(material, []).append((item, quantity))
+        return {material: sorted(entries, key=lambda entry: -entry[1])
+                for material, entries in sorted(producers.items())}
+
+    @functools.cached_property
+    def materials(self):
+        """Sorted names of all materials items recycle into"""
+        return list(self.producers)
+
+    # Expedition projects
+
+    @functools.cached_property
+    def projects(self):
+        return [Project(project['name'], project.get('description', ''), _materials(project.get('required_materials')))
+                for project in self._load('expedition_projects.json', [])]
+
+    @staticmethod
+    def _group(records, key):
+        groups = {}
+        for record in records:
+            groups.setdefault(key(record), []).append(record)
+        return groups
+
+
+@functools.lru_cache(maxsize=None)
+def _catalog(data_dir):
+    return Catalog(data_dir)
+
+
+def get_catalog(data_dir=DATA_DIR):
+    """The catalog of a data directory, created once per process"""
+    return _catalog(os.path.abspath(data_dir))
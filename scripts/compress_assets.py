@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Precompress the static data files of the app
+Writes .gz and .br siblings at maximum compression for all JSON and SVG
+files in frontend/public/, so nginx serves them with gzip_static/brotli_static
+instead of compressing on every request. JSON is minified before it is
+compressed; the files themselves stay as the extractors wrote them. Siblings
+that would not be smaller than the file are left out, and those of removed
+files are deleted.
+
+Prints the raw/gzip/brotli sizes and stores them in docs/asset-sizes.json,
+so payload regressions show up in the next run and in git diffs.
+Brotli output needs the brotli module (pip install brotli).
+"""
+
+import argparse
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configuration
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+PUBLIC_DIR = os.path.join(project_root, 'frontend', 'public')
+SIZES_JSON = os.path.join(project_root, 'docs', 'asset-sizes.json')
+EXTENSIONS = ('.json', '.svg')
+# Build state of the icon scripts, never loaded by the app
+SKIP_FILES = {'icons/manifest.json', 'icons/build/build.json'}
+COMPRESSED = ('.gz', '.br')
+
+def find_assets():
+    """Relative paths (with /) of the files to compress, sorted"""
+    assets = []
+    for root, dirs, files in os.walk(PUBLIC_DIR):
+        dirs.sort()
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), PUBLIC_DIR).replace(os.sep, '/')
+            if name.endswith(EXTENSIONS) and path not in SKIP_FILES:
+                assets.append(path)
+    return sorted(assets)
+
+def write_if_changed(path, data):
+    """Write data atomically unless the file already holds it; True if written"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+def minify_json(data):
+    """Compact JSON with the same content and key order"""
+    return json.dumps(json.loads(data), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def compress(data, fmt):
+    if fmt == '.gz':
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+def process_asset(path, formats, minify=True):
+    """Precompress one file (JSON minified first); returns its sizes {'raw', '.gz', '.br'}"""
+    full_path = os.path.join(PUBLIC_DIR, path)
+    with open(full_path, 'rb') as f:
+        data = f.read()
+    sizes = {'raw': len(data)}
+    if minify and path.endswith('.json'):
+        # Only the compressed siblings are minified, the source stays readable
+        data = min(data, minify_json(data), key=len)
+
+    for fmt in COMPRESSED:
+        sibling = full_path + fmt
+        compressed = compress(data, fmt) if fmt in formats else None
+        if compressed is not None and len(compressed) < sizes['raw']:
+            write_if_changed(sibling, compressed)
+            sizes[fmt] = len(compressed)
+        elif os.path.exists(sibling):
+            os.remove(sibling)
+    return sizes
+
+def remove_orphans(assets):
+    """Delete .gz/.br files whose source file is gone"""
+    removed = 0
+    for root, _, files in os.walk(PUBLIC_DIR):
+        for name in files:
+            if not name.endswith(COMPRESSED):
+                continue
+            source = os.path.relpath(os.path.join(root, name[:-3]), PUBLIC_DIR).replace(os.sep, '/')
+            if source not in assets:
+                os.remove(os.path.join(root, name))
+                removed += 1
+    return removed
+
+def load_previous_sizes(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+def format_delta(size, previous):
+    if previous is None or previous == size:
+        return ''
+    return f" ({size - previous:+d})"
+
+def print_report(sizes, previous):
+    """Table of raw/gzip/brotli bytes per file, with the change since the last run"""
+    print(f"\n{'='*90}")
+    print(f"{'File':<36}{'raw':>18}{'gzip':>18}{'brotli':>18}")
+    for path, entry in sizes.items():
+        old = previous.get(path, {})
+        columns = [f"{entry[key]}{format_delta(entry[key], old.get(key))}" if key in entry else '-'
+                   for key in ('raw', '.gz', '.br')]
+        print(f"{path:<36}" + ''.join(f"{column:>18}" for column in columns))
+    totals = {key: sum(entry.get(key, entry['raw']) for entry in sizes.values()) for key in ('raw', '.gz', '.br')}
+    old_totals = {key: sum(entry.get(key, entry['raw']) for entry in previous.values()) for key in ('raw', '.gz', '.br')}
+    print('-' * 90)
+    print(f"{'Total (' + str(len(sizes)) + ' files)':<36}" +
+          ''.join(f"{str(totals[key]) + format_delta(totals[key], old_totals[key] if previous else None):>18}"
+                  for key in ('raw', '.gz', '.br')))
+    print(f"{'='*90}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Precompress (gzip/brotli) the app's JSON and SVG files")
+    parser.add_argument('--no-minify', action='store_true', help="Compress the JSON files as they are, without minifying them first")
+    parser.add_argument('--no-brotli', action='store_true', help="Only write .gz files")
+    parser.add_argument('--sizes', default=SIZES_JSON, help="Size report to compare with and update "
+                        "(default: docs/asset-sizes.json)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    formats = {'.gz'}
+    if not args.no_brotli:
+        if brotli is None:
+            print("⚠️  brotli module not installed (pip install brotli), writing .gz files only")
+        else:
+            formats.add('.br')
+
+    assets = find_assets()
+    print(f"📦 Compressing {len(assets)} files in {PUBLIC_DIR}...")
+    sizes = {path: process_asset(path, formats, minify=not args.no_minify) for path in assets}
+    removed = remove_orphans(set(assets))
+    if removed:
+        print(f"🗑️  Removed {removed} compressed files of deleted assets")
+
+    previous = load_previous_sizes(args.sizes)
+    print_report(sizes, previous)
+    os.makedirs(os.path.dirname(os.path.abspath(args.sizes)), exist_ok=True)
+    with open(args.sizes, 'w', encoding='utf-8') as f:
+        json.dump({'files': sizes}, f, indent=2)
+        f.write('\n')
+    print(f"💾 Sizes saved to {args.sizes}")
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,21 @@
 #!/usr/bin/env python3
 """Create a checklist of items with and without recipes"""
 
-import json
 import os
 
+import catalog
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 
-# Load craftable items
-with open(os.path.join(project_root, 'data', 'workshop_level_ups.json'), 'r') as f:
-    workshop = json.load(f)
-
-# Load recipes
-with open(os.path.join(project_root, 'data', 'crafting_recipes.json'), 'r') as f:
-    recipes = json.load(f)
-
-# Collect all craftable items grouped by station
-all_items_by_station = {}
-for station_name, levels in workshop.get('stations', {}).items():
-    all_items_by_station[station_name] = []
-    for level_data in levels:
-        level = level_data.get('level', '')
-        for item_name in level_data.get('crafts', []):
-            all_items_by_station[station_name].append((item_name, level))
+data = catalog.get_catalog()
+recipes = data.crafting_recipes
 
-# Add upgrade items
-for station_name in list(all_items_by_station.keys()):
-    items = all_items_by_station[station_name]
-    base_items = [item for item, _ in items if item.endswith(' I')]
-    for base_item, level in items:
-        if base_item.endswith(' I'):
-            base_name = base_item[:-2].strip()
-            for upgrade_level in ['II', 'III', 'IV']:
-                upgrade_item = f'{base_name} {upgrade_level}'
-                if not any(item == upgrade_item for item, _ in items):
-                    all_items_by_station[station_name].append((upgrade_item, level))
+# All craftable items (including the upgrade items) grouped by station
+all_items_by_station = {
+    station_name: [(listing.item, listing.level) for listing in listings]
+    for station_name, listings in data.listings_by_station.items()
+}
 
 # Create checklist
 print("="*80)
@@ -51,8 +32,7 @@ for station in sorted(all_items_by_station.keys()):
     without_recipes = []
     
     for item, level in items:
-        recipe = recipes.get(item, {})
-        materials = recipe.get('required_materials', [])
+        materials = recipes[item].materials if item in recipes else ()
         if materials:
             with_recipes.append((item, level, len(materials)))
             total_with += 1
@@ -91,8 +71,7 @@ with open(output_file, 'w', encoding='utf-8') as f:
         without_recipes = []
         
         for item, level in items:
-            recipe = recipes.get(item, {})
-            materials = recipe.get('required_materials', [])
+            materials = recipes[item].materials if item in recipes else ()
             if materials:
                 with_recipes.append((item, level, len(materials)))
             else:
@@ -4,14 +4,23 @@ Download icons for ARC Raiders items from the wiki.
 Updates items.json with downloaded icon paths or keeps original URLs.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
 import requests
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.parse import urlparse, quote
-import time
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+import http_cache
+import icon_manifest
+import page_parser
+import progress_journal
+import run_metrics
+import wiki_api
 
 # Configuration
 # Get script directory and project root for relative paths
@@ -20,7 +29,7 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 ITEMS_JSON = os.path.join(project_root, 'data', 'items.json')
 ICONS_DIR = os.path.join(project_root, 'frontend', 'public', 'icons')
-DELAY_BETWEEN_REQUESTS = 0.5  # Be nice to the server
+WIKI_URL = 'https://arc-raiders.fandom.com'
 
 def sanitize_filename(name):
     """Convert item name to safe filename."""
@@ -39,112 +48,205 @@ def get_image_extension(url):
             return ext
     return '.png'  # Default
 
-def download_image(url, filepath):
-    """Download image from URL to filepath."""
+# Per-item log buffer for parallel mode (see run_item)
+_log_buffer = threading.local()
+_print_lock = threading.Lock()
+
+def log(message):
+    """Print a progress line, or buffer it while an item is processed in parallel."""
+    lines = getattr(_log_buffer, 'lines', None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+# Manifest of the icons in ICONS_DIR, loaded by process_items()
+_manifest = None
+_revalidate = True
+
+def fetch_icon(url, filepath, item_name):
+    """Download an item's icon from url to filepath and record it in the manifest.
+
+    The body is streamed to a temp file next to filepath and only renamed
+    into place once it is complete and passed the placeholder checks.
+    A known icon is revalidated with the ETag / Last-Modified from the
+    manifest, and a byte-identical icon that is already stored is reused.
+    Returns (path under /icons/, changed) or (None, False) on failure.
+    """
+    entry = _manifest.items.get(item_name)
+    tmp_path = None
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Check if it's actually an image
-        content_type = response.headers.get('Content-Type', '')
-        if not content_type.startswith('image/'):
-            print(f"  ⚠️  Warning: {url} doesn't appear to be an image (Content-Type: {content_type})")
-            return False
+        with http_cache.stream_get(url, timeout=10, headers=_manifest.validators(item_name, url)) as response:
+            if response.status_code == 304 and entry:
+                return f"/icons/{entry['file']}", False
+            response.raise_for_status()
+            
+            # Check if it's actually an image
+            content_type = response.headers.get('Content-Type', '')
+            if not content_type.startswith('image/'):
+                log(f"  ⚠️  Warning: {url} doesn't appear to be an image (Content-Type: {content_type})")
+                return None, False
+            
+            size = 0
+            digest = hashlib.sha256()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.part')
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content():
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            headers = response.headers
         
         # Check file size - if too small, it's probably a placeholder
-        if len(response.content) < 2048:
-            print(f"  ⚠️  Warning: Downloaded image is too small ({len(response.content)} bytes), probably a placeholder")
-            return False
+        if size < 2048:
+            log(f"  ⚠️  Warning: Downloaded image is too small ({size} bytes), probably a placeholder")
+            return None, False
         
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        return True
+        sha256 = digest.hexdigest()
+        with _manifest.lock:
+            previous = _manifest.icons.get(entry['file']) if entry else None
+            changed = previous is None or previous['sha256'] != sha256
+            filename = _manifest.file_for_hash(sha256)
+            if filename is None:
+                filename = os.path.basename(filepath)
+                if _manifest.is_shared(filename, item_name):
+                    # Other items use the old content of this file - keep it for them
+                    stem, ext = os.path.splitext(filename)
+                    filename = f"{stem}_{sha256[:8]}{ext}"
+                # mkstemp creates 0600 files, icons must stay readable for the web server
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, os.path.join(ICONS_DIR, filename))
+                tmp_path = None
+                _manifest.add_icon(os.path.join(ICONS_DIR, filename), sha256=sha256)
+            _manifest.set_item(item_name, filename, url, headers)
+        return f"/icons/{filename}", changed
     except requests.exceptions.RequestException as e:
-        print(f"  ❌ Error downloading {url}: {e}")
-        return False
+        log(f"  ❌ Error downloading {url}: {e}")
+        return None, False
+    except OSError as e:
+        log(f"  ❌ Error saving {url}: {e}")
+        return None, False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-# Cache for the Items page to avoid fetching it multiple times
-_items_page_cache = None
+def download_image(url, filepath, item_name):
+    """Download image from URL to filepath. Returns the icon's path under /icons/ or None."""
+    return fetch_icon(url, filepath, item_name)[0]
 
-def get_items_page_cache():
-    """Fetch and cache the Items wiki page."""
-    global _items_page_cache
-    if _items_page_cache is None:
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get('https://arc-raiders.fandom.com/wiki/Items', headers=headers, timeout=15)
-            response.raise_for_status()
-            _items_page_cache = BeautifulSoup(response.content, 'html.parser')
-            print("  📚 Loaded Items wiki page cache")
-        except Exception as e:
-            print(f"  ⚠️  Could not load Items page: {e}")
-            _items_page_cache = False
-    return _items_page_cache
+def keep_existing_icon(item, local_path, stats, url=None):
+    """Record an icon that is already on disk and point the item at it (or at an identical icon).
+
+    Without a known source URL the wiki image is looked up, so later runs can
+    revalidate the icon.
+    """
+    name = item.get('name', 'Unknown')
+    filename = _manifest.add_icon(local_path)
+    entry = _manifest.items.get(name)
+    if entry is None or entry['file'] != filename or (url is None and not entry.get('url')):
+        if url is None and _revalidate:
+            url = find_wiki_image_url(name, item.get('url'))
+        _manifest.set_item(name, filename, url)
+    relative_path = f"/icons/{filename}"
+    log(f"  ✓ Icon already exists: {relative_path}")
+    if item['image'] != relative_path:
+        item['image'] = relative_path
+        stats['updated'] += 1
+
+WIKI_IMAGE_HOST = 'static.wikia.nocookie.net'
+
+def clean_image_url(url):
+    """Strip query parameters and /scale-to-width from a wiki image URL."""
+    return url.split('?')[0].split('/scale-to-width')[0]
+
+def build_items_page_index(soup):
+    """Compile the Items page into {name cell text: (row position, image URL)}.
+
+    Item rows have the image link in the first cell and the name in the second.
+    The first row per name that resolves to an image wins; rows without an
+    image link fall back to another img on the page with the same data-image-key.
+    """
+    images_by_key = {}
+    for img in soup.find_all('img', {'data-image-key': True}):
+        src = img.get('src')
+        if src and WIKI_IMAGE_HOST in src:
+            images_by_key.setdefault(img['data-image-key'], clean_image_url(src))
+
+    index = {}
+    position = 0
+    for table in soup.find_all('table'):
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 2:
+                continue
+            name = cells[1].get_text().strip()
+            position += 1
+            if name in index:
+                continue
+
+            image_url = None
+            link = cells[0].find('a')
+            href = link.get('href') if link else None
+            if href and WIKI_IMAGE_HOST in href:
+                image_url = clean_image_url(href)
+            else:
+                img = row.find('img')
+                if img and img.get('data-image-key'):
+                    image_url = images_by_key.get(img.get('data-image-key'))
+
+            if image_url:
+                index[name] = (position, image_url)
+    return index
+
+# Index of the Items page, built once so the page is not fetched or walked per item
+_items_page_index = None
+_items_page_lock = threading.Lock()
+
+def get_items_page_index():
+    """Fetch the Items wiki page and compile it into a name -> image URL index."""
+    global _items_page_index
+    with _items_page_lock:
+        if _items_page_index is None:
+            try:
+                response = http_cache.cached_get(f'{WIKI_URL}/wiki/Items', timeout=15)
+                response.raise_for_status()
+                soup = page_parser.parse_full_page(response.content)
+                _items_page_index = build_items_page_index(soup)
+                # Only the index is kept; release the parse tree right away
+                soup.decompose()
+                log(f"  📚 Indexed {len(_items_page_index)} items from the Items wiki page")
+            except Exception as e:
+                log(f"  ⚠️  Could not load Items page: {e}")
+                _items_page_index = {}
+    return _items_page_index
 
 def find_image_in_items_page(item_name):
     """Find image URL from the Items wiki page."""
-    soup = get_items_page_cache()
-    if not soup:
+    index = get_items_page_index()
+    # The name cell may use the item name or its wiki form (spaces to underscores)
+    matches = [index[name] for name in (item_name, item_name.replace(' ', '_')) if name in index]
+    if not matches:
         return None
-    
-    # Convert item name to match wiki format (spaces to underscores, special chars)
-    wiki_name = item_name.replace(' ', '_')
-    
-    # Try to find the item in the table
-    # Look for links or cells containing the item name
-    tables = soup.find_all('table')
-    if not tables:
-        return None
-    
-    # Try each table
-    for table in tables:
-        rows = table.find_all('tr')
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) >= 2:
-                # Item name is in the second cell (index 1), image link is in first cell (index 0)
-                name_cell_text = cells[1].get_text().strip()
-                
-                # Check for exact match or wiki name match
-                if name_cell_text == item_name or name_cell_text == wiki_name:
-                    # Find the image link in the first cell
-                    first_cell = cells[0]
-                    link = first_cell.find('a')
-                    
-                    if link:
-                        # The href contains the image URL!
-                        href = link.get('href')
-                        if href and 'static.wikia.nocookie.net' in href:
-                            # Remove query parameters and scale-to-width
-                            if '?' in href:
-                                href = href.split('?')[0]
-                            if '/scale-to-width' in href:
-                                href = href.split('/scale-to-width')[0]
-                            return href
-                    
-                    # Fallback: try to find img tag
-                    img = row.find('img')
-                    if img:
-                        # Try data-image-key to find the image elsewhere on the page
-                        img_key = img.get('data-image-key')
-                        if img_key:
-                            # Search for this image key in the page to get the full URL
-                            all_imgs = soup.find_all('img', {'data-image-key': img_key})
-                            for test_img in all_imgs:
-                                test_src = test_img.get('src')
-                                if test_src and 'static.wikia.nocookie.net' in test_src:
-                                    if '/scale-to-width' in test_src:
-                                        test_src = test_src.split('/scale-to-width')[0]
-                                    if '?' in test_src:
-                                        test_src = test_src.split('?')[0]
-                                    return test_src
-    
-    return None
+    return min(matches)[1]
+
+# Names of all items, so their pages are resolved in one batch on the first lookup
+_item_names = []
+_item_titles_resolved = False
+_item_titles_lock = threading.Lock()
+
+def resolve_item_titles():
+    """Resolve the wiki pages of all items missing from the Items page with batched title queries."""
+    global _item_titles_resolved
+    with _item_titles_lock:
+        if _item_titles_resolved:
+            return
+        _item_titles_resolved = True
+        index = get_items_page_index()
+        names = [name for name in _item_names if name not in index and name.replace(' ', '_') not in index]
+        wiki_api.resolve_urls(
+            url for name in names
+            for urls in wiki_api.variation_urls(wiki_api.title_variations(name), [WIKI_URL]) for url in urls
+        )
 
 def find_wiki_image_url(item_name, wiki_url=None):
     """Try to find the image URL from the wiki page."""
@@ -153,20 +255,18 @@ def find_wiki_image_url(item_name, wiki_url=None):
     if image_url:
         return image_url
     
-    # If not found, try individual wiki page
+    # If not found, try the item's own wiki page (tier suffix and apostrophes are resolved)
     if not wiki_url:
-        # Convert item name to wiki URL format
-        wiki_name = item_name.replace(' ', '_')
-        wiki_url = f"https://arc-raiders.fandom.com/wiki/{quote(wiki_name)}"
+        resolve_item_titles()
+        wiki_url = wiki_api.resolve_item_url(item_name, WIKI_URL)
+        if not wiki_url:
+            return None
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(wiki_url, headers=headers, timeout=10)
+        response = wiki_api.get_page(wiki_url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = page_parser.parse_full_page(response.content)
         
         # Try to find the infobox image
         infobox = soup.find('aside', class_='portable-infobox')
@@ -197,171 +297,272 @@ def find_wiki_image_url(item_name, wiki_url=None):
     except requests.exceptions.RequestException as e:
         # Don't print error for 404s (item doesn't have own page)
         if '404' not in str(e):
-            print(f"  ⚠️  Could not fetch wiki page: {e}")
+            log(f"  ⚠️  Could not fetch wiki page: {e}")
     except Exception as e:
-        print(f"  ⚠️  Error parsing wiki page: {e}")
+        log(f"  ⚠️  Error parsing wiki page: {e}")
     
     return None
 
-def process_items():
-    """Process items.json and download missing icons."""
-    # Create icons directory
-    os.makedirs(ICONS_DIR, exist_ok=True)
+def process_item(item, index, total, journal=None):
+    """Make sure one item has a valid local icon. Returns the counters for this item.
+
+    With a journal the finished item is recorded, and an item finished by an
+    interrupted run is replayed from it instead of processed again.
+    """
+    name = item.get('name', 'Unknown')
+    unit = f"{index}:{name}"
+    if journal is not None and unit in journal:
+        return replay_item(item, index, total, journal[unit])
     
-    # Load items
-    print(f"Loading {ITEMS_JSON}...")
-    with open(ITEMS_JSON, 'r', encoding='utf-8') as f:
-        items = json.load(f)
+    stats = {'downloaded': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0, 'updated': 0}
+    try:
+        _process_item(item, index, total, stats)
+    except OSError as e:
+        # A disk error fails this item only; it is not journaled, so --resume retries it
+        log(f"  ❌ Error processing {name}: {e}")
+        stats['failed'] += 1
+        return stats
     
-    print(f"Found {len(items)} items")
+    if journal is not None:
+        entry = _manifest.items.get(name)
+        icon = _manifest.icons.get(entry['file']) if entry else None
+        journal.record(unit, {'image': item.get('image'), 'stats': stats, 'manifest': entry, 'icon': icon})
+    return stats
+
+def replay_item(item, index, total, result):
+    """Apply a journaled item result to the item and the manifest."""
+    name = item.get('name', 'Unknown')
+    log(f"\n[{index}/{total}] {name}")
+    log("  ↩️  Finished in the interrupted run, taken from the journal")
+    if result['image'] is not None:
+        item['image'] = result['image']
+    if result['manifest'] is not None:
+        _manifest.items[name] = result['manifest']
+        if result['icon'] is not None:
+            _manifest.icons[result['manifest']['file']] = result['icon']
+    return result['stats']
+
+def _process_item(item, index, total, stats):
+    # Returns early once the item is handled; counters go into stats
+    name = item.get('name', 'Unknown')
+    current_image = item.get('image', '')
+    wiki_url = item.get('url', None)
     
-    downloaded = 0
-    skipped = 0
-    failed = 0
-    updated = 0
+    log(f"\n[{index}/{total}] {name}")
     
-    for i, item in enumerate(items, 1):
-        name = item.get('name', 'Unknown')
-        current_image = item.get('image', '')
-        wiki_url = item.get('url', None)
-        
-        print(f"\n[{i}/{len(items)}] {name}")
-        
-        # Generate local filename
-        safe_name = sanitize_filename(name)
-        local_filename = f"{safe_name}.png"
-        local_path = os.path.join(ICONS_DIR, local_filename)
-        relative_path = f"/icons/{local_filename}"
-        
-        # If already using local path, check if icon is valid
-        if current_image.startswith('/icons/') or current_image.startswith('icons/'):
-            if os.path.exists(local_path):
-                file_size = os.path.getsize(local_path)
-                # If file is very small (< 2KB), it's probably a placeholder - re-download from wiki
-                if file_size < 2048:
-                    print(f"  ⚠️  Icon exists but is too small ({file_size} bytes), searching wiki for correct icon...")
-                    os.remove(local_path)
-                    # Try to find image URL from wiki
-                    image_url = find_wiki_image_url(name, wiki_url)
-                    if image_url:
-                        print(f"  📥 Found image URL: {image_url}")
-                        if download_image(image_url, local_path):
-                            item['image'] = relative_path
-                            downloaded += 1
-                            updated += 1
-                            print(f"  ✅ Saved to {relative_path}")
-                        else:
-                            failed += 1
-                            print(f"  ⚠️  Download failed")
-                    else:
-                        skipped += 1
-                        print(f"  ⚠️  Could not find image URL")
-                    time.sleep(DELAY_BETWEEN_REQUESTS)
-                    continue
-                else:
-                    print(f"  ✓ Icon already exists: {relative_path}")
-                    continue
-            else:
-                print(f"  ⚠️  Icon path in JSON but file missing, searching wiki...")
+    # Generate local filename
+    safe_name = sanitize_filename(name)
+    local_filename = f"{safe_name}.png"
+    local_path = os.path.join(ICONS_DIR, local_filename)
+    
+    # Icon recorded in the manifest: revalidate it instead of re-downloading
+    entry = _manifest.items.get(name)
+    if entry and current_image == f"/icons/{entry['file']}" and _manifest.is_valid(entry['file']):
+        source_url = entry.get('url')
+        if _revalidate and not source_url:
+            # Adopted without a source (older manifest) - look it up once, the fetch records it
+            source_url = find_wiki_image_url(name, wiki_url)
+        if not source_url or not _revalidate:
+            log(f"  ✓ Icon already exists: {current_image}")
+            return
+        log(f"  🔄 Revalidating {source_url}")
+        stored, changed = fetch_icon(source_url, local_path, name)
+        if stored is None:
+            log(f"  ⚠️  Could not revalidate, keeping {current_image}")
+        elif changed:
+            stats['downloaded'] += 1
+            if item['image'] != stored:
+                item['image'] = stored
+                stats['updated'] += 1
+            log(f"  ✅ Icon changed, saved to {stored}")
+        else:
+            stats['unchanged'] += 1
+            log(f"  ✓ Unchanged: {stored}")
+        return
+    
+    # If already using local path, check if icon is valid
+    if current_image.startswith('/icons/') or current_image.startswith('icons/'):
+        if os.path.exists(local_path):
+            file_size = os.path.getsize(local_path)
+            # If file is very small (< 2KB), it's probably a placeholder - re-download from wiki
+            if file_size < 2048:
+                log(f"  ⚠️  Icon exists but is too small ({file_size} bytes), searching wiki for correct icon...")
+                os.remove(local_path)
                 # Try to find image URL from wiki
                 image_url = find_wiki_image_url(name, wiki_url)
                 if image_url:
-                    print(f"  📥 Found image URL: {image_url}")
-                    if download_image(image_url, local_path):
-                        item['image'] = relative_path
-                        downloaded += 1
-                        updated += 1
-                        print(f"  ✅ Saved to {relative_path}")
+                    log(f"  📥 Found image URL: {image_url}")
+                    stored = download_image(image_url, local_path, name)
+                    if stored:
+                        item['image'] = stored
+                        stats['downloaded'] += 1
+                        stats['updated'] += 1
+                        log(f"  ✅ Saved to {stored}")
                     else:
-                        failed += 1
-                        print(f"  ⚠️  Download failed")
+                        stats['failed'] += 1
+                        log(f"  ⚠️  Download failed")
                 else:
-                    skipped += 1
-                    print(f"  ⚠️  Could not find image URL")
-                time.sleep(DELAY_BETWEEN_REQUESTS)
-                continue
-        
-        # If it's a placeholder, try to find the image from wiki
-        if current_image.startswith('data:'):
-            print(f"  🔍 Placeholder detected, searching wiki...")
-            
-            # Check if already downloaded and valid (not a placeholder)
-            if os.path.exists(local_path):
-                file_size = os.path.getsize(local_path)
-                # If file is very small (< 2KB), it's probably a placeholder - re-download
-                if file_size < 2048:
-                    print(f"  ⚠️  Icon exists but is too small ({file_size} bytes), re-downloading...")
-                    os.remove(local_path)
-                else:
-                    print(f"  ✓ Icon already exists: {relative_path}")
-                    # Update JSON to use local path if not already
-                    if item['image'] != relative_path:
-                        item['image'] = relative_path
-                        updated += 1
-                    continue
-            
+                    stats['skipped'] += 1
+                    log(f"  ⚠️  Could not find image URL")
+                return
+            else:
+                keep_existing_icon(item, local_path, stats)
+                return
+        else:
+            log(f"  ⚠️  Icon path in JSON but file missing, searching wiki...")
             # Try to find image URL from wiki
             image_url = find_wiki_image_url(name, wiki_url)
-            
             if image_url:
-                print(f"  📥 Found image URL: {image_url}")
-                if download_image(image_url, local_path):
-                    item['image'] = relative_path
-                    downloaded += 1
-                    updated += 1
-                    print(f"  ✅ Saved to {relative_path}")
+                log(f"  📥 Found image URL: {image_url}")
+                stored = download_image(image_url, local_path, name)
+                if stored:
+                    item['image'] = stored
+                    stats['downloaded'] += 1
+                    stats['updated'] += 1
+                    log(f"  ✅ Saved to {stored}")
                 else:
-                    failed += 1
-                    print(f"  ⚠️  Download failed, keeping placeholder")
+                    stats['failed'] += 1
+                    log(f"  ⚠️  Download failed")
             else:
-                print(f"  ⚠️  Could not find image URL, skipping")
-                skipped += 1
-            
-            # Be nice to the server
-            time.sleep(DELAY_BETWEEN_REQUESTS)
-            continue
+                stats['skipped'] += 1
+                log(f"  ⚠️  Could not find image URL")
+            return
+    
+    # If it's a placeholder, try to find the image from wiki
+    if current_image.startswith('data:'):
+        log(f"  🔍 Placeholder detected, searching wiki...")
         
-        # If it's a URL, try to download it
-        if current_image.startswith('http'):
-            # Generate local filename
-            safe_name = sanitize_filename(name)
-            ext = get_image_extension(current_image)
-            local_filename = f"{safe_name}{ext}"
-            local_path = os.path.join(ICONS_DIR, local_filename)
-            relative_path = f"/icons/{local_filename}"
-            
-            # Check if already downloaded and valid
-            if os.path.exists(local_path):
-                file_size = os.path.getsize(local_path)
-                # If file is very small (< 2KB), it's probably a placeholder - re-download
-                if file_size < 2048:
-                    print(f"  ⚠️  Icon exists but is too small ({file_size} bytes), re-downloading...")
-                    os.remove(local_path)
-                else:
-                    print(f"  ✓ Icon already exists: {relative_path}")
-                    # Update JSON to use local path if not already
-                    if item['image'] != relative_path:
-                        item['image'] = relative_path
-                        updated += 1
-                    continue
-            
-            # Download the image
-            print(f"  📥 Downloading from {current_image}")
-            if download_image(current_image, local_path):
-                item['image'] = relative_path
-                downloaded += 1
-                updated += 1
-                print(f"  ✅ Saved to {relative_path}")
+        # Check if already downloaded and valid (not a placeholder)
+        if os.path.exists(local_path):
+            file_size = os.path.getsize(local_path)
+            # If file is very small (< 2KB), it's probably a placeholder - re-download
+            if file_size < 2048:
+                log(f"  ⚠️  Icon exists but is too small ({file_size} bytes), re-downloading...")
+                os.remove(local_path)
             else:
-                failed += 1
-                # Keep original URL if download fails
-                print(f"  ⚠️  Keeping original URL")
-            
-            # Be nice to the server
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+                keep_existing_icon(item, local_path, stats)
+                return
+        
+        # Try to find image URL from wiki
+        image_url = find_wiki_image_url(name, wiki_url)
+        
+        if image_url:
+            log(f"  📥 Found image URL: {image_url}")
+            stored = download_image(image_url, local_path, name)
+            if stored:
+                item['image'] = stored
+                stats['downloaded'] += 1
+                stats['updated'] += 1
+                log(f"  ✅ Saved to {stored}")
+            else:
+                stats['failed'] += 1
+                log(f"  ⚠️  Download failed, keeping placeholder")
+        else:
+            log(f"  ⚠️  Could not find image URL, skipping")
+            stats['skipped'] += 1
+
+        return
+    
+    # If it's a URL, try to download it
+    if current_image.startswith('http'):
+        # Generate local filename
+        safe_name = sanitize_filename(name)
+        ext = get_image_extension(current_image)
+        local_filename = f"{safe_name}{ext}"
+        local_path = os.path.join(ICONS_DIR, local_filename)
+        
+        # Check if already downloaded and valid
+        if os.path.exists(local_path):
+            file_size = os.path.getsize(local_path)
+            # If file is very small (< 2KB), it's probably a placeholder - re-download
+            if file_size < 2048:
+                log(f"  ⚠️  Icon exists but is too small ({file_size} bytes), re-downloading...")
+                os.remove(local_path)
+            else:
+                keep_existing_icon(item, local_path, stats, url=current_image)
+                return
+        
+        # Download the image
+        log(f"  📥 Downloading from {current_image}")
+        stored = download_image(current_image, local_path, name)
+        if stored:
+            item['image'] = stored
+            stats['downloaded'] += 1
+            stats['updated'] += 1
+            log(f"  ✅ Saved to {stored}")
         else:
-            print(f"  ⚠️  Unknown image format: {current_image}")
-            skipped += 1
+            stats['failed'] += 1
+            # Keep original URL if download fails
+            log(f"  ⚠️  Keeping original URL")
+    else:
+        log(f"  ⚠️  Unknown image format: {current_image}")
+        stats['skipped'] += 1
+
+def run_item(item, index, total, journal):
+    """process_item() with its log lines buffered and printed as one block"""
+    _log_buffer.lines = []
+    try:
+        return process_item(item, index, total, journal)
+    finally:
+        with _print_lock:
+            print('\n'.join(_log_buffer.lines))
+        _log_buffer.lines = None
+
+def process_items(workers=1, revalidate=True, resume=False):
+    """Process items.json and download missing icons.
+
+    workers: number of parallel downloads (requests are paced per host by rate_limit)
+    revalidate: check icons recorded in the manifest for changes with conditional requests
+    resume: replay the items an interrupted run finished (progress journal)
+    """
+    global _manifest, _revalidate
+    # Create icons directory
+    os.makedirs(ICONS_DIR, exist_ok=True)
+    _manifest = icon_manifest.IconManifest.load(ICONS_DIR)
+    _revalidate = revalidate
+    
+    # Load items
+    print(f"Loading {ITEMS_JSON}...")
+    with open(ITEMS_JSON, 'rb') as f:
+        content = f.read()
+    items = json.loads(content)
+    _item_names[:] = [item.get('name', 'Unknown') for item in items]
+    
+    print(f"Found {len(items)} items")
+    
+    # items.json is only written at the end, so an interrupted run left it unchanged
+    journal = progress_journal.Journal('download_icons', resume=resume)
+    journal.start(hashlib.sha256(content).hexdigest())
+    try:
+        with run_metrics.stage('icons'):
+            _process_items(items, workers, journal)
+    finally:
+        journal.close()
+    journal.discard()
+
+def _process_items(items, workers, journal):
+    """Process all items, then save items.json and the manifest and print the summary."""
+    totals = {'downloaded': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0, 'updated': 0}
+    
+    if workers <= 1:
+        results = (process_item(item, i, len(items), journal=journal) for i, item in enumerate(items, 1))
+    else:
+        # Bounded pool - each item still logs as one block
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(run_item, item, i, len(items), journal) for i, item in enumerate(items, 1)]
+            results = [future.result() for future in as_completed(futures)]
+        finally:
+            executor.shutdown(cancel_futures=True)
+    
+    for stats in results:
+        for key, value in stats.items():
+            totals[key] += value
+    downloaded = totals['downloaded']
+    unchanged = totals['unchanged']
+    skipped = totals['skipped']
+    failed = totals['failed']
+    updated = totals['updated']
     
     # Save updated items.json
     if updated > 0:
@@ -370,20 +571,46 @@ def process_items():
             json.dump(items, f, indent=2, ensure_ascii=False)
         print(f"✅ Updated {updated} items with local icon paths")
     
+    # Drop icons no item uses anymore (e.g. duplicates of an identical icon)
+    removed = _manifest.prune(items)
+    if removed:
+        print(f"🧹 Removed {len(removed)} unused icons: {', '.join(removed)}")
+    _manifest.save()
+    print(f"📒 Icon manifest: {len(_manifest.icons)} icons for {len(_manifest.items)} items ({_manifest.path})")
+    
     # Summary
     print(f"\n{'='*50}")
     print(f"Summary:")
     print(f"  ✅ Downloaded: {downloaded}")
+    print(f"  🔄 Unchanged: {unchanged}")
     print(f"  ⏭️  Skipped: {skipped}")
     print(f"  ❌ Failed: {failed}")
     print(f"  📝 Updated: {updated}")
     print(f"{'='*50}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download item icons from the ARC Raiders wiki")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Parallel downloads (default: 1)")
+    parser.add_argument('--no-revalidate', action='store_true',
+                        help="Trust icons recorded in the manifest without asking the server for changes")
+    progress_journal.add_resume_argument(parser)
+    http_cache.add_cache_arguments(parser)
+    page_parser.add_parser_arguments(parser)
+    wiki_api.add_fetch_arguments(parser)
+    run_metrics.add_metrics_arguments(parser)
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    http_cache.configure_from_args(args)
+    page_parser.configure_from_args(args)
+    wiki_api.configure_from_args(args)
+    run_metrics.configure_from_args(args, 'download_icons')
     try:
-        process_items()
+        process_items(workers=args.workers, revalidate=not args.no_revalidate, resume=args.resume)
     except KeyboardInterrupt:
-        print("\n\n⚠️  Interrupted by user")
+        print("\n\n⚠️  Interrupted by user - run again with --resume to continue")
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
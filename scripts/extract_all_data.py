@@ -3,12 +3,15 @@
 Extract all data: Traders, Workshop, Projects
 ONLY DATA EXTRACTION - NO UI CHANGES
 """
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import time
 import re
 
+import http_cache
+import page_parser
+import run_metrics
+import wiki_api
+
 BASE_URL = "https://arc-raiders.fandom.com"
 
 def extract_trader_data():
@@ -24,18 +27,17 @@ def extract_trader_data():
     ]
     
     materials_info = []
+    wiki_api.resolve_urls(f"{BASE_URL}/wiki/{trader['url']}" for trader in TRADERS)  # One batched title query (only with --resolve or --fetch api)
     
     for trader in TRADERS:
         url = f"{BASE_URL}/wiki/{trader['url']}"
         print(f"  Fetching {trader['name']}...")
         
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = wiki_api.get_page(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            main_content = soup.find('div', class_='mw-parser-output')
+            main_content = page_parser.parse_main_content(response.content)
             if not main_content:
                 continue
             
@@ -68,7 +70,7 @@ def extract_trader_data():
                     # Use item_col or material_col for material
                     material_col_idx = item_col if item_col is not None else material_col
                     
-                    for row in rows[1:]:
+                    for row in run_metrics.timed_iter('row_extraction', rows[1:]):
                         cells = row.find_all(['td', 'th'])
                         if len(cells) < 2:
                             continue
@@ -116,8 +118,6 @@ def extract_trader_data():
                                         "frequency": "Daily"
                                     }
                                 })
-            
-            time.sleep(2)
         except Exception as e:
             print(f"  Error: {e}")
     
@@ -130,12 +130,10 @@ def extract_workshop_data():
     url = f"{BASE_URL}/wiki/Workshop"
     
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = wiki_api.get_page(url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        main_content = soup.find('div', class_='mw-parser-output')
+        main_content = page_parser.parse_main_content(response.content)
         if not main_content:
             return {}
         
@@ -156,7 +154,7 @@ def extract_workshop_data():
                             if len(rows) >= 2:
                                 headers = [th.get_text().strip().lower() for th in rows[0].find_all(['th', 'td'])]
                                 
-                                for row in rows[1:]:
+                                for row in run_metrics.timed_iter('row_extraction', rows[1:]):
                                     cells = row.find_all(['td', 'th'])
                                     if len(cells) >= 2:
                                         level = ""
@@ -206,15 +204,13 @@ def extract_projects_data():
     url = f"{BASE_URL}/wiki/Expedition_Projects"
     
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = wiki_api.get_page(url, timeout=10)
         
         if response.status_code != 200:
             print(f"  Status: {response.status_code}")
             return []
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        main_content = soup.find('div', class_='mw-parser-output')
+        main_content = page_parser.parse_main_content(response.content)
         if not main_content:
             return []
         
@@ -229,7 +225,7 @@ def extract_projects_data():
             headers = [th.get_text().strip().lower() for th in rows[0].find_all(['th', 'td'])]
             
             if 'caravan build' in str(headers) or 'required materials' in str(headers):
-                for row in rows[1:]:
+                for row in run_metrics.timed_iter('row_extraction', rows[1:]):
                     cells = row.find_all(['td', 'th'])
                     if len(cells) >= 2:
                         project_name = ""
@@ -267,15 +263,32 @@ def extract_projects_data():
         print(f"  Error: {e}")
         return []
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract trader, workshop and project data from the ARC Raiders wiki")
+    http_cache.add_cache_arguments(parser)
+    page_parser.add_parser_arguments(parser)
+    wiki_api.add_fetch_arguments(parser)
+    run_metrics.add_metrics_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    http_cache.configure_from_args(args)
+    page_parser.configure_from_args(args)
+    wiki_api.configure_from_args(args)
+    run_metrics.configure_from_args(args, 'extract_all_data')
+
     print("=" * 60)
     print("ARC Raiders - Data Extraction")
     print("=" * 60)
     
     # Extract all data
-    materials_info = extract_trader_data()
-    workshop_data = extract_workshop_data()
-    projects_data = extract_projects_data()
+    with run_metrics.stage('trader'):
+        materials_info = extract_trader_data()
+    with run_metrics.stage('workshop'):
+        workshop_data = extract_workshop_data()
+    with run_metrics.stage('projects'):
+        projects_data = extract_projects_data()
     
     # Get script directory and project root
     import os
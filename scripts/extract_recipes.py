@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Extract crafting AND upgrade recipes from ARC Raiders Wiki in one crawl
+Every page is fetched and parsed once; base recipe tables go to
+crafting_recipes.json, upgrade tables (II, III, IV) to upgrade_recipes.json
+"""
+
+import argparse
+
+import http_cache
+import name_matcher
+import page_parser
+import progress_journal
+import run_metrics
+import wiki_api
+import extract_crafting_recipes as crafting
+import extract_upgrade_recipes as upgrade
+from wiki_crawl import crawl_channels, parse_content, source_parse_key, DEFAULT_HOST_CONCURRENCY
+
+BASE_URLS = crafting.BASE_URLS
+
+def parse_page(content, craftable_items, upgrade_items):
+    """Parse a page once and route its tables to both extractors"""
+    main_content = page_parser.parse_main_content(content)
+
+    def tables(parse_tables, items):
+        def parse(_):
+            if main_content:
+                yield from parse_tables(main_content, items)
+        return parse
+
+    return {
+        'crafting': parse_content(tables(crafting.parse_recipe_tables, craftable_items), content),
+        'upgrade': parse_content(tables(upgrade.parse_upgrade_tables, upgrade_items), content),
+    }
+
+def extract_recipes(concurrency=None, journal=None):
+    """Extract crafting and upgrade recipes in a single crawl
+
+    concurrency: max parallel requests per host (None = sequential crawl)
+    journal: progress_journal.Journal recording finished pages (for --resume)
+    Returns (crafting_recipes, upgrade_recipes)
+    """
+    print("🔧 Extracting crafting and upgrade recipes...")
+
+    craftable_items = crafting.load_craftable_items()
+    upgrade_items = upgrade.add_upgrade_items(craftable_items)
+    print(f"Found {len(craftable_items)} craftable items, {len(upgrade_items)} including upgrades")
+
+    crafting_recipes = {}
+    upgrade_recipes = {}
+    crawl_channels(
+        {
+            'crafting': (
+                crafting.get_crawl_targets(craftable_items),
+                lambda records: crafting.add_recipes(crafting_recipes, records)
+            ),
+            'upgrade': (
+                upgrade.get_crawl_targets(upgrade_items),
+                lambda records: upgrade.add_recipes(upgrade_recipes, records)
+            ),
+        },
+        BASE_URLS,
+        lambda content: parse_page(content, craftable_items, upgrade_items),
+        concurrency=concurrency,
+        parse_key=source_parse_key(
+            [__file__, crafting.__file__, upgrade.__file__, name_matcher.__file__],
+            sorted(upgrade_items)
+        ),
+        journal=journal
+    )
+
+    return (
+        crafting.merge_with_workshop(craftable_items, crafting_recipes),
+        upgrade.merge_with_workshop(upgrade_items, upgrade_recipes)
+    )
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract crafting and upgrade recipes from the ARC Raiders wiki in one crawl")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Fetch pages concurrently instead of one at a time")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_HOST_CONCURRENCY,
+                        help=f"Max parallel requests per host in --async mode (default: {DEFAULT_HOST_CONCURRENCY})")
+    progress_journal.add_resume_argument(parser)
+    http_cache.add_cache_arguments(parser)
+    page_parser.add_parser_arguments(parser)
+    wiki_api.add_fetch_arguments(parser)
+    run_metrics.add_metrics_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    http_cache.configure_from_args(args)
+    page_parser.configure_from_args(args)
+    wiki_api.configure_from_args(args)
+    run_metrics.configure_from_args(args, 'extract_recipes')
+
+    print("=" * 60)
+    print("ARC Raiders - Recipes Extraction")
+    print("=" * 60)
+
+    journal = progress_journal.Journal('extract_recipes', resume=args.resume)
+    with run_metrics.stage('crawl'):
+        crafting_recipes, upgrade_recipes = extract_recipes(
+            concurrency=args.concurrency if args.use_async else None, journal=journal
+        )
+    with run_metrics.stage('save'):
+        crafting.save_recipes(crafting_recipes, 'crafting_recipes.json')
+        crafting.save_recipes(upgrade_recipes, 'upgrade_recipes.json')
+    journal.discard()
+
+    crafting_with = sum(1 for r in crafting_recipes.values() if r.get('required_materials'))
+    upgrade_with = sum(1 for r in upgrade_recipes.values() if r.get('required_materials'))
+    print(f"\n{'='*60}")
+    print(f"Summary: {crafting_with}/{len(crafting_recipes)} items have crafting recipes")
+    print(f"         {upgrade_with}/{len(upgrade_recipes)} items have upgrade recipes")
+    print(f"{'='*60}")
+
+if __name__ == "__main__":
+    main()
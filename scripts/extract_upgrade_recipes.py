@@ -4,60 +4,39 @@ Extract upgrade recipes from ARC Raiders Wiki
 Only extracts upgrade recipes (II, III, IV)
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-import time
+import argparse
 import re
-import os
+
+import catalog
+import http_cache
+import page_parser
+import progress_journal
+import run_metrics
+import wiki_api
+import name_matcher
+from extract_crafting_recipes import load_craftable_items, save_recipes
+from wiki_crawl import crawl_variations, source_parse_key, DEFAULT_HOST_CONCURRENCY
 
 BASE_URLS = [
     "https://arcraiders.wiki",
     "https://arc-raiders.fandom.com"
 ]
 
-def extract_upgrade_recipes():
-    """Extract only upgrade recipes"""
-    print("⬆️  Extracting upgrade recipes...")
-    
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    workshop_file = os.path.join(project_root, 'data', 'workshop_level_ups.json')
-    
-    with open(workshop_file, 'r', encoding='utf-8') as f:
-        workshop_data = json.load(f)
-    
-    # Collect all items including upgrades
-    craftable_items = {}
-    for station_name, levels in workshop_data.get('stations', {}).items():
-        for level_data in levels:
-            level = level_data.get('level', '')
-            for item_name in level_data.get('crafts', []):
-                if item_name not in craftable_items:
-                    craftable_items[item_name] = {
-                        'station': station_name,
-                        'level': level
-                    }
-    
-    # Add upgrade items (II, III, IV)
-    base_items = [item for item in craftable_items.keys() if item.endswith(' I')]
-    for base_item in base_items:
-        base_name = base_item[:-2].strip()
-        for upgrade_level in ['II', 'III', 'IV']:
-            upgrade_item = f"{base_name} {upgrade_level}"
+def add_upgrade_items(craftable_items):
+    """Return craftable_items extended with the upgrade items (II, III, IV)"""
+    craftable_items = dict(craftable_items)
+    for base_item, base_info in list(craftable_items.items()):
+        for upgrade_item in catalog.upgrade_items(base_item):
             if upgrade_item not in craftable_items:
-                base_info = craftable_items[base_item]
                 craftable_items[upgrade_item] = {
                     'station': base_info['station'],
                     'level': base_info['level']
                 }
-    
-    print(f"Found {len(craftable_items)} items (including upgrades)")
-    
-    recipes = {}
-    processed_pages = set()
-    
-    # Group items by base name
+
+    return craftable_items
+
+def group_items_by_base(craftable_items):
+    """Group items by base name (Ferro I/II/III -> Ferro)"""
     base_item_names = set()
     items_by_base = {}
     for item_name in craftable_items.keys():
@@ -73,164 +52,150 @@ def extract_upgrade_recipes():
             if item_name not in items_by_base:
                 items_by_base[item_name] = []
             items_by_base[item_name].append(item_name)
-    
-    # Process each base name
-    for base_name in sorted(base_item_names):
-        related_items = items_by_base.get(base_name, [base_name])
-        url_variations = []
-        
-        # Generate URL variations
-        url_variations.append(base_name.replace(' ', '_'))
-        url_variations.append(base_name.replace(' ', '_').replace("'", "'"))
-        
-        if base_name.endswith(' I'):
-            base_without_i = base_name[:-2].strip()
-            url_variations.insert(0, base_without_i.replace(' ', '_'))
-        
-        for item in related_items:
-            item_wiki = item.replace(' ', '_').replace("'", "'")
-            if item_wiki not in url_variations:
-                url_variations.append(item_wiki)
-        
-        # Remove duplicates
-        seen = set()
-        url_variations = [x for x in url_variations if not (x in seen or seen.add(x))]
-        
-        for wiki_name in url_variations:
-            for base_url in BASE_URLS:
-                url = f"{base_url}/wiki/{wiki_name}"
-                if url in processed_pages:
-                    continue
-                
-                try:
-                    response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        main_content = soup.find('div', class_='mw-parser-output')
-                        if main_content:
-                            tables = main_content.find_all('table')
-                            for table in tables:
-                                rows = table.find_all('tr')
-                                if len(rows) < 2:
-                                    continue
-                                
-                                headers = [th.get_text().strip().lower() for th in rows[0].find_all(['th', 'td'])]
-                                headers_text = ' '.join(headers)
-                                
-                                # Check for upgrade recipe tables
-                                # Upgrade tables can have "upgrade perks" or just "upgrade" in headers
-                                # Also check if result items are II, III, IV
-                                is_upgrade_table = 'upgraded' in headers_text or ('upgrade' in headers_text and ('stats' in headers_text or 'perks' in headers_text))
-                                is_recipe_table = 'recipe' in headers_text or 'craft' in headers_text
-                                
-                                # Process upgrade tables OR tables that might contain upgrade recipes
-                                # Check if table contains II/III/IV items in result column
-                                has_upgrade_items = False
-                                if is_recipe_table:
-                                    for row in rows[1:3]:  # Check first few rows
-                                        cells = row.find_all(['td', 'th'])
-                                        if len(cells) > 4:
-                                            result_text = cells[4].get_text().strip()
-                                            if re.search(r'\s+(II|III|IV)$', result_text):
-                                                has_upgrade_items = True
-                                                break
-                                
-                                if is_recipe_table and (is_upgrade_table or 'upgrade' in headers_text or has_upgrade_items):
-                                    for row in rows[1:]:
-                                        cells = row.find_all(['td', 'th'])
-                                        if len(cells) < 3:
-                                            continue
-                                        
-                                        # Get recipe cell with <br> tags converted to newlines
-                                        recipe_cell = cells[0].get_text(separator='\n').strip()
-                                        
-                                        # Find result item
-                                        result_item = None
-                                        if len(cells) > 4:
-                                            result_item = cells[4].get_text().strip()
-                                        elif len(cells) > 3:
-                                            result_item = cells[3].get_text().strip()
-                                        
-                                        if not result_item:
-                                            continue
-                                        
-                                        # Remove quantity prefix
-                                        result_item = re.sub(r'^\d+\s*[x×]?\s*', '', result_item).strip()
-                                        
-                                        # Match to upgrade items (II, III, IV)
-                                        matching_items = []
-                                        for item in craftable_items.keys():
-                                            if item.lower() == result_item.lower():
-                                                matching_items.append(item)
-                                                break
-                                        
-                                        if not matching_items:
-                                            result_base = re.sub(r'\s+(I{1,3}|IV|V)$', '', result_item).strip().lower()
-                                            if result_base:
-                                                for item in craftable_items.keys():
-                                                    item_base = re.sub(r'\s+(I{1,3}|IV|V)$', '', item).strip().lower()
-                                                    if item_base == result_base and re.search(r'\s+(II|III|IV)$', item):
-                                                        result_level_match = re.search(r'\s+(II|III|IV)$', result_item)
-                                                        item_level_match = re.search(r'\s+(II|III|IV)$', item)
-                                                        if result_level_match and item_level_match:
-                                                            if result_level_match.group(1) == item_level_match.group(1):
-                                                                matching_items.append(item)
-                                                        elif not result_level_match:
-                                                            matching_items.append(item)
-                                        
-                                        for item_name in matching_items:
-                                            if re.search(r'\s+(II|III|IV)$', item_name):
-                                                materials = []
-                                                # Normalize recipe text
-                                                recipe_text = recipe_cell.replace('\n', ' ').replace('+', ' ').strip()
-                                                recipe_text = re.sub(r'([A-Za-z])(\d+\s*[x×])', r'\1 \2', recipe_text)
-                                                
-                                                # Check for base item first
-                                                base_item_match = re.match(r'^([A-Za-z\s]+?)\s+(I{1,3}|IV|V)(.*)$', recipe_text)
-                                                if base_item_match:
-                                                    base_item = base_item_match.group(1).strip() + ' ' + base_item_match.group(2)
-                                                    if base_item.lower() != result_item.lower():
-                                                        materials.append({"material": base_item, "quantity": 1})
-                                                    # Continue with remaining text
-                                                    remaining = base_item_match.group(3).strip()
-                                                    if remaining:
-                                                        recipe_text = remaining
-                                                
-                                                # Find all material patterns
-                                                pattern = r'(\d+)\s*[x×]?\s*([A-Za-z][A-Za-z\s]*?)(?=\s*\d+\s*[x×]|\s*$|$)'
-                                                matches = re.findall(pattern, recipe_text, re.IGNORECASE)
-                                                
-                                                if not matches:
-                                                    match = re.match(r'(\d+)\s*[x×]?\s*(.+?)$', recipe_text, re.IGNORECASE)
-                                                    if match:
-                                                        matches = [match.groups()]
-                                                
-                                                for qty, mat in matches:
-                                                    mat = mat.strip()
-                                                    if not mat:
-                                                        continue
-                                                    skip_keywords = ['gunsmith', 'workshop', 'level', 'upgrade', 'stats', 'perks']
-                                                    if not any(kw in mat.lower() for kw in skip_keywords):
-                                                        materials.append({"material": mat, "quantity": int(qty)})
-                                                
-                                                if materials:
-                                                    recipe_data = {'required_materials': materials, 'is_upgrade': True}
-                                                    base_item = next((m['material'] for m in materials if re.search(r'\s+(I{1,3}|IV|V)$', m.get('material', ''))), None)
-                                                    if base_item:
-                                                        recipe_data['upgrade_from'] = base_item
-                                                    recipes[item_name] = recipe_data
-                                                    print(f"  ✓ {item_name}: {len(materials)} materials")
-                        
-                        processed_pages.add(url)
-                        time.sleep(0.3)
+
+    return base_item_names, items_by_base
+
+def get_url_variations(base_name, related_items):
+    """Generate wiki page name variations for a base name and its upgrades"""
+    url_variations = []
+
+    # Generate URL variations
+    url_variations.append(base_name.replace(' ', '_'))
+
+    if base_name.endswith(' I'):
+        base_without_i = base_name[:-2].strip()
+        url_variations.insert(0, base_without_i.replace(' ', '_'))
+
+    for item in related_items:
+        item_wiki = item.replace(' ', '_')
+        if item_wiki not in url_variations:
+            url_variations.append(item_wiki)
+
+    # Remove duplicates
+    seen = set()
+    return [x for x in url_variations if not (x in seen or seen.add(x))]
+
+def parse_upgrade_page(content, craftable_items):
+    """Yield (item_name, recipe_data) for every upgrade recipe row on a wiki page"""
+    main_content = page_parser.parse_main_content(content)
+    if main_content:
+        yield from parse_upgrade_tables(main_content, craftable_items)
+
+def parse_upgrade_tables(main_content, craftable_items):
+    """Yield (item_name, recipe_data) for every upgrade recipe row in the page content"""
+    matcher = name_matcher.get_matcher(craftable_items)
+    tables = main_content.find_all('table')
+    for table in tables:
+        rows = table.find_all('tr')
+        if len(rows) < 2:
+            continue
+
+        headers = [th.get_text().strip().lower() for th in rows[0].find_all(['th', 'td'])]
+        headers_text = ' '.join(headers)
+
+        # Check for upgrade recipe tables
+        # Upgrade tables can have "upgrade perks" or just "upgrade" in headers
+        # Also check if result items are II, III, IV
+        is_upgrade_table = 'upgraded' in headers_text or ('upgrade' in headers_text and ('stats' in headers_text or 'perks' in headers_text))
+        is_recipe_table = 'recipe' in headers_text or 'craft' in headers_text
+
+        # Process upgrade tables OR tables that might contain upgrade recipes
+        # Check if table contains II/III/IV items in result column
+        has_upgrade_items = False
+        if is_recipe_table:
+            for row in rows[1:3]:  # Check first few rows
+                cells = row.find_all(['td', 'th'])
+                if len(cells) > 4:
+                    result_text = cells[4].get_text().strip()
+                    if re.search(r'\s+(II|III|IV)$', result_text):
+                        has_upgrade_items = True
                         break
-                except Exception as e:
-                    continue
-            
-            if url in processed_pages:
-                break
-    
-    # Merge with workshop data
+
+        if not (is_recipe_table and (is_upgrade_table or 'upgrade' in headers_text or has_upgrade_items)):
+            continue
+
+        for row in run_metrics.timed_iter('row_extraction', rows[1:]):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 3:
+                continue
+
+            # Get recipe cell with <br> tags converted to newlines
+            recipe_cell = cells[0].get_text(separator='\n').strip()
+
+            # Find result item
+            result_item = None
+            if len(cells) > 4:
+                result_item = cells[4].get_text().strip()
+            elif len(cells) > 3:
+                result_item = cells[3].get_text().strip()
+
+            if not result_item:
+                continue
+
+            # Remove quantity prefix
+            result_item = re.sub(r'^\d+\s*[x×]?\s*', '', result_item).strip()
+
+            # Match to upgrade items (II, III, IV)
+            matching_items = matcher.match_upgrade(result_item)
+
+            for item_name in matching_items:
+                if re.search(r'\s+(II|III|IV)$', item_name):
+                    materials = []
+                    # Normalize recipe text
+                    recipe_text = recipe_cell.replace('\n', ' ').replace('+', ' ').strip()
+                    recipe_text = re.sub(r'([A-Za-z])(\d+\s*[x×])', r'\1 \2', recipe_text)
+
+                    # Check for base item first
+                    base_item_match = re.match(r'^([A-Za-z\s]+?)\s+(I{1,3}|IV|V)(.*)$', recipe_text)
+                    if base_item_match:
+                        base_item = base_item_match.group(1).strip() + ' ' + base_item_match.group(2)
+                        if base_item.lower() != result_item.lower():
+                            materials.append({"material": base_item, "quantity": 1})
+                        # Continue with remaining text
+                        remaining = base_item_match.group(3).strip()
+                        if remaining:
+                            recipe_text = remaining
+
+                    # Find all material patterns
+                    pattern = r'(\d+)\s*[x×]?\s*([A-Za-z][A-Za-z\s]*?)(?=\s*\d+\s*[x×]|\s*$|$)'
+                    matches = re.findall(pattern, recipe_text, re.IGNORECASE)
+
+                    if not matches:
+                        match = re.match(r'(\d+)\s*[x×]?\s*(.+?)$', recipe_text, re.IGNORECASE)
+                        if match:
+                            matches = [match.groups()]
+
+                    for qty, mat in matches:
+                        mat = mat.strip()
+                        if not mat:
+                            continue
+                        skip_keywords = ['gunsmith', 'workshop', 'level', 'upgrade', 'stats', 'perks']
+                        if not any(kw in mat.lower() for kw in skip_keywords):
+                            materials.append({"material": mat, "quantity": int(qty)})
+
+                    if materials:
+                        recipe_data = {'required_materials': materials, 'is_upgrade': True}
+                        base_item = next((m['material'] for m in materials if re.search(r'\s+(I{1,3}|IV|V)$', m.get('material', ''))), None)
+                        if base_item:
+                            recipe_data['upgrade_from'] = base_item
+                        yield item_name, recipe_data
+
+def get_crawl_targets(craftable_items):
+    """URL variations per base name (one walk covers Ferro I/II/III/IV)"""
+    base_item_names, items_by_base = group_items_by_base(craftable_items)
+    return [
+        get_url_variations(base_name, items_by_base.get(base_name, [base_name]))
+        for base_name in sorted(base_item_names)
+    ]
+
+def add_recipes(recipes, records):
+    """Merge parsed records into recipes - later rows overwrite earlier ones"""
+    for item_name, recipe_data in records:
+        recipes[item_name] = recipe_data
+        print(f"  ✓ {item_name}: {len(recipe_data['required_materials'])} materials")
+
+def merge_with_workshop(craftable_items, recipes):
+    """Combine station/level info with the extracted upgrade recipes"""
     result = {}
     for item_name, item_info in craftable_items.items():
         if re.search(r'\s+(II|III|IV)$', item_name):
@@ -242,28 +207,63 @@ def extract_upgrade_recipes():
             }
             if 'upgrade_from' in recipe_data:
                 result[item_name]['upgrade_from'] = recipe_data['upgrade_from']
-    
+
     return result
 
+def extract_upgrade_recipes(concurrency=None, journal=None):
+    """Extract only upgrade recipes
+
+    concurrency: max parallel requests per host (None = sequential crawl)
+    journal: progress_journal.Journal recording finished pages (for --resume)
+    """
+    print("⬆️  Extracting upgrade recipes...")
+
+    craftable_items = add_upgrade_items(load_craftable_items())
+    print(f"Found {len(craftable_items)} items (including upgrades)")
+
+    recipes = {}
+    crawl_variations(
+        get_crawl_targets(craftable_items), BASE_URLS,
+        lambda content: parse_upgrade_page(content, craftable_items),
+        lambda records: add_recipes(recipes, records),
+        concurrency=concurrency,
+        parse_key=source_parse_key([__file__, name_matcher.__file__], sorted(craftable_items)),
+        journal=journal
+    )
+
+    return merge_with_workshop(craftable_items, recipes)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract upgrade recipes from the ARC Raiders wiki")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Fetch pages concurrently instead of one at a time")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_HOST_CONCURRENCY,
+                        help=f"Max parallel requests per host in --async mode (default: {DEFAULT_HOST_CONCURRENCY})")
+    progress_journal.add_resume_argument(parser)
+    http_cache.add_cache_arguments(parser)
+    page_parser.add_parser_arguments(parser)
+    wiki_api.add_fetch_arguments(parser)
+    run_metrics.add_metrics_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    http_cache.configure_from_args(args)
+    page_parser.configure_from_args(args)
+    wiki_api.configure_from_args(args)
+    run_metrics.configure_from_args(args, 'extract_upgrade_recipes')
+
     print("=" * 60)
     print("ARC Raiders - Upgrade Recipes Extraction")
     print("=" * 60)
-    
-    recipes = extract_upgrade_recipes()
-    
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    
-    output_file = os.path.join(project_root, 'data', 'upgrade_recipes.json')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(recipes, f, indent=2, ensure_ascii=False)
-    print(f"\n💾 Saved {len(recipes)} recipes to {output_file}")
-    
-    import shutil
-    shutil.copy(output_file, os.path.join(project_root, 'frontend', 'public', 'upgrade_recipes.json'))
-    print("✅ Copied to frontend/public/upgrade_recipes.json")
-    
+
+    journal = progress_journal.Journal('extract_upgrade_recipes', resume=args.resume)
+    with run_metrics.stage('crawl'):
+        recipes = extract_upgrade_recipes(concurrency=args.concurrency if args.use_async else None, journal=journal)
+    with run_metrics.stage('save'):
+        save_recipes(recipes, 'upgrade_recipes.json')
+    journal.discard()
+
     with_recipes = sum(1 for r in recipes.values() if r.get('required_materials'))
     print(f"\n{'='*60}")
     print(f"Summary: {with_recipes}/{len(recipes)} items have upgrade recipes")
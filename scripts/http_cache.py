@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP response cache shared by all wiki scrapers.
+Stores body, headers and validators per URL in .cache/http/ and revalidates
+with conditional GETs (ETag / Last-Modified), so unchanged pages and images
+are neither downloaded nor parsed again. URLs that answered 404 / 410 are
+remembered for a TTL, so guessed page names that do not exist are not
+requested on every run.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import rate_limit
+import run_metrics
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+DEFAULT_CACHE_DIR = os.path.join(project_root, '.cache', 'http')
+USER_AGENT = rate_limit.USER_AGENT
+CHUNK_SIZE = 64 * 1024
+MISSING_STATUS = (404, 410)
+DEFAULT_MISSING_TTL_DAYS = 7
+TITLES_FILE = 'titles.json'  # Resolved wiki page titles (see wiki_api)
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response backed by the cache."""
+
+    def __init__(self, url, status_code, content=b'', headers=None, from_cache=False, retries=0):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        # True if the body was served from disk (304 or offline hit)
+        self.from_cache = from_cache
+        self.retries = retries  # Throttled attempts before this response (see rate_limit)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class StreamedResponse:
+    """Streaming counterpart of CachedResponse, used as a context manager.
+
+    iter_content() yields the body in chunks, from the network or from the
+    cached body file, without holding the whole body in memory.
+    """
+
+    def __init__(self, url, status_code, headers=None, chunks=None, from_cache=False, close=None, retries=0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.from_cache = from_cache
+        self.retries = retries
+        self._chunks = chunks if chunks is not None else iter(())
+        self._close = close
+        self.bytes_read = 0
+        self.on_close = None  # Called with the response once it is closed
+
+    def iter_content(self):
+        for chunk in self._chunks:
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+        if self.on_close is not None:
+            on_close, self.on_close = self.on_close, None
+            on_close(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _read_chunks(path):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+class HttpCache:
+    """On-disk cache keyed by URL: <sha1>.json holds metadata, <sha1>.body the content,
+    <sha1>.missing marks a URL that was not found."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, offline=False, missing_ttl=DEFAULT_MISSING_TTL_DAYS * 86400):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.missing_ttl = missing_ttl  # Seconds; 0 = do not remember missing URLs
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{suffix}")
+
+    def _write(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load_meta(self, url):
+        """Return the metadata of a cached URL if its body is present, else None."""
+        try:
+            with open(self._path(url, 'json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._path(url, 'body')):
+            return None
+        return meta
+
+    def load(self, url):
+        """Return (meta, body) for a cached URL, or (None, None)."""
+        meta = self.load_meta(url)
+        if meta is None:
+            return None, None
+        try:
+            with open(self._path(url, 'body'), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None, None
+        return meta, body
+
+    def _store_meta(self, url, response_headers):
+        meta = {
+            'url': url,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'headers': dict(response_headers),
+            'fetched_at': time.time(),
+        }
+        self._write(self._path(url, 'json'), json.dumps(meta).encode('utf-8'))
+        # New content - results parsed from the old body are stale
+        parsed_path = self._path(url, 'parsed.json')
+        if os.path.exists(parsed_path):
+            os.remove(parsed_path)
+
+    def store(self, url, response):
+        self._write(self._path(url, 'body'), response.content)
+        self._store_meta(url, response.headers)
+        self._remove(url, 'missing')
+
+    def _remove(self, url, *suffixes):
+        for suffix in suffixes:
+            path = self._path(url, suffix)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def load_missing(self, url):
+        """Return the status (404 / 410) of a URL found missing within the TTL, else None."""
+        if not self.missing_ttl:
+            return None
+        try:
+            with open(self._path(url, 'missing'), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('checked_at', 0) > self.missing_ttl:
+            return None
+        return entry.get('status')
+
+    def store_missing(self, url, status):
+        """Remember that a URL does not exist (and drop what was cached for it)."""
+        if not self.missing_ttl:
+            return
+        entry = {'url': url, 'status': status, 'checked_at': time.time()}
+        self._write(self._path(url, 'missing'), json.dumps(entry).encode('utf-8'))
+        self._remove(url, 'json', 'body', 'parsed.json')
+
+    def _request_headers(self, meta, headers):
+        request_headers = {'User-Agent': USER_AGENT}
+        request_headers.update(headers or {})
+        if meta is not None:
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+        return request_headers
+
+    def get(self, url, timeout=10, headers=None):
+        """GET url, revalidating a cached copy with a conditional request."""
+        missing = self.load_missing(url)
+        if missing is not None:
+            return CachedResponse(url, missing, from_cache=True)
+        meta, body = self.load(url)
+
+        if self.offline:
+            if meta is None:
+                # Same semantics as Cache-Control: only-if-cached
+                return CachedResponse(url, 504)
+            return CachedResponse(url, 200, body, meta['headers'], from_cache=True)
+
+        response = rate_limit.get(url, headers=self._request_headers(meta, headers), timeout=timeout)
+
+        if response.status_code == 304 and meta is not None:
+            return CachedResponse(url, 200, body, meta['headers'], from_cache=True, retries=response.retries)
+
+        if response.status_code == 200:
+            self.store(url, response)
+        elif response.status_code in MISSING_STATUS:
+            self.store_missing(url, response.status_code)
+        return CachedResponse(url, response.status_code, response.content, response.headers, retries=response.retries)
+
+    def stream(self, url, timeout=10, headers=None):
+        """Like get(), but returns a StreamedResponse.
+
+        A 200 body is written to the cache while it is being streamed and only
+        committed once it has been read completely.
+        """
+        missing = self.load_missing(url)
+        if missing is not None:
+            return StreamedResponse(url, missing, from_cache=True)
+        meta = self.load_meta(url)
+        body_path = self._path(url, 'body')
+
+        if self.offline:
+            if meta is None:
+                return StreamedResponse(url, 504)
+            return StreamedResponse(url, 200, meta['headers'], _read_chunks(body_path), from_cache=True)
+
+        response = rate_limit.get(url, headers=self._request_headers(meta, headers), timeout=timeout, stream=True)
+
+        if response.status_code == 304 and meta is not None:
+            response.close()
+            return StreamedResponse(url, 200, meta['headers'], _read_chunks(body_path), from_cache=True,
+                                    retries=response.retries)
+
+        if response.status_code != 200:
+            if response.status_code in MISSING_STATUS:
+                self.store_missing(url, response.status_code)
+            return StreamedResponse(url, response.status_code, response.headers,
+                                    response.iter_content(CHUNK_SIZE), close=response.close, retries=response.retries)
+
+        tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        def tee():
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, body_path)
+            self._store_meta(url, response.headers)
+            self._remove(url, 'missing')
+
+        def close():
+            response.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return StreamedResponse(url, 200, response.headers, tee(), close=close, retries=response.retries)
+
+    def load_parsed(self, url, parse_key):
+        """Return the parse result stored for url's current body under parse_key."""
+        try:
+            with open(self._path(url, 'parsed.json'), 'r', encoding='utf-8') as f:
+                parsed = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return parsed.get(parse_key)
+
+    def store_parsed(self, url, parse_key, value):
+        try:
+            with open(self._path(url, 'parsed.json'), 'r', encoding='utf-8') as f:
+                parsed = json.load(f)
+        except (OSError, ValueError):
+            parsed = {}
+        parsed[parse_key] = value
+        self._write(self._path(url, 'parsed.json'), json.dumps(parsed, ensure_ascii=False).encode('utf-8'))
+
+    def load_titles(self):
+        """{page url: resolved title or None} of the titles checked within the missing TTL."""
+        if not self.missing_ttl:
+            return {}
+        try:
+            with open(os.path.join(self.cache_dir, TITLES_FILE), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {url: entry['title'] for url, entry in entries.items()
+                if self.offline or now - entry.get('checked_at', 0) <= self.missing_ttl}
+
+    def store_titles(self, titles):
+        """Remember resolved page titles ({page url: title or None})."""
+        if not self.missing_ttl or self.offline:
+            return
+        path = os.path.join(self.cache_dir, TITLES_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        now = time.time()
+        entries.update({url: {'title': title, 'checked_at': now} for url, title in titles.items()})
+        self._write(path, json.dumps(entries, ensure_ascii=False).encode('utf-8'))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_enabled = True
+
+
+def configure(enabled=True, offline=False, cache_dir=DEFAULT_CACHE_DIR, missing_ttl=DEFAULT_MISSING_TTL_DAYS * 86400):
+    """Set up the shared cache (called once from a script's main())."""
+    global _cache, _enabled
+    _enabled = enabled
+    _cache = HttpCache(cache_dir, offline=offline, missing_ttl=missing_ttl) if enabled else None
+
+
+def get_cache():
+    """Return the shared cache, or None if caching is disabled."""
+    global _cache
+    if not _enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+    return _cache
+
+
+def is_offline():
+    cache = get_cache()
+    return cache is not None and cache.offline
+
+
+def cache_status(cache, response):
+    """How the cache answered a request, for run_metrics"""
+    if cache is None:
+        return 'disabled'
+    if getattr(response, 'from_cache', False) and response.status_code in MISSING_STATUS:
+        return 'known-missing'
+    if getattr(response, 'from_cache', False):
+        return 'hit' if cache.offline else 'revalidated'
+    return 'offline-miss' if cache.offline else 'miss'
+
+
+def cached_get(url, timeout=10, headers=None):
+    """Drop-in replacement for requests.get used by the scrapers."""
+    cache = get_cache()
+    start = time.perf_counter()
+    try:
+        if cache is None:
+            request_headers = {'User-Agent': USER_AGENT}
+            request_headers.update(headers or {})
+            response = rate_limit.get(url, headers=request_headers, timeout=timeout)
+        else:
+            response = cache.get(url, timeout=timeout, headers=headers)
+    except Exception as e:
+        run_metrics.record_request(url, None, time.perf_counter() - start, None, cache_status(cache, None), error=str(e))
+        raise
+    run_metrics.record_request(url, response.status_code, time.perf_counter() - start, len(response.content),
+                               cache_status(cache, response), getattr(response, 'retries', 0))
+    return response
+
+
+def stream_get(url, timeout=10, headers=None):
+    """Streaming variant of cached_get - use as a context manager."""
+    cache = get_cache()
+    start = time.perf_counter()
+    try:
+        if cache is None:
+            request_headers = {'User-Agent': USER_AGENT}
+            request_headers.update(headers or {})
+            response = rate_limit.get(url, headers=request_headers, timeout=timeout, stream=True)
+            response = StreamedResponse(url, response.status_code, response.headers,
+                                        response.iter_content(CHUNK_SIZE), close=response.close,
+                                        retries=response.retries)
+        else:
+            response = cache.stream(url, timeout=timeout, headers=headers)
+    except Exception as e:
+        run_metrics.record_request(url, None, time.perf_counter() - start, None, cache_status(cache, None), error=str(e))
+        raise
+    # The body is only transferred while it is read - record the request when it is closed
+    status = cache_status(cache, response)
+    response.on_close = lambda r: run_metrics.record_request(
+        url, r.status_code, time.perf_counter() - start, r.bytes_read, status, getattr(r, 'retries', 0))
+    return response
+
+
+def make_parse_key(*parts):
+    """Build a key identifying a parser and its inputs for load_parsed/store_parsed."""
+    digest = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def add_cache_arguments(parser):
+    """Add the shared --offline / --no-cache / --cache-dir / --missing-ttl options to an argparse parser."""
+    group = parser.add_argument_group('HTTP cache')
+    group.add_argument('--offline', action='store_true',
+                       help="Serve only from the local HTTP cache, never touch the network")
+    group.add_argument('--no-cache', action='store_true',
+                       help="Disable the local HTTP cache")
+    group.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f"HTTP cache directory (default: {os.path.relpath(DEFAULT_CACHE_DIR, project_root)})")
+    group.add_argument('--missing-ttl', type=float, default=DEFAULT_MISSING_TTL_DAYS, metavar='DAYS',
+                       help=f"Skip URLs that answered 404/410 within this many days "
+                            f"(default: {DEFAULT_MISSING_TTL_DAYS}, 0 = always ask again)")
+
+
+def configure_from_args(args):
+    if args.offline and args.no_cache:
+        raise SystemExit("--offline needs the cache, it cannot be combined with --no-cache")
+    configure(enabled=not args.no_cache, offline=args.offline, cache_dir=args.cache_dir,
+              missing_ttl=args.missing_ttl * 86400)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Manifest of the downloaded item icons (frontend/public/icons/manifest.json).
+Records per icon file its size, dimensions and sha256, and per item the file
+it uses plus the source URL and its validators (ETag / Last-Modified).
+download_icons.py uses it to revalidate icons with conditional requests
+instead of re-downloading them, and to store byte-identical icons only once.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+def image_size(path):
+    """(width, height) of a PNG, GIF, JPEG or WebP file, read from its header; (None, None) if unknown"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        if data.startswith(b'\x89PNG\r\n\x1a\n'):
+            return struct.unpack('>II', data[16:24])
+        if data[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', data[6:10])
+        if data.startswith(b'RIFF') and data[8:12] == b'WEBP':
+            chunk = data[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', data[26:30])
+                return width & 0x3fff, height & 0x3fff
+            if chunk == b'VP8L':
+                bits = struct.unpack('<I', data[21:25])[0]
+                return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+            if chunk == b'VP8X':
+                return (int.from_bytes(data[24:27], 'little') + 1,
+                        int.from_bytes(data[27:30], 'little') + 1)
+        if data.startswith(b'\xff\xd8'):
+            i = 2
+            while i + 9 <= len(data) and data[i] == 0xff:
+                marker = data[i + 1]
+                # SOF0..SOF15 carry the frame size (C4/C8/CC are other segments)
+                if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+                    height, width = struct.unpack('>HH', data[i + 5:i + 9])
+                    return width, height
+                i += 2 + struct.unpack('>H', data[i + 2:i + 4])[0]
+    except struct.error:
+        pass
+    return None, None
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class IconManifest:
+    """Icon files and item -> icon assignments, safe to use from several download threads."""
+
+    def __init__(self, icons_dir):
+        self.icons_dir = icons_dir
+        self.path = os.path.join(icons_dir, MANIFEST_NAME)
+        self.icons = {}   # filename -> {'sha256', 'size', 'width', 'height'}
+        self.items = {}   # item name -> {'file', 'url', 'etag', 'last_modified'}
+        self.lock = threading.RLock()
+        # Files found to duplicate a recorded icon, deleted by prune() once unused
+        self.duplicates = set()
+
+    @classmethod
+    def load(cls, icons_dir):
+        manifest = cls(icons_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get('version') == MANIFEST_VERSION:
+            manifest.icons = data.get('icons', {})
+            manifest.items = data.get('items', {})
+        return manifest
+
+    def save(self):
+        with self.lock:
+            data = {'version': MANIFEST_VERSION, 'icons': self.icons, 'items': self.items}
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+    def is_valid(self, filename):
+        """Cheap check that a recorded icon is still on disk unchanged (by size)"""
+        icon = self.icons.get(filename)
+        path = os.path.join(self.icons_dir, filename)
+        return icon is not None and os.path.exists(path) and os.path.getsize(path) == icon['size']
+
+    def validators(self, name, url):
+        """Conditional request headers for an item's icon, if it was fetched from url before"""
+        entry = self.items.get(name)
+        if not entry or entry.get('url') != url or not self.is_valid(entry['file']):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def file_for_hash(self, sha256):
+        for filename, icon in self.icons.items():
+            if icon['sha256'] == sha256 and self.is_valid(filename):
+                return filename
+        return None
+
+    def is_shared(self, filename, name):
+        """True if another item uses the icon file"""
+        return any(entry['file'] == filename and other != name for other, entry in self.items.items())
+
+    def add_icon(self, path, filename=None, sha256=None):
+        """Record the icon at path under filename (default: its own name); returns the filename to use.
+
+        If a byte-identical icon is already recorded, that file is returned
+        and path is left for the caller to discard.
+        """
+        with self.lock:
+            sha256 = sha256 or file_sha256(path)
+            filename = filename or os.path.basename(path)
+            existing = self.file_for_hash(sha256)
+            if existing is not None:
+                if existing != filename:
+                    self.duplicates.add(filename)
+                return existing
+            width, height = image_size(path)
+            self.icons[filename] = {
+                'sha256': sha256,
+                'size': os.path.getsize(path),
+                'width': width,
+                'height': height,
+            }
+            return filename
+
+    def set_item(self, name, filename, url=None, headers=None):
+        """Assign an icon file to an item, with the source URL and its validators"""
+        headers = headers or {}
+        with self.lock:
+            self.items[name] = {
+                'file': filename,
+                'url': url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+            }
+
+    def prune(self, items):
+        """Forget removed items and delete recorded or duplicate icon files no item uses. Returns the deleted files."""
+        with self.lock:
+            names = {item.get('name') for item in items}
+            self.items = {name: entry for name, entry in self.items.items() if name in names}
+            used = {os.path.basename(item.get('image') or '') for item in items}
+            removed = sorted(f for f in set(self.icons) | self.duplicates if f not in used)
+            for filename in removed:
+                self.icons.pop(filename, None)
+                path = os.path.join(self.icons_dir, filename)
+                if os.path.exists(path):
+                    os.remove(path)
+            self.duplicates.clear()
+            return removed
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Indexed matching of wiki table result names to craftable items.
+Replaces the per-row linear scans over all craftable items (exact match,
+roman-numeral base-name match, substring match) with prebuilt lookups, so
+each row resolves in near-constant time. Matches (and their order) are the
+same as the old scans.
+"""
+
+import functools
+import re
+
+ROMAN_SUFFIX = re.compile(r'\s+(I{1,3}|IV|V)$')
+UPGRADE_SUFFIX = re.compile(r'\s+(II|III|IV)$')
+MIN_PARTIAL_LENGTH = 4  # Substring matches need more than 3 characters
+
+
+def base_name(name):
+    """Lower-cased name without a roman numeral suffix (Ferro III -> ferro)"""
+    return ROMAN_SUFFIX.sub('', name).strip().lower()
+
+
+class ItemMatcher:
+    """Lookup tables over a fixed list of item names (kept in the given order)."""
+
+    def __init__(self, item_names):
+        self.items = list(item_names)
+        self._exact = {}
+        self._clean = {}
+        self._by_base = {}
+        self._upgrades_by_base = {}
+        # Every substring (>= MIN_PARTIAL_LENGTH chars) of every item name,
+        # i.e. a flattened suffix trie: the partial match becomes one lookup
+        self._substrings = {}
+
+        for item in self.items:
+            self._exact.setdefault(item.lower(), item)
+
+            item_clean = item.lower().strip()
+            self._clean.setdefault(item_clean, []).append(item)
+
+            item_base = base_name(item)
+            self._by_base.setdefault(item_base, []).append(item)
+            level_match = UPGRADE_SUFFIX.search(item)
+            if level_match:
+                self._upgrades_by_base.setdefault(item_base, []).append((item, level_match.group(1)))
+
+            for start in range(len(item_clean)):
+                for end in range(start + MIN_PARTIAL_LENGTH, len(item_clean) + 1):
+                    matches = self._substrings.setdefault(item_clean[start:end], [])
+                    if not matches or matches[-1] != item:
+                        matches.append(item)
+
+    def exact(self, result_item):
+        """Case-insensitive exact match (first item wins)"""
+        item = self._exact.get(result_item.lower())
+        return [item] if item is not None else []
+
+    def by_base(self, result_item):
+        """All items sharing the result's base name (Ferro II matches Ferro I, Ferro III, ...)"""
+        result_base = base_name(result_item)
+        if not result_base:
+            return []
+        return list(self._by_base.get(result_base, []))
+
+    def partial(self, result_item):
+        """Items equal to the result or containing it (results longer than 3 characters)"""
+        result_clean = result_item.lower().strip()
+        if len(result_clean) < MIN_PARTIAL_LENGTH:
+            return list(self._clean.get(result_clean, []))
+        return list(self._substrings.get(result_clean, []))
+
+    def upgrades_by_base(self, result_item):
+        """Upgrade items (II, III, IV) with the result's base name and, if given, its level"""
+        result_base = base_name(result_item)
+        if not result_base:
+            return []
+        result_level_match = UPGRADE_SUFFIX.search(result_item)
+        result_level = result_level_match.group(1) if result_level_match else None
+        return [
+            item for item, level in self._upgrades_by_base.get(result_base, [])
+            if result_level is None or level == result_level
+        ]
+
+    def match_crafting(self, result_item):
+        """Exact match, then base-name match, then partial match"""
+        return self.exact(result_item) or self.by_base(result_item) or self.partial(result_item)
+
+    def match_upgrade(self, result_item):
+        """Exact match, then upgrade items with the same base name and level"""
+        return self.exact(result_item) or self.upgrades_by_base(result_item)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_matcher(item_names):
+    return ItemMatcher(item_names)
+
+
+def get_matcher(item_names):
+    """Shared matcher per item list, built once per process"""
+    return _get_matcher(tuple(item_names))
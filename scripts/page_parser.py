@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML parser backends for the wiki scrapers.
+Only the article body (div.mw-parser-output) is turned into a BeautifulSoup
+tree, so the extractors keep their bs4 code while skipping the fandom skin
+(navigation, ads, scripts), which is most of every page.
+
+Backends (fastest first):
+- selectolax: lexbor (C) parser cuts out the article subtree, bs4 parses just that
+- lxml:       bs4 with the lxml parser, building only the article subtree
+- html.parser: bs4 with the stdlib parser, building only the article subtree
+"""
+
+import importlib.util
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+import run_metrics
+
+BACKENDS = ['selectolax', 'lxml', 'html.parser']
+MAIN_CONTENT_CLASS = 'mw-parser-output'
+
+_backend = None
+
+
+def _is_installed(module):
+    return importlib.util.find_spec(module) is not None
+
+
+def available_backends():
+    """Installed backends, fastest first."""
+    return [name for name in BACKENDS if name == 'html.parser' or _is_installed(name)]
+
+
+def default_backend():
+    return available_backends()[0]
+
+
+def set_backend(name):
+    """Select the backend used by parse_main_content ('auto' = fastest installed)."""
+    global _backend
+    if name in (None, 'auto'):
+        name = default_backend()
+    if name not in available_backends():
+        raise SystemExit(f"Parser backend '{name}' is not installed (available: {', '.join(available_backends())})")
+    _backend = name
+
+
+def get_backend():
+    if _backend is None:
+        set_backend('auto')
+    return _backend
+
+
+def _bs4_features():
+    return 'lxml' if _is_installed('lxml') else 'html.parser'
+
+
+def parse_main_content(content, backend=None):
+    """Return the div.mw-parser-output Tag of a wiki page, or None."""
+    with run_metrics.timed('html_parse'):
+        return _parse_main_content(content, backend or get_backend())
+
+
+def _parse_main_content(content, backend):
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        node = LexborHTMLParser(content).css_first(f'div.{MAIN_CONTENT_CLASS}')
+        if node is None:
+            return None
+        soup = BeautifulSoup(node.html, _bs4_features())
+        return soup.find('div', class_=MAIN_CONTENT_CLASS)
+
+    strainer = SoupStrainer('div', class_=MAIN_CONTENT_CLASS)
+    soup = BeautifulSoup(content, backend, parse_only=strainer)
+    return soup.find('div', class_=MAIN_CONTENT_CLASS)
+
+
+def parse_full_page(content, backend=None):
+    """Parse a whole page (for callers that need more than the article body)."""
+    backend = backend or get_backend()
+    if backend == 'selectolax':
+        backend = _bs4_features()
+    with run_metrics.timed('html_parse'):
+        return BeautifulSoup(content, backend)
+
+
+def add_parser_arguments(parser):
+    """Add the shared --parser option to an argparse parser."""
+    parser.add_argument('--parser', default='auto', choices=['auto'] + BACKENDS,
+                        help="HTML parser backend (default: fastest installed)")
+
+
+def configure_from_args(args):
+    set_backend(args.parser)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Probe the wiki for recipes of items that have none yet
+Takes the items without recipes from check_missing_recipes.py, resolves all
+page name variations on both wikis with batched title queries and fetches
+the existing pages concurrently through the shared HTTP cache. Reports per
+item which host and which table (header set) holds recipe data, and whether
+the recipe extractors already pick it up.
+"""
+
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import http_cache
+import page_parser
+import run_metrics
+import wiki_api
+import check_missing_recipes
+import extract_crafting_recipes as crafting
+import extract_upgrade_recipes as upgrade
+
+BASE_URLS = crafting.BASE_URLS
+DEFAULT_WORKERS = 8
+# Header words of tables that may hold recipe data
+RECIPE_HEADER_KEYWORDS = ('recipe', 'craft', 'material', 'blueprint', 'upgrade', 'ingredient')
+# "  - Item Name (Level 2)" lines of check_missing_recipes.py
+MISSING_ITEM_LINE = re.compile(r'^\s+- (.+) \(([^()]*)\)$')
+
+def parse_missing_output(lines):
+    """Item names from the "Items WITHOUT recipes" section of check_missing_recipes.py's output"""
+    items = []
+    in_section = False
+    for line in lines:
+        if line.startswith('Items WITHOUT recipes'):
+            in_section = True
+        elif line.startswith('Items WITH recipes'):
+            break
+        elif in_section:
+            match = MISSING_ITEM_LINE.match(line.rstrip('\n'))
+            if match:
+                items.append(match.group(1))
+    return items
+
+def analyze_page(content, craftable_items, upgrade_items):
+    """Recipe-like tables of a page and the items the extractors find on it"""
+    main_content = page_parser.parse_main_content(content)
+    if main_content is None:
+        return None
+
+    tables = []
+    for table in main_content.find_all('table'):
+        rows = table.find_all('tr')
+        if not rows:
+            continue
+        headers = [cell.get_text(' ', strip=True) for cell in rows[0].find_all(['th', 'td'])]
+        if any(keyword in ' '.join(headers).lower() for keyword in RECIPE_HEADER_KEYWORDS):
+            tables.append({'headers': headers, 'rows': len(rows) - 1,
+                           'text': table.get_text(' ', strip=True).lower()})
+
+    extracted = set()
+    for parse_tables, items in ((crafting.parse_recipe_tables, craftable_items),
+                                (upgrade.parse_upgrade_tables, upgrade_items)):
+        try:
+            extracted.update(item for item, _ in parse_tables(main_content, items))
+        except Exception as e:
+            print(f"  ⚠️  {parse_tables.__module__} failed: {e}")
+    return {'tables': tables, 'extracted': extracted}
+
+def probe_page(url, craftable_items, upgrade_items):
+    try:
+        response = wiki_api.get_page(url, timeout=10)
+    except Exception as e:
+        print(f"  ⚠️  {url}: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    return analyze_page(response.content, craftable_items, upgrade_items)
+
+def candidate_pages(item_name):
+    """Distinct page URLs an item may live on, in crawl order (missing pages already dropped)"""
+    unchecked = object()
+    pages = []
+    for urls in wiki_api.variation_urls(wiki_api.title_variations(item_name), BASE_URLS):
+        for url in urls:
+            title = wiki_api.resolved_title(url, unchecked)
+            if title is None:
+                continue
+            if title is not unchecked:
+                url = wiki_api.page_url(wiki_api.split_page_url(url)[0], title)
+            if url not in pages:
+                pages.append(url)
+    return pages
+
+def names_item(text, item_name):
+    """True if text names the item as a whole word ("Ferro I" is not in "Ferro II")"""
+    return re.search(rf'(?<!\w){re.escape(item_name.lower())}(?!\w)', text) is not None
+
+def item_findings(item_name, url, page):
+    """What a probed page holds for one item: (extracted, recipe tables, tables name the item)
+
+    On the item's own page the recipe tables are reported even if none names
+    the item, since recipes there often leave out the result column.
+    """
+    tables = [table for table in page['tables'] if names_item(table['text'], item_name)]
+    if tables:
+        return item_name in page['extracted'], tables, True
+    own_names = {item_name.lower(), wiki_api.TIER_SUFFIX.sub('', item_name).lower()}
+    if wiki_api.split_page_url(url)[1].replace('_', ' ').lower() in own_names:
+        return item_name in page['extracted'], page['tables'], False
+    return item_name in page['extracted'], [], False
+
+def probe(item_names, workers, craftable_items, upgrade_items):
+    """Probe all items; returns {item: {pages_checked, findings (one per page with recipe data)}}"""
+    with run_metrics.stage('resolve'):
+        wiki_api.resolve_urls(
+            url for item_name in item_names
+            for urls in wiki_api.variation_urls(wiki_api.title_variations(item_name), BASE_URLS) for url in urls
+        )
+        candidates = {item_name: candidate_pages(item_name) for item_name in item_names}
+
+    urls = list(dict.fromkeys(url for pages in candidates.values() for url in pages))
+    print(f"🔎 Probing {len(urls)} pages for {len(item_names)} items ({workers} workers)...")
+    with run_metrics.stage('probe'), ThreadPoolExecutor(max_workers=workers) as executor:
+        pages = dict(zip(urls, executor.map(lambda url: probe_page(url, craftable_items, upgrade_items), urls)))
+
+    results = {}
+    for item_name in item_names:
+        findings = []
+        for url in candidates[item_name]:
+            if pages.get(url) is None:
+                continue
+            extracted, tables, named = item_findings(item_name, url, pages[url])
+            if extracted or tables:
+                findings.append({
+                    'url': url,
+                    'host': urlparse(url).netloc,
+                    'extracted': extracted,
+                    'named': named,
+                    'tables': [{'headers': table['headers'], 'rows': table['rows']} for table in tables],
+                })
+        results[item_name] = {'pages_checked': len(candidates[item_name]), 'findings': findings}
+    return results
+
+def item_status(result):
+    """extracted, tables (named in a recipe table), page (own page has recipe tables) or none"""
+    findings = result['findings']
+    if any(finding['extracted'] for finding in findings):
+        return 'extracted'
+    if any(finding['named'] for finding in findings):
+        return 'tables'
+    return 'page' if findings else 'none'
+
+def print_report(results):
+    symbols = {'extracted': '✓', 'tables': '~', 'page': '?', 'none': '✗'}
+    for item_name, result in results.items():
+        status = item_status(result)
+        line = f"  {symbols[status]} {item_name}"
+        if status == 'none':
+            line += f" - no recipe data ({result['pages_checked']} pages)"
+        print(line)
+        for finding in result['findings']:
+            path = urlparse(finding['url']).path
+            note = '  (extracted)' if finding['extracted'] else '' if finding['named'] else '  (item not named in the tables)'
+            print(f"      {finding['host']}{path}{note}")
+            for table in finding['tables']:
+                print(f"        [{' | '.join(table['headers'])}] {table['rows']} rows")
+
+    counts = {status: sum(1 for r in results.values() if item_status(r) == status) for status in symbols}
+    print(f"\n{'='*60}")
+    print(f"Summary: {counts['extracted']} extracted, {counts['tables']} in recipe tables the extractors miss, "
+          f"{counts['page']} with unnamed recipe tables on their page, {counts['none']} without recipe data "
+          f"({len(results)} items)")
+    print(f"{'='*60}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Probe the wiki for recipes of items without one")
+    parser.add_argument('items', nargs='*', metavar='item',
+                        help="Items to probe (default: the items without recipes from check_missing_recipes.py)")
+    parser.add_argument('--from-output', metavar='FILE',
+                        help="Read the items from saved check_missing_recipes.py output ('-' for stdin)")
+    parser.add_argument('--all', action='store_true', help="Probe all craftable items, not only the missing ones")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Pages fetched in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--json', metavar='FILE', help="Also write the report as JSON")
+    http_cache.add_cache_arguments(parser)
+    page_parser.add_parser_arguments(parser)
+    wiki_api.add_fetch_arguments(parser)
+    run_metrics.add_metrics_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    http_cache.configure_from_args(args)
+    page_parser.configure_from_args(args)
+    wiki_api.configure_from_args(args)
+    run_metrics.configure_from_args(args, 'probe_recipe_coverage')
+
+    if args.items:
+        item_names = args.items
+    elif args.from_output:
+        if args.from_output == '-':
+            item_names = parse_missing_output(sys.stdin)
+        else:
+            with open(args.from_output, 'r', encoding='utf-8') as f:
+                item_names = parse_missing_output(f)
+    elif args.all:
+        item_names = [item for item, _, _ in check_missing_recipes.collect_items()]
+    else:
+        item_names = [item for item, _, _ in check_missing_recipes.find_items_without_recipes()]
+    item_names = sorted(set(item_names))
+
+    print("=" * 60)
+    print("ARC Raiders - Recipe Coverage Probe")
+    print("=" * 60)
+
+    craftable_items = crafting.load_craftable_items()
+    upgrade_items = upgrade.add_upgrade_items(craftable_items)
+    results = probe(item_names, max(1, args.workers), craftable_items, upgrade_items)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Report saved to {args.json}")
+
+if __name__ == "__main__":
+    main()
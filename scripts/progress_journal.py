@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Append-only progress journal for long scraper runs.
+Every finished unit of work (a crawled page, a processed item) is appended
+to .cache/journal/<name>.jsonl as soon as it is done. After a crash or
+Ctrl+C, --resume replays the journaled results instead of redoing the work;
+a finished run deletes its journal.
+
+The first line holds a key describing the run's inputs (parser source,
+items, ...). A journal written for different inputs is never replayed.
+"""
+
+import json
+import os
+import threading
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+DEFAULT_JOURNAL_DIR = os.path.join(project_root, '.cache', 'journal')
+
+
+class Journal:
+    """Results of finished work units by id, persisted one JSON line per unit."""
+
+    def __init__(self, name, resume=False, journal_dir=DEFAULT_JOURNAL_DIR):
+        self.path = os.path.join(journal_dir, f"{name}.jsonl")
+        self.resume = resume
+        self.entries = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def start(self, key):
+        """Open the journal for a run with the given key, loading it first with resume=True."""
+        with self._lock:
+            if self._file is not None:
+                return
+            if self.resume:
+                self.entries = self._load(key)
+                if self.entries:
+                    print(f"↩️  Resuming: {len(self.entries)} finished entries in {os.path.relpath(self.path, project_root)}")
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Rewrite the replayed entries, dropping a torn last line
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({'key': key})
+            for unit, result in self.entries.items():
+                self._write({'unit': unit, 'result': result})
+
+    def _load(self, key):
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or 'null')
+                if not header or header.get('key') != key:
+                    print("⚠️  Journal was written for different inputs, starting over")
+                    return {}
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Interrupted while writing this line
+                    entries[entry['unit']] = entry['result']
+        except (OSError, ValueError):
+            return {}
+        return entries
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def __contains__(self, unit):
+        return unit in self.entries
+
+    def __getitem__(self, unit):
+        return self.entries[unit]
+
+    def record(self, unit, result):
+        """Append a finished unit (result must be JSON-serializable)."""
+        with self._lock:
+            self.entries[unit] = result
+            if self._file is not None:
+                self._write({'unit': unit, 'result': result})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """The run finished - close and delete the journal."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def add_resume_argument(parser):
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted run from its progress journal (.cache/journal/)")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-host rate limiting for all wiki requests.
+Every request goes through one pooled keep-alive requests.Session and waits
+for a token from its host's bucket. A bucket speeds up while the host
+answers quickly and backs off on 429 / 503: the rate is halved and the host
+is paused for Retry-After (or an exponential backoff) before the request is
+retried. This replaces the fixed sleeps the scrapers used to do.
+"""
+
+import email.utils
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+POOL_SIZE = 16        # Keep-alive connections per host (>= download_icons --workers)
+MAX_RETRIES = 3       # Retries of a throttled request (429 / 503)
+MAX_RETRY_AFTER = 120  # Never pause a host for longer than this (seconds)
+THROTTLE_STATUS = (429, 503)
+FAST_RESPONSE = 1.0   # Faster answers raise the rate...
+SLOW_RESPONSE = 5.0   # ...slower ones lower it
+RATE_STEP = 0.25      # Requests/s added per fast response
+BACKOFF = 0.5         # Rate factor on 429 / 503
+
+# Requests per second: (start, min, max)
+HOST_RATES = {
+    'arc-raiders.fandom.com': (2.0, 0.2, 8.0),
+    'arcraiders.wiki': (2.0, 0.2, 8.0),
+    'static.wikia.nocookie.net': (5.0, 0.5, 20.0),
+}
+DEFAULT_RATE = (2.0, 0.2, 8.0)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    """Token bucket for one host whose rate adapts to the host's responses."""
+
+    def __init__(self, host, rate, min_rate, max_rate, burst=2):
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the host may be sent another request."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def feedback(self, status, seconds, retry_after=None, attempt=0):
+        """Adapt the rate to a response; returns the pause in seconds after a throttled one."""
+        with self.lock:
+            if status in THROTTLE_STATUS:
+                self.rate = max(self.min_rate, self.rate * BACKOFF)
+                pause = retry_after if retry_after is not None else 2 ** attempt
+                pause = min(pause, MAX_RETRY_AFTER)
+                self.tokens = 0.0
+                self.updated = time.monotonic()
+                self.paused_until = max(self.paused_until, self.updated + pause)
+                return pause
+            if status >= 500 or seconds >= SLOW_RESPONSE:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            elif seconds < FAST_RESPONSE:
+                self.rate = min(self.max_rate, self.rate + RATE_STEP)
+            return 0.0
+
+
+_session = None
+_limiters = {}
+_lock = threading.Lock()
+
+
+def get_session():
+    """The shared keep-alive session (created on first use)."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(HOST_RATES) + 2, pool_maxsize=POOL_SIZE)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+            _session.headers['User-Agent'] = USER_AGENT
+    return _session
+
+
+def get_limiter(host):
+    with _lock:
+        if host not in _limiters:
+            _limiters[host] = HostLimiter(host, *HOST_RATES.get(host, DEFAULT_RATE))
+    return _limiters[host]
+
+
+def get(url, headers=None, timeout=10, stream=False):
+    """Rate-limited GET on the pooled session, retrying 429 / 503 after a backoff.
+
+    The returned response carries the number of retries as response.retries.
+    """
+    limiter = get_limiter(urlparse(url).netloc)
+    attempt = 0
+    while True:
+        limiter.acquire()
+        start = time.monotonic()
+        response = get_session().get(url, headers=headers, timeout=timeout, stream=stream)
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        pause = limiter.feedback(response.status_code, time.monotonic() - start, retry_after, attempt)
+        if response.status_code not in THROTTLE_STATUS or attempt >= MAX_RETRIES:
+            response.retries = attempt
+            return response
+        print(f"  ⏳ {limiter.host} answered {response.status_code}, waiting {pause:.0f}s "
+              f"(now {limiter.rate:.2f} requests/s)")
+        response.close()
+        attempt += 1
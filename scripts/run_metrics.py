@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for scraper runs.
+Records per stage of a run every HTTP request (latency, bytes, cache hit or
+miss, retries), the HTML parse time per page and the time spent turning
+table rows into records. When the script exits a JSON report is written to
+data/metrics/<script>.json; with --profile a cProfile dump (<script>.prof)
+is written next to it, with --trace-memory the tracemalloc peak per stage
+is added (tracing slows the run down, so it is off by default).
+
+Nothing is recorded until a script's main() calls configure(), so modules
+imported by other tools (e.g. the benchmarks) run uninstrumented.
+"""
+
+import atexit
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+METRICS_DIR = os.path.join(project_root, 'data', 'metrics')
+MAIN_STAGE = 'main'  # Everything outside an explicit stage()
+
+
+class Stage:
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.peak = 0
+        self.timers = {}  # name -> {'count', 'seconds', 'max_seconds', 'items'}
+
+
+class Recorder:
+    """Metrics of one script run; safe to use from worker threads."""
+
+    def __init__(self, script, profile=False, trace_memory=False):
+        self.script = script
+        self.trace_memory = trace_memory
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.stages = {MAIN_STAGE: Stage(MAIN_STAGE)}
+        self.current = self.stages[MAIN_STAGE]
+        self.requests = []
+        self.pages = []
+        self.lock = threading.Lock()
+        self.profiler = cProfile.Profile() if profile else None
+
+    def add_timer(self, name, seconds, items=0):
+        with self.lock:
+            timer = self.current.timers.setdefault(name, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'items': 0})
+            timer['count'] += 1
+            timer['seconds'] += seconds
+            timer['max_seconds'] = max(timer['max_seconds'], seconds)
+            timer['items'] += items
+
+
+_recorder = None
+
+
+def configure(script, profile=False, trace_memory=False):
+    """Start recording for a script run; the report is written at exit."""
+    global _recorder
+    _recorder = Recorder(script, profile=profile, trace_memory=trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if _recorder.profiler is not None:
+        _recorder.profiler.enable()
+    atexit.register(write_report)
+
+
+def update_peak(recorder, stage):
+    """Fold the tracemalloc peak since the last call into a stage (with --trace-memory)"""
+    if recorder.trace_memory:
+        stage.peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Attribute everything recorded inside the block to a named stage."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    with recorder.lock:
+        previous = recorder.current
+        current = recorder.current = recorder.stages.setdefault(name, Stage(name))
+    update_peak(recorder, previous)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current.seconds += time.perf_counter() - start
+        update_peak(recorder, current)
+        with recorder.lock:
+            recorder.current = previous
+
+
+@contextlib.contextmanager
+def timed(name, items=0):
+    """Add the time spent in the block to a timer of the current stage."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_timer(name, time.perf_counter() - start, items)
+
+
+def timed_iter(name, items):
+    """Iterate over items, timing the whole loop (including its body) as one timer entry."""
+    if _recorder is None:
+        return items
+    return _timed_iter(name, items)
+
+
+def _timed_iter(name, items):
+    count = 0
+    start = time.perf_counter()
+    try:
+        for item in items:
+            count += 1
+            yield item
+    finally:
+        _recorder.add_timer(name, time.perf_counter() - start, count)
+
+
+def record_request(url, status, seconds, size, cache, retries=0, error=None):
+    """Record one HTTP request; cache is hit, revalidated, known-missing, miss, offline-miss or disabled."""
+    recorder = _recorder
+    if recorder is None:
+        return
+    entry = {
+        'stage': recorder.current.name,
+        'url': url,
+        'status': status,
+        'seconds': round(seconds, 4),
+        'bytes': size,
+        'cache': cache,
+        'retries': retries,
+    }
+    if error:
+        entry['error'] = error
+    with recorder.lock:
+        recorder.requests.append(entry)
+
+
+def record_page(url, seconds, memo=False):
+    """Record the parse of one page (memo: the result came from the parse cache)."""
+    recorder = _recorder
+    if recorder is None:
+        return
+    with recorder.lock:
+        recorder.pages.append({'stage': recorder.current.name, 'url': url, 'seconds': round(seconds, 4), 'memo': memo})
+
+
+def summarize_requests(requests):
+    summary = {'count': len(requests), 'bytes': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+               'retries': 0, 'errors': 0, 'cache': {}, 'status': {}}
+    for request in requests:
+        summary['bytes'] += request['bytes'] or 0
+        summary['seconds'] += request['seconds']
+        summary['max_seconds'] = max(summary['max_seconds'], request['seconds'])
+        summary['retries'] += request['retries']
+        summary['errors'] += 1 if 'error' in request else 0
+        summary['cache'][request['cache']] = summary['cache'].get(request['cache'], 0) + 1
+        status = str(request['status'])
+        summary['status'][status] = summary['status'].get(status, 0) + 1
+    summary['seconds'] = round(summary['seconds'], 3)
+    return summary
+
+
+def build_report(recorder):
+    update_peak(recorder, recorder.current)
+    stages = {}
+    for name, stage in recorder.stages.items():
+        requests = [r for r in recorder.requests if r['stage'] == name]
+        pages = [p for p in recorder.pages if p['stage'] == name]
+        if name == MAIN_STAGE and not (requests or pages or stage.timers) and len(recorder.stages) > 1:
+            continue
+        timers = {}
+        for timer_name, timer in stage.timers.items():
+            timers[timer_name] = dict(timer, seconds=round(timer['seconds'], 4), max_seconds=round(timer['max_seconds'], 4))
+            if timer['items']:
+                timers[timer_name]['ms_per_item'] = round(timer['seconds'] * 1000 / timer['items'], 4)
+        stages[name] = {
+            'seconds': round(stage.seconds, 3),
+            'peak_memory_kib': round(stage.peak / 1024) if recorder.trace_memory else None,
+            'requests': summarize_requests(requests),
+            'pages': {'count': len(pages), 'memo': sum(1 for p in pages if p['memo']),
+                      'seconds': round(sum(p['seconds'] for p in pages), 4)},
+            'timers': timers,
+        }
+    return {
+        'script': recorder.script,
+        'argv': sys.argv[1:],
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(recorder.started_at)),
+        'seconds': round(time.perf_counter() - recorder.started, 3),
+        'peak_memory_kib': (round(max(stage.peak for stage in recorder.stages.values()) / 1024)
+                            if recorder.trace_memory else None),
+        'stages': stages,
+        'requests': recorder.requests,
+        'pages': recorder.pages,
+    }
+
+
+def write_report():
+    """Write data/metrics/<script>.json (and the cProfile dump) and print a short summary."""
+    global _recorder
+    recorder = _recorder
+    if recorder is None:
+        return
+    _recorder = None
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    report = build_report(recorder)
+    path = os.path.join(METRICS_DIR, f"{recorder.script}.json")
+    if recorder.profiler is not None:
+        recorder.profiler.disable()
+        profile_path = os.path.join(METRICS_DIR, f"{recorder.script}.prof")
+        recorder.profiler.dump_stats(profile_path)
+        report['profile'] = os.path.relpath(profile_path, project_root)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    peak = f", peak {report['peak_memory_kib'] / 1024:.1f} MiB" if report['peak_memory_kib'] is not None else ''
+    print(f"\n📊 Metrics: {os.path.relpath(path, project_root)} ({report['seconds']:.1f}s{peak})")
+    for name, stage in report['stages'].items():
+        requests = stage['requests']
+        cache = ', '.join(f"{count} {kind}" for kind, count in sorted(requests['cache'].items()))
+        line = f"  {name:10} {stage['seconds']:7.1f}s  {requests['count']} requests"
+        if requests['count']:
+            line += f" ({cache}), {requests['bytes'] / 1024:.0f} KiB, {requests['seconds']:.1f}s in requests"
+        for timer_name, timer in stage['timers'].items():
+            line += f", {timer_name} {timer['seconds']:.2f}s"
+        print(line)
+    if 'profile' in report:
+        print(f"  🔥 Profile: {report['profile']} (snakeviz / flameprof / python -m pstats)")
+
+
+def add_metrics_arguments(parser):
+    """Add the shared --profile / --trace-memory / --no-metrics options to an argparse parser."""
+    group = parser.add_argument_group('metrics')
+    group.add_argument('--profile', action='store_true',
+                       help="Also write a cProfile dump to data/metrics/<script>.prof")
+    group.add_argument('--trace-memory', action='store_true',
+                       help="Record the peak memory per stage with tracemalloc (slows the run down)")
+    group.add_argument('--no-metrics', action='store_true',
+                       help="Do not record metrics or write data/metrics/<script>.json")
+
+
+def configure_from_args(args, script):
+    if not args.no_metrics:
+        configure(script, profile=args.profile, trace_memory=args.trace_memory)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Run the data refresh pipeline: every script as a stage of a dependency graph
+Stages are ordered by the files they read and write. Independent stages run
+in parallel, except that only one stage reads from the wiki at a time (each
+script paces its requests on its own and they share titles.json in the HTTP
+cache). A stage is skipped when its script (including the local
+modules it imports), its arguments and the contents of its input files are
+unchanged since its last successful run. Stages that read from the wiki
+only run again with --refresh (or when their inputs changed).
+
+State and per-stage logs are kept in .cache/pipeline/.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+PIPELINE_DIR = os.path.join(project_root, '.cache', 'pipeline')
+STATE_FILE = os.path.join(PIPELINE_DIR, 'state.json')
+
+
+class Stage:
+    """One script run; inputs and outputs are paths relative to the project root."""
+
+    def __init__(self, name, script, args=(), inputs=(), outputs=(), network=False):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.network = network  # Reads from the wiki (accepts the HTTP cache options, never runs alongside another)
+
+
+STAGES = [
+    Stage('data', 'extract_all_data.py',
+          outputs=['data/materials-info.json', 'data/workshop_level_ups.json', 'data/expedition_projects.json'],
+          network=True),
+    Stage('recipes', 'extract_recipes.py', args=['--async'],
+          inputs=['data/workshop_level_ups.json'],
+          outputs=['data/crafting_recipes.json', 'data/upgrade_recipes.json'],
+          network=True),
+    Stage('icons', 'download_icons.py', args=['--workers', '4'],
+          inputs=['data/items.json'],
+          outputs=['data/items.json', 'frontend/public/icons/manifest.json'],
+          network=True),
+    Stage('icon-build', 'build_icons.py',
+          inputs=['data/items.json', 'frontend/public/icons/manifest.json'],
+          outputs=['frontend/public/icons/build/sprite.json']),
+    Stage('bundle', 'build_data_bundle.py',
+          inputs=['data/items.json'],
+          outputs=['frontend/public/data-bundle.json']),
+    Stage('manifest', 'build_data_manifest.py',
+          inputs=['frontend/public/data-bundle.json', 'frontend/public/icons/build/sprite.json'],
+          outputs=['frontend/public/data-manifest.json']),
+    Stage('compress', 'compress_assets.py',
+          inputs=['data/materials-info.json', 'data/workshop_level_ups.json', 'data/expedition_projects.json',
+                  'data/crafting_recipes.json', 'data/upgrade_recipes.json',
+                  'frontend/public/icons/build/sprite.json', 'frontend/public/data-bundle.json',
+                  'frontend/public/data-manifest.json'],
+          outputs=['docs/asset-sizes.json']),
+    Stage('check', 'check_missing_recipes.py',
+          inputs=['data/workshop_level_ups.json', 'data/crafting_recipes.json']),
+    Stage('checklist', 'create_recipe_checklist.py',
+          inputs=['data/workshop_level_ups.json', 'data/crafting_recipes.json'],
+          outputs=['docs/RECIPE_CHECKLIST.md']),
+]
+
+
+def dependencies(stages):
+    """{stage name: names of the stages producing its inputs}"""
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            producers.setdefault(path, set()).add(stage.name)
+    return {
+        stage.name: {dep for path in stage.inputs for dep in producers.get(path, ()) if dep != stage.name}
+        for stage in stages
+    }
+
+
+def topological_order(stages):
+    """Stage names with every stage after its dependencies; raises on cycles."""
+    deps = dependencies(stages)
+    order, done, visiting = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise SystemExit(f"Pipeline has a dependency cycle through stage '{name}'")
+        visiting.add(name)
+        for dep in sorted(deps[name]):
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for stage in stages:
+        visit(stage.name)
+    return order
+
+
+def local_modules(script):
+    """The script and the modules from scripts/ it imports, recursively"""
+    seen = []
+    pending = [os.path.splitext(script)[0]]
+    while pending:
+        module = pending.pop()
+        path = os.path.join(script_dir, f"{module}.py")
+        if module in seen or not os.path.exists(path):
+            continue
+        seen.append(module)
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split('.')[0])
+    return sorted(seen)
+
+
+def fingerprint(stage):
+    """Hash of everything that decides a stage's result, besides the wiki itself"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([stage.script, stage.args]).encode('utf-8'))
+    files = [os.path.join('scripts', f"{module}.py") for module in local_modules(stage.script)] + stage.inputs
+    for path in files:
+        digest.update(path.encode('utf-8') + b'\0')
+        try:
+            with open(os.path.join(project_root, path), 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except FileNotFoundError:
+            digest.update(b'missing')
+    return digest.hexdigest()
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(PIPELINE_DIR, exist_ok=True)
+    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def skip_reason(stage, state, refresh, force):
+    """Why a stage may be skipped, or None if it has to run"""
+    if force or (refresh and stage.network):
+        return None
+    previous = state.get(stage.name)
+    if not previous or previous.get('fingerprint') != fingerprint(stage):
+        return None
+    if not all(os.path.exists(os.path.join(project_root, path)) for path in stage.outputs):
+        return None
+    return "inputs and script unchanged"
+
+
+def run_stage(stage, extra_args):
+    """Run one stage script; returns (returncode, seconds). Output goes to its log file."""
+    os.makedirs(PIPELINE_DIR, exist_ok=True)
+    log_path = os.path.join(PIPELINE_DIR, f"{stage.name}.log")
+    command = [sys.executable, os.path.join(script_dir, stage.script)] + stage.args + extra_args
+    env = dict(os.environ, PYTHONIOENCODING='utf-8', PYTHONUNBUFFERED='1')
+    start = time.time()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run(command, cwd=project_root, stdout=log, stderr=subprocess.STDOUT, env=env)
+    return result.returncode, time.time() - start
+
+
+def run_pipeline(targets=None, jobs=4, refresh=False, force=False, dry_run=False, cache_args=()):
+    """Run the stages (or only targets and what they depend on). Returns True if nothing failed."""
+    stages = {stage.name: stage for stage in STAGES}
+    order = topological_order(STAGES)
+    deps = dependencies(STAGES)
+
+    if targets:
+        unknown = [name for name in targets if name not in stages]
+        if unknown:
+            raise SystemExit(f"Unknown stage(s): {', '.join(unknown)} (available: {', '.join(order)})")
+        wanted = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(deps[name])
+        order = [name for name in order if name in wanted]
+
+    state = load_state()
+    status = {}   # name -> 'ran' | 'skipped' | 'failed' | 'blocked'
+    running = {}  # future -> name
+
+    def ready(name):
+        if name in status or name in running.values() or not all(dep in status for dep in deps[name]):
+            return False
+        # Per-host rate limits are per process: wiki stages take turns instead of adding up
+        return not (stages[name].network and any(stages[other].network for other in running.values()))
+
+    def start_ready(executor):
+        for name in order:
+            if not ready(name):
+                continue
+            stage = stages[name]
+            blocked = [dep for dep in deps[name] if status.get(dep) in ('failed', 'blocked')]
+            if blocked:
+                status[name] = 'blocked'
+                print(f"⛔ {name}: not run, {', '.join(blocked)} failed")
+                continue
+            upstream_ran = any(status.get(dep) == 'ran' for dep in deps[name])
+            reason = skip_reason(stage, state, refresh, force)
+            if dry_run:
+                # Upstream stages did not really run, so their outputs are unchanged here
+                would_run = reason is None or any(status.get(dep) == 'would run' for dep in deps[name])
+                status[name] = 'would run' if would_run else 'skipped'
+                print(f"{'▶️ ' if would_run else '⏭️ '} {name}: {'would run' if would_run else 'skip - ' + reason}")
+                continue
+            if reason is not None:
+                status[name] = 'skipped'
+                suffix = " (upstream output identical)" if upstream_ran else ""
+                print(f"⏭️  {name}: skipped - {reason}{suffix}")
+                continue
+            print(f"▶️  {name}: {stage.script} {' '.join(stage.args)}".rstrip())
+            extra_args = list(cache_args) if stage.network else []
+            running[executor.submit(run_stage, stage, extra_args)] = name
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        start_ready(executor)
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                returncode, seconds = future.result()
+                log_path = os.path.relpath(os.path.join(PIPELINE_DIR, f"{name}.log"), project_root)
+                if returncode == 0:
+                    status[name] = 'ran'
+                    # Fingerprint after the run: stages may rewrite their own inputs
+                    state[name] = {'fingerprint': fingerprint(stages[name]), 'finished_at': time.time()}
+                    save_state(state)
+                    print(f"✅ {name}: done in {seconds:.1f}s (log: {log_path})")
+                else:
+                    status[name] = 'failed'
+                    print(f"❌ {name}: failed with exit code {returncode} after {seconds:.1f}s (log: {log_path})")
+            start_ready(executor)
+
+    counts = {}
+    for value in status.values():
+        counts[value] = counts.get(value, 0) + 1
+    print(f"\n{'='*60}")
+    print("Summary: " + ", ".join(f"{count} {name}" for name, count in sorted(counts.items())))
+    print(f"{'='*60}")
+    return not any(value in ('failed', 'blocked') for value in status.values())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the data refresh pipeline, skipping unchanged stages")
+    parser.add_argument('stages', nargs='*',
+                        help=f"Only run these stages and what they depend on ({', '.join(stage.name for stage in STAGES)})")
+    parser.add_argument('--jobs', '-j', type=int, default=4, help="Stages to run in parallel (default: 4)")
+    parser.add_argument('--refresh', action='store_true', help="Run the stages that read from the wiki again")
+    parser.add_argument('--force', action='store_true', help="Run every stage, even if nothing changed")
+    parser.add_argument('--dry-run', action='store_true', help="Only show which stages would run")
+    parser.add_argument('--offline', action='store_true', help="Pass --offline to the wiki stages (HTTP cache only)")
+    parser.add_argument('--list', action='store_true', help="Show the stages and their dependencies")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.list:
+        deps = dependencies(STAGES)
+        for name in topological_order(STAGES):
+            after = ', '.join(sorted(deps[name])) or '-'
+            print(f"  {name:12} after: {after}")
+        return
+
+    print("=" * 60)
+    print("ARC Raiders - Data Pipeline")
+    print("=" * 60)
+    ok = run_pipeline(
+        targets=args.stages, jobs=args.jobs, refresh=args.refresh, force=args.force,
+        dry_run=args.dry_run, cache_args=['--offline'] if args.offline else []
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Plan which items to recycle for a material goal
+Given the materials you need (e.g. an expedition project stage or the raw
+bill of a craft target), picks how many of each item to recycle so that the
+yields cover every need while giving up the least sell value (--objective
+value) or recycling the fewest items (--objective count).
+
+Solved exactly as an integer program when PuLP (pip install pulp) or SciPy
+(pip install scipy, uses scipy.optimize.milp) is installed, otherwise with a
+fast greedy heuristic. Both take a few milliseconds for the whole catalog.
+
+Usage:
+    python3 scripts/salvage_optimizer.py --project Foundation
+    python3 scripts/salvage_optimizer.py "150x Metal Parts" "80x ARC Alloy" --objective count
+    python3 scripts/salvage_optimizer.py --craft "Ferro IV" --stock stash.json
+"""
+
+import argparse
+import json
+import time
+
+import catalog
+from bill_of_materials import BomResolver, RecipeCycleError, parse_target
+
+try:
+    import pulp
+except ImportError:
+    pulp = None
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, milp
+except ImportError:
+    milp = None
+
+TIE_BREAK = 1e-4  # Secondary objective weight (value for --objective count, item count for value)
+DEFAULT_TIME_LIMIT = 5  # Seconds for the ILP solvers
+
+
+class Plan:
+    """Items to recycle for a material goal"""
+    __slots__ = ('needs', 'recycle', 'obtained', 'unreachable', 'solver', 'optimal', 'feasible', 'elapsed')
+
+    def __init__(self, needs, recycle, obtained, unreachable, solver, optimal, feasible, elapsed):
+        self.needs = needs              # {material: quantity} that items can yield
+        self.recycle = recycle          # {item: count}
+        self.obtained = obtained        # {material: quantity} the recycled items yield (only needed materials)
+        self.unreachable = unreachable  # {material: quantity} no item yields
+        self.solver = solver
+        self.optimal = optimal
+        self.feasible = feasible        # False if the stock limits cannot cover the needs
+        self.elapsed = elapsed
+
+    def sell_value(self, items):
+        return sum(count * (items[name].sell_price or 0) for name, count in self.recycle.items())
+
+    def to_dict(self, items):
+        return {
+            'needs': self.needs, 'unreachable': self.unreachable,
+            'recycle': self.recycle, 'obtained': self.obtained,
+            'items': sum(self.recycle.values()), 'sell_value': self.sell_value(items),
+            'solver': self.solver, 'optimal': self.optimal, 'feasible': self.feasible,
+        }
+
+
+def canonical_needs(data, needs):
+    """({material: quantity} items can yield, {material: quantity} no item yields), names as in the catalog"""
+    by_lower = {material.lower(): material for material in data.materials}
+    reachable, unreachable = {}, {}
+    for material, quantity in needs.items():
+        name = by_lower.get(material.lower())
+        target = reachable if name else unreachable
+        name = name or material
+        target[name] = target.get(name, 0) + quantity
+    return reachable, unreachable
+
+
+def candidates(data, needs, stock=None):
+    """[(item, {material: yield} of the needed materials)] of the items that yield any of them"""
+    result = []
+    for item in data.items.values():
+        yields = {material: quantity for material, quantity in item.recycles or () if material in needs}
+        if yields and (stock is None or stock.get(item.name, 0) > 0):
+            result.append((item, yields))
+    return result
+
+
+def item_cost(item, objective):
+    price = item.sell_price or 0
+    if objective == 'count':
+        return 1 + TIE_BREAK * price
+    return price + TIE_BREAK
+
+
+def solve_greedy(needs, options, objective, stock=None):
+    """Weighted set multicover heuristic: repeatedly recycle the item with the most
+    (normalized) missing yield per cost, then drop copies that turned out redundant"""
+    remaining = dict(needs)
+    recycle = {}
+    while any(quantity > 0 for quantity in remaining.values()):
+        best, best_ratio = None, 0
+        for item, yields in options:
+            if stock is not None and recycle.get(item.name, 0) >= stock.get(item.name, 0):
+                continue
+            gain = sum(min(quantity, remaining[material]) / needs[material]
+                       for material, quantity in yields.items() if remaining[material] > 0)
+            ratio = gain / item_cost(item, objective)
+            if ratio > best_ratio:
+                best, best_ratio = (item, yields), ratio
+        if best is None:
+            break  # Stock exhausted
+        item, yields = best
+        # Take as many copies at once as stay fully useful
+        copies = max(1, min(remaining[material] // quantity
+                            for material, quantity in yields.items() if remaining[material] > 0))
+        if stock is not None:
+            copies = min(copies, stock[item.name] - recycle.get(item.name, 0))
+        recycle[item.name] = recycle.get(item.name, 0) + copies
+        for material, quantity in yields.items():
+            remaining[material] -= copies * quantity
+
+    # Remove copies the later picks made unnecessary, most expensive first
+    options_by_name = {item.name: (item, yields) for item, yields in options}
+    for name in sorted(recycle, key=lambda name: -item_cost(options_by_name[name][0], objective)):
+        yields = options_by_name[name][1]
+        while recycle[name] > 0 and all(remaining[material] + quantity <= 0 for material, quantity in yields.items()):
+            recycle[name] -= 1
+            for material, quantity in yields.items():
+                remaining[material] += quantity
+    feasible = all(quantity <= 0 for quantity in remaining.values())
+    return {name: count for name, count in recycle.items() if count}, False, feasible
+
+
+def solve_pulp(needs, options, objective, stock=None, time_limit=DEFAULT_TIME_LIMIT):
+    problem = pulp.LpProblem('salvage', pulp.LpMinimize)
+    variables = {
+        item.name: pulp.LpVariable(f"x{index}", lowBound=0, cat='Integer',
+                                   upBound=stock.get(item.name, 0) if stock is not None else None)
+        for index, (item, _) in enumerate(options)
+    }
+    problem += pulp.lpSum(item_cost(item, objective) * variables[item.name] for item, _ in options)
+    for material, quantity in needs.items():
+        problem += pulp.lpSum(yields[material] * variables[item.name]
+                              for item, yields in options if material in yields) >= quantity
+    status = problem.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    if pulp.LpStatus[status] != 'Optimal':
+        return None
+    recycle = {name: round(variable.value()) for name, variable in variables.items() if round(variable.value() or 0)}
+    return recycle, True, True
+
+
+def solve_scipy(needs, options, objective, stock=None, time_limit=DEFAULT_TIME_LIMIT):
+    materials = list(needs)
+    costs = [item_cost(item, objective) for item, _ in options]
+    matrix = [[yields.get(material, 0) for _, yields in options] for material in materials]
+    upper = [stock.get(item.name, 0) if stock is not None else float('inf') for item, _ in options]
+    result = milp(costs, integrality=[1] * len(options), bounds=Bounds(0, upper),
+                  constraints=LinearConstraint(matrix, lb=[needs[material] for material in materials]),
+                  options={'time_limit': time_limit})
+    if result.x is None:
+        return None
+    recycle = {item.name: round(count) for (item, _), count in zip(options, result.x) if round(count)}
+    return recycle, result.status == 0, True
+
+
+def available_solvers():
+    solvers = []
+    if pulp is not None:
+        solvers.append(('pulp', solve_pulp))
+    if milp is not None:
+        solvers.append(('scipy', solve_scipy))
+    return solvers
+
+
+def optimize(needs, objective='value', solver='auto', stock=None, data=None):
+    """Plan for {material: quantity}; stock limits the copies per item ({item: count}, None = unlimited)"""
+    data = data or catalog.get_catalog()
+    started = time.perf_counter()
+    needs, unreachable = canonical_needs(data, needs)
+    options = candidates(data, needs, stock)
+
+    result, used = None, 'greedy'
+    if solver != 'greedy' and needs:
+        solvers = [entry for entry in available_solvers() if solver in ('auto', 'ilp', entry[0])]
+        if not solvers and solver != 'auto':
+            raise SystemExit(f"No ILP solver available for --solver {solver}: pip install pulp (or scipy)")
+        if solvers:
+            used, solve = solvers[0]
+            result = solve(needs, options, objective, stock)
+            if result is None:
+                print(f"⚠️  {used}: no complete plan (stock too small?), using the greedy heuristic")
+                used = 'greedy'
+    if result is None:
+        result = solve_greedy(needs, options, objective, stock)
+    recycle, optimal, feasible = result
+
+    yields_by_name = {item.name: yields for item, yields in options}
+    obtained = {material: 0 for material in needs}
+    for name, count in recycle.items():
+        for material, quantity in yields_by_name[name].items():
+            obtained[material] += count * quantity
+    recycle = dict(sorted(recycle.items(), key=lambda entry: (-entry[1], entry[0])))
+    return Plan(needs, recycle, obtained, unreachable, used, optimal, feasible, time.perf_counter() - started)
+
+
+def project_needs(data, name):
+    """{material: quantity} of the expedition project stages whose name starts with name"""
+    stages = [project for project in data.projects if project.name.lower().startswith(name.lower())]
+    if not stages:
+        raise SystemExit(f"No expedition project named {name!r} ({', '.join(p.name for p in data.projects)})")
+    needs = {}
+    for project in stages:
+        for material, quantity in project.materials:
+            needs[material] = needs.get(material, 0) + quantity
+    return needs
+
+
+def print_plan(plan, items):
+    print(f"\n{'='*60}")
+    print("Needed materials:")
+    for material, quantity in plan.needs.items():
+        print(f"  {quantity:>6}x {material:<32} -> {plan.obtained[material]}")
+    for material, quantity in plan.unreachable.items():
+        print(f"  {quantity:>6}x {material:<32} ⚠️  no item recycles into it")
+    print(f"\n♻️  Recycle ({sum(plan.recycle.values())} items):")
+    for name, count in plan.recycle.items():
+        price = items[name].sell_price
+        print(f"  {count:>6}x {name:<32} ({'$' + format(price, ',') if price is not None else '?'} each)")
+    print(f"\n💰 Sell value given up: ${plan.sell_value(items):,}")
+    if not plan.feasible:
+        print("⚠️  The stock cannot cover all needs - the plan is incomplete")
+    print(f"{'='*60}")
+    quality = 'optimal' if plan.optimal else 'heuristic'
+    print(f"⏱️  {plan.solver} ({quality}) in {plan.elapsed * 1000:.1f} ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Plan which items to recycle for a material goal")
+    parser.add_argument('needs', nargs='*', metavar='need', help='Materials to get, e.g. "150x Metal Parts"')
+    parser.add_argument('--project', action='append', default=[], metavar='NAME',
+                        help='Add the materials of an expedition project stage (e.g. "Foundation"); repeatable')
+    parser.add_argument('--craft', action='append', default=[], metavar='TARGET',
+                        help='Add the raw materials of a craft target (e.g. "2x Ferro IV"); repeatable')
+    parser.add_argument('--objective', choices=['value', 'count'], default='value',
+                        help="Minimize the sell value given up (default) or the number of items recycled")
+    parser.add_argument('--solver', choices=['auto', 'ilp', 'pulp', 'scipy', 'greedy'], default='auto',
+                        help="auto: ILP if PuLP or SciPy is installed, else greedy")
+    parser.add_argument('--stock', metavar='FILE', help='JSON {"item": count} of the items you have (default: unlimited)')
+    parser.add_argument('--json', metavar='FILE', help="Also write the plan as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    data = catalog.get_catalog()
+
+    needs = {}
+    def add(material, quantity):
+        needs[material] = needs.get(material, 0) + quantity
+    for text in args.needs:
+        add(*parse_target(text))
+    for name in args.project:
+        for material, quantity in project_needs(data, name).items():
+            add(material, quantity)
+    if args.craft:
+        targets = {}
+        for text in args.craft:
+            item, quantity = parse_target(text)
+            targets[item] = targets.get(item, 0) + quantity
+        try:
+            bill = BomResolver(data.recipes).resolve(targets)
+        except RecipeCycleError as e:
+            raise SystemExit(f"❌ {e}")
+        for material, quantity in bill.raw.items():
+            add(material, quantity)
+    if not needs:
+        raise SystemExit("No needs: name materials or use --project/--craft")
+
+    stock = None
+    if args.stock:
+        with open(args.stock, 'r', encoding='utf-8') as f:
+            stock = json.load(f)
+
+    plan = optimize(needs, args.objective, args.solver, stock, data)
+    print_plan(plan, data.items)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(plan.to_dict(data.items), f, indent=2, ensure_ascii=False)
+        print(f"💾 Plan saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
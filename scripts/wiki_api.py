@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+MediaWiki API access for the wiki scrapers.
+Title resolution: the page names guessed per item (with and without the
+I-IV tier suffix, both apostrophe styles) are checked in batches of 50 with
+action=query, which also follows redirects. Every crawl target then maps to
+exactly one canonical page URL before any page content is fetched, and
+names that do not exist are never requested. Resolved titles are kept in the
+HTTP cache (titles.json) for the --missing-ttl period.
+
+--fetch api additionally fetches the pages with action=parse. The API
+returns just the article HTML (div.mw-parser-output) without the fandom
+skin, so the table extractors consume it unchanged.
+
+All requests go through http_cache, so caching, --offline and the rate
+limiter apply as usual. wiki_api_server.py is a local stand-in for testing.
+"""
+
+import json
+import re
+import threading
+from urllib.parse import urlencode, urlparse, unquote
+
+import http_cache
+
+BATCH_SIZE = 50  # Max titles per action=query request for normal clients
+# api.php location per wiki (MediaWiki default is /w/api.php, fandom serves it at the root)
+API_PATHS = {
+    'https://arc-raiders.fandom.com': '/api.php',
+    'https://arcraiders.wiki': '/w/api.php',
+}
+DEFAULT_API_PATH = '/w/api.php'
+TIER_SUFFIX = re.compile(r'\s+(I|II|III|IV)$')
+APOSTROPHES = ("'", "’")  # ASCII and typographic
+
+_fetch_mode = 'html'
+_resolve = False
+_api_server = None   # Stand-in server serving every wiki as <server>/<host>/api.php
+_titles = None       # page URL -> existing page title (redirects followed) or None
+_failed_bases = set()  # Wikis whose title query failed; their names are guessed for the rest of the run
+_titles_lock = threading.Lock()
+
+
+def configure(fetch='html', api_server=None, resolve=False):
+    """Select how pages are fetched: 'html' (the /wiki/ pages) or 'api'.
+
+    resolve: check guessed page names with batched title queries (always on with 'api')
+    """
+    global _fetch_mode, _api_server, _resolve, _titles
+    _fetch_mode = fetch
+    _resolve = resolve
+    _api_server = api_server.rstrip('/') if api_server else None
+    with _titles_lock:
+        _titles = None
+        _failed_bases.clear()
+
+
+def uses_api():
+    return _fetch_mode == 'api'
+
+
+def resolves_titles():
+    return _resolve or uses_api()
+
+
+def apostrophe_variants(wiki_name):
+    """The page name as given, then with ASCII and with typographic apostrophes"""
+    variants = [wiki_name] + [wiki_name.replace(other, apostrophe)
+                              for apostrophe in APOSTROPHES for other in APOSTROPHES if other != apostrophe]
+    return list(dict.fromkeys(variants))
+
+
+def title_variations(item_name):
+    """Page names an item may live under: its own name, then without the I-IV tier suffix"""
+    variations = apostrophe_variants(item_name.replace(' ', '_'))
+    base_name = TIER_SUFFIX.sub('', item_name)
+    if base_name != item_name:
+        variations += apostrophe_variants(base_name.replace(' ', '_'))
+    return list(dict.fromkeys(variations))
+
+
+def variation_urls(variations, base_urls):
+    """URL groups of a crawl target: one group per page name, one URL per wiki in each"""
+    return [[f"{base_url}/wiki/{wiki_name}" for base_url in base_urls] for wiki_name in variations]
+
+
+def split_page_url(url):
+    """('https://host', 'Title') of a https://host/wiki/Title URL"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}", unquote(parsed.path.split('/wiki/', 1)[1])
+
+
+def api_url(base_url, params):
+    if _api_server:
+        endpoint = f"{_api_server}/{urlparse(base_url).netloc}/api.php"
+    else:
+        endpoint = base_url + API_PATHS.get(base_url, DEFAULT_API_PATH)
+    return f"{endpoint}?{urlencode(dict(params, format='json', formatversion=2))}"
+
+
+def query_titles(base_url, titles, timeout=15):
+    """Check titles in batches; returns {title: existing page title or None}.
+
+    Redirects are followed, so the result is the title whose content a
+    /wiki/<title> request would show.
+    """
+    resolved = {}
+    titles = list(dict.fromkeys(titles))
+    for i in range(0, len(titles), BATCH_SIZE):
+        batch = titles[i:i + BATCH_SIZE]
+        response = http_cache.cached_get(
+            api_url(base_url, {'action': 'query', 'titles': '|'.join(batch), 'redirects': 1}), timeout=timeout
+        )
+        response.raise_for_status()
+        query = json.loads(response.content).get('query', {})
+        normalized = {entry['from']: entry['to'] for entry in query.get('normalized', [])}
+        redirects = {entry['from']: entry['to'] for entry in query.get('redirects', [])}
+        existing = {page['title'] for page in query.get('pages', [])
+                    if not page.get('missing') and not page.get('invalid')}
+        for title in batch:
+            target = normalized.get(title, title)
+            target = redirects.get(target, target)
+            resolved[title] = target if target in existing else None
+    return resolved
+
+
+def _known_titles():
+    """The resolved titles, loaded from the HTTP cache on first use (call with _titles_lock held)"""
+    global _titles
+    if _titles is None:
+        cache = http_cache.get_cache()
+        _titles = cache.load_titles() if cache is not None else {}
+    return _titles
+
+
+def resolve_urls(urls):
+    """Look up the page title behind every /wiki/ URL not resolved yet (batched per wiki).
+    Does nothing unless --resolve or --fetch api is used."""
+    if not resolves_titles():
+        return
+    with _titles_lock:
+        known = _known_titles()
+        pending = [url for url in dict.fromkeys(urls) if url not in known]
+        failed = set(_failed_bases)
+    by_base = {}
+    for url in pending:
+        base_url, title = split_page_url(url)
+        if base_url not in failed:
+            by_base.setdefault(base_url, []).append((url, title))
+    for base_url, entries in by_base.items():
+        try:
+            resolved = query_titles(base_url, [title for _, title in entries])
+        except Exception as e:
+            print(f"  ⚠️  {base_url}: title query failed ({e}), guessing page names instead")
+            with _titles_lock:
+                _failed_bases.add(base_url)
+            continue
+        titles = {url: resolved[title] for url, title in entries}
+        with _titles_lock:
+            _known_titles().update(titles)
+            cache = http_cache.get_cache()
+            if cache is not None:
+                cache.store_titles(titles)
+
+
+def resolved_title(url, default=None):
+    """Title resolved for url, None if the page does not exist, default if it was not checked."""
+    if not resolves_titles():
+        return default
+    with _titles_lock:
+        return _known_titles().get(url, default)
+
+
+def page_url(base_url, title):
+    """Canonical /wiki/ URL of an existing page title"""
+    url = f"{base_url}/wiki/{title.replace(' ', '_')}"
+    with _titles_lock:
+        _known_titles()[url] = title
+    return url
+
+
+def resolve_target(url_groups):
+    """Reduce a crawl target (see variation_urls) to the one page its walk would end on.
+
+    Returns [[canonical url]], [] if none of the pages exists, or the groups
+    unchanged if a URL before the first existing page could not be checked.
+    """
+    unchecked = object()
+    for urls in url_groups:
+        for url in urls:
+            title = resolved_title(url, unchecked)
+            if title is unchecked:
+                return url_groups
+            if title is not None:
+                return [[page_url(split_page_url(url)[0], title)]]
+    return []
+
+
+def resolve_targets(targets):
+    """Resolve all crawl targets with as few batched title queries as possible"""
+    if not resolves_titles():
+        return targets
+    resolve_urls(url for url_groups in targets for urls in url_groups for url in urls)
+    return [resolve_target(url_groups) for url_groups in targets]
+
+
+def resolve_item_url(item_name, base_url):
+    """The one page URL for an item name, or None if no page exists for it.
+    Without title resolution (or if the query failed) the first guessed name is used."""
+    url_groups = variation_urls(title_variations(item_name), [base_url])
+    target = resolve_targets([url_groups])[0]
+    return target[0][0] if target else None
+
+
+def fetch_parsed(base_url, title, timeout=10):
+    """The article HTML of an existing page via action=parse, as a CachedResponse."""
+    response = http_cache.cached_get(
+        api_url(base_url, {'action': 'parse', 'page': title, 'prop': 'text', 'redirects': 1,
+                           'disableeditsection': 1, 'disablelimitreport': 1}),
+        timeout=timeout
+    )
+    if response.status_code != 200:
+        return response
+    data = json.loads(response.content)
+    if 'error' in data:
+        status = 404 if data['error'].get('code') == 'missingtitle' else 502
+        return http_cache.CachedResponse(response.url, status, retries=getattr(response, 'retries', 0))
+    html = data['parse']['text']
+    # The API URL stays the response URL, so parse results are cached per API answer
+    return http_cache.CachedResponse(response.url, 200, html.encode('utf-8'), {'Content-Type': 'text/html'},
+                                     from_cache=getattr(response, 'from_cache', False),
+                                     retries=getattr(response, 'retries', 0))
+
+
+def get_page(url, timeout=10):
+    """Fetch a /wiki/ page in the configured mode; drop-in for http_cache.cached_get.
+    Pages the title queries found missing are answered with 404 without a request."""
+    if uses_api():
+        resolve_urls([url])
+    base_url, title = split_page_url(url)
+    title = resolved_title(url, title)  # Not checked: request the name as is
+    if title is None:
+        return http_cache.CachedResponse(url, 404)
+    if not uses_api():
+        return http_cache.cached_get(url, timeout=timeout)
+    return fetch_parsed(base_url, title, timeout=timeout)
+
+
+def add_fetch_arguments(parser):
+    """Add the shared --fetch / --api-server / --resolve options to an argparse parser."""
+    group = parser.add_argument_group('fetch mode')
+    group.add_argument('--fetch', choices=['html', 'api'], default='html',
+                       help="Fetch /wiki/ pages (html, default) or use the MediaWiki API in batches (api)")
+    group.add_argument('--api-server', default=None, metavar='URL',
+                       help="Send API requests to a stand-in server (see wiki_api_server.py)")
+    group.add_argument('--resolve', action='store_true',
+                       help="Check the guessed page names with batched title queries first (always on with --fetch api)")
+
+
+def configure_from_args(args):
+    configure(fetch=args.fetch, api_server=args.api_server, resolve=args.resolve)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the wiki MediaWiki API, for testing --fetch api offline
+Serves recorded wiki pages under http://<listen>/<wiki host>/:
+- /<host>/api.php?action=query&titles=A|B&redirects=1  (max 50 titles)
+- /<host>/api.php?action=parse&page=A                  (article HTML only)
+- /<host>/wiki/<Title>                                  (the full page)
+Pages come from an HTTP cache directory (e.g. benchmarks/fixtures/http) or a
+directory tree <dir>/<host>/wiki/<Title>. Point the scrapers at it with
+--fetch api --api-server http://127.0.0.1:8765
+"""
+
+import argparse
+import glob
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+import page_parser
+from wiki_api import BATCH_SIZE
+
+def normalize_title(title):
+    """MediaWiki title normalization: underscores become spaces, first letter upper case"""
+    title = title.replace('_', ' ').strip()
+    return title[:1].upper() + title[1:]
+
+def split_wiki_url(url):
+    parsed = urlparse(url)
+    if '/wiki/' not in parsed.path:
+        return None, None
+    return parsed.netloc, normalize_title(unquote(parsed.path.split('/wiki/', 1)[1]))
+
+def load_from_cache(cache_dir):
+    """{host: {title: html}} of every page stored in an HTTP cache directory"""
+    pages = {}
+    for meta_path in glob.glob(os.path.join(cache_dir, '*.json')):
+        if meta_path.endswith('.parsed.json'):
+            continue
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        host, title = split_wiki_url(meta.get('url', ''))
+        body_path = meta_path[:-len('.json')] + '.body'
+        if host and os.path.exists(body_path):
+            with open(body_path, 'rb') as f:
+                pages.setdefault(host, {})[title] = f.read()
+    return pages
+
+def load_from_tree(pages_dir):
+    """{host: {title: html}} of the files <pages_dir>/<host>/wiki/<Title>"""
+    pages = {}
+    for path in glob.glob(os.path.join(pages_dir, '*', 'wiki', '*')):
+        host = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        with open(path, 'rb') as f:
+            pages.setdefault(host, {})[normalize_title(os.path.basename(path))] = f.read()
+    return pages
+
+class WikiApiHandler(BaseHTTPRequestHandler):
+    pages = {}      # host -> {title: html}
+    redirects = {}  # host -> {title: target title}
+    quiet = False
+
+    def send_json(self, data):
+        self.send_body(200, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def send_body(self, status, body, content_type='text/html'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def resolve(self, host, title):
+        """(normalized title, redirect target or None, existing title or None)"""
+        normalized = normalize_title(title)
+        target = self.redirects.get(host, {}).get(normalized)
+        final = target or normalized
+        return normalized, target, final if final in self.pages.get(host, {}) else None
+
+    def query(self, host, params):
+        titles = params.get('titles', [''])[0].split('|')
+        if len(titles) > BATCH_SIZE:
+            return {'error': {'code': 'toomanyvalues', 'info': f"Too many values supplied for parameter \"titles\". The limit is {BATCH_SIZE}."}}
+        query = {'normalized': [], 'redirects': [], 'pages': []}
+        seen = set()
+        follow = params.get('redirects', ['0'])[0] not in ('0', '')
+        for title in titles:
+            normalized, target, existing = self.resolve(host, title)
+            if normalized != title:
+                query['normalized'].append({'fromencoded': False, 'from': title, 'to': normalized})
+            if target and follow:
+                query['redirects'].append({'from': normalized, 'to': target})
+            page_title = (target if follow else None) or normalized
+            if page_title in seen:
+                continue
+            seen.add(page_title)
+            if existing:
+                query['pages'].append({'pageid': sorted(self.pages[host]).index(existing) + 1, 'ns': 0, 'title': page_title})
+            else:
+                query['pages'].append({'ns': 0, 'title': page_title, 'missing': True})
+        return {'batchcomplete': True, 'query': {key: value for key, value in query.items() if value}}
+
+    def parse(self, host, params):
+        _, _, existing = self.resolve(host, params.get('page', [''])[0])
+        if existing is None:
+            return {'error': {'code': 'missingtitle', 'info': "The page you specified doesn't exist."}}
+        main_content = page_parser.parse_main_content(self.pages[host][existing])
+        return {'parse': {'title': existing, 'pageid': sorted(self.pages[host]).index(existing) + 1,
+                          'text': str(main_content) if main_content is not None else ''}}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        host, _, path = url.path.lstrip('/').partition('/')
+        if path == 'api.php':
+            params = parse_qs(url.query)
+            action = params.get('action', [''])[0]
+            if action == 'query':
+                return self.send_json(self.query(host, params))
+            if action == 'parse':
+                return self.send_json(self.parse(host, params))
+            return self.send_json({'error': {'code': 'badvalue', 'info': f"Unrecognized value for parameter \"action\": {action}."}})
+        if path.startswith('wiki/'):
+            _, _, existing = self.resolve(host, unquote(path[len('wiki/'):]))
+            if existing:
+                return self.send_body(200, self.pages[host][existing])
+        self.send_body(404, b'Not Found', 'text/plain')
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the wiki MediaWiki API")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--from-cache', metavar='DIR', help="Serve the pages stored in an HTTP cache directory")
+    source.add_argument('--pages', metavar='DIR', help="Serve the files <DIR>/<host>/wiki/<Title>")
+    parser.add_argument('--redirects', metavar='FILE',
+                        help='JSON {"<host>": {"<Title>": "<Target>"}} of redirect pages')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--quiet', action='store_true', help="Do not log requests")
+    args = parser.parse_args()
+
+    pages = load_from_cache(args.from_cache) if args.from_cache else load_from_tree(args.pages)
+    redirects = {}
+    if args.redirects:
+        with open(args.redirects, 'r', encoding='utf-8') as f:
+            redirects = {host: {normalize_title(k): normalize_title(v) for k, v in entries.items()}
+                         for host, entries in json.load(f).items()}
+
+    WikiApiHandler.pages = pages
+    WikiApiHandler.redirects = redirects
+    WikiApiHandler.quiet = args.quiet
+    server = ThreadingHTTPServer((args.host, args.port), WikiApiHandler)
+    for host, host_pages in sorted(pages.items()):
+        print(f"  {host}: {len(host_pages)} pages")
+    print(f"🧪 Wiki API stand-in on http://{args.host}:{args.port} (--fetch api --api-server http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
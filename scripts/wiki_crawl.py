@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Crawl engine shared by the recipe extractors.
+Walks wiki URL variations either sequentially or with an asyncio crawl that
+fetches pages concurrently (limited per host) and parses them as they arrive.
+Several walks ("channels") can share one crawl, so every page is fetched and
+parsed only once even if more than one extractor needs it.
+"""
+
+import asyncio
+import os
+import time
+from urllib.parse import urlparse
+
+import http_cache
+import page_parser
+import run_metrics
+import wiki_api
+
+DEFAULT_HOST_CONCURRENCY = 4
+
+
+MISSING_STATUS = http_cache.MISSING_STATUS  # Final answers, journaled like parsed pages
+
+
+def get_response(url):
+    """Fetch url through the HTTP cache (or the MediaWiki API with --fetch api).
+    Returns the response, or None on a network error."""
+    try:
+        return wiki_api.get_page(url, timeout=10)
+    except Exception:
+        return None
+
+
+def parse_content(parse, content):
+    """Run a record generator over a page.
+
+    Returns (records, complete). If parsing fails midway the records found so
+    far are kept but the page is not marked complete, so the crawl moves on
+    to the next variation just like the old inline try/except did.
+    """
+    records = []
+    try:
+        for record in parse(content):
+            records.append(record)
+    except Exception:
+        return records, False
+    return records, True
+
+
+def load_page(url, response, parse_page, parse_key=None):
+    """Parse a fetched page, reusing the cached parse result if the body is unchanged."""
+    cache = http_cache.get_cache()
+    cache_url = response.url  # The API request in --fetch api mode
+    start = time.perf_counter()
+    if parse_key and cache is not None and getattr(response, 'from_cache', False):
+        page = cache.load_parsed(cache_url, parse_key)
+        if page is not None:
+            run_metrics.record_page(url, time.perf_counter() - start, memo=True)
+            return page
+
+    page = parse_page(response.content)
+    run_metrics.record_page(url, time.perf_counter() - start)
+    if parse_key and cache is not None:
+        cache.store_parsed(cache_url, parse_key, page)
+    return page
+
+
+def finish_page(url, response, parse_page, parse_key=None, journal=None):
+    """Parse a 200 response (None for anything else) and journal the outcome.
+
+    Missing pages are journaled too, network errors and other statuses are
+    not, so a resumed run retries them.
+    """
+    if response is None:
+        return None
+    page = None
+    if response.status_code == 200:
+        page = load_page(url, response, parse_page, parse_key)
+    elif response.status_code not in MISSING_STATUS:
+        return None
+    if journal is not None:
+        journal.record(url, page)
+    return page
+
+
+def source_parse_key(source_files, *parts):
+    """Parse-cache key tied to the parser source code (and this module), the
+    HTML parser backend and the parser inputs."""
+    sources = []
+    for path in list(source_files) + [os.path.abspath(__file__)]:
+        with open(path, 'rb') as f:
+            sources.append(f.read())
+    return http_cache.make_parse_key(*sources, page_parser.get_backend(), *parts)
+
+
+def walk_variations(targets, on_records):
+    """Generator driving the URL walk: yields urls, receives parsed pages.
+
+    Every target is a list of URL groups (see wiki_api.variation_urls): one
+    group per wiki name variation, one URL per host. The URLs are tried in
+    order until one page parses completely. Pages already processed for an
+    earlier target are skipped.
+    """
+    processed_pages = set()
+    for url_groups in targets:
+        url = None
+        for urls in url_groups:
+            for url in urls:
+                if url in processed_pages:
+                    continue
+
+                page = yield url
+                if page is None:
+                    continue
+                records, complete = page
+                on_records(records)
+                if complete:
+                    processed_pages.add(url)
+                    break
+
+            if url in processed_pages:
+                break
+
+
+def channel_page(page, channel):
+    """Select one channel's (records, complete) from a parsed page."""
+    if page is None:
+        return None
+    return page[channel]
+
+
+class AsyncCrawler:
+    """Fetch and parse pages concurrently with a per-host concurrency limit.
+
+    Every URL is fetched at most once; callers asking for the same URL share
+    the in-flight task.
+    """
+
+    def __init__(self, parse_page, per_host=DEFAULT_HOST_CONCURRENCY, parse_key=None, journal=None):
+        self.parse_page = parse_page
+        self.parse_key = parse_key
+        self.journal = journal
+        self.per_host = per_host
+        self._limits = {}
+        self._pages = {}
+
+    def get(self, url):
+        task = self._pages.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            self._pages[url] = task
+        return task
+
+    async def _fetch(self, url):
+        if self.journal is not None and url in self.journal:
+            return self.journal[url]
+        host = urlparse(url).netloc
+        if host not in self._limits:
+            self._limits[host] = asyncio.Semaphore(self.per_host)
+        async with self._limits[host]:
+            response = await asyncio.to_thread(get_response, url)
+        if response is None:
+            return None
+        return await asyncio.to_thread(finish_page, url, response, self.parse_page, self.parse_key, self.journal)
+
+    async def prefetch(self, url_groups, channel):
+        """Walk one target's URLs until a page parses completely."""
+        for urls in url_groups:
+            for url in urls:
+                page = channel_page(await self.get(url), channel)
+                if page is not None and page[1]:
+                    return
+
+    async def walk(self, targets, channel, on_records):
+        # Results are merged in the same order as the sequential walk, so the
+        # output does not depend on which response happens to arrive first.
+        walker = walk_variations(targets, on_records)
+        try:
+            url = next(walker)
+            while True:
+                page = await self.get(url)
+                url = walker.send(channel_page(page, channel))
+        except StopIteration:
+            pass
+
+
+async def _crawl_async(walks, parse_page, per_host, parse_key, journal):
+    crawler = AsyncCrawler(parse_page, per_host, parse_key, journal)
+    prefetches = [
+        asyncio.ensure_future(crawler.prefetch(url_groups, channel))
+        for channel, (targets, _) in walks.items()
+        for url_groups in targets
+    ]
+    await asyncio.gather(*(
+        crawler.walk(targets, channel, on_records)
+        for channel, (targets, on_records) in walks.items()
+    ))
+    await asyncio.gather(*prefetches)
+
+
+def crawl_channels(walks, base_urls, parse_page, concurrency=None, parse_key=None, journal=None):
+    """Run several URL walks over one shared crawl.
+
+    walks maps a channel name to (targets, on_records). parse_page takes the
+    page content and returns {channel: (records, complete)} (see
+    parse_content), so each page is fetched and parsed once no matter how
+    many channels visit it. Records must be JSON-serializable.
+
+    With concurrency=None pages are fetched one at a time; otherwise an
+    asyncio crawl runs with at most `concurrency` requests per host. If
+    parse_key is given, parse results are cached next to the HTTP cache entry
+    and reused while the page is unchanged.
+
+    With a progress journal (see progress_journal.Journal) every finished
+    page is journaled, and pages journaled by an interrupted run are
+    replayed instead of fetched again.
+
+    With title resolution on (--resolve or --fetch api, see wiki_api) all
+    name variations are checked with batched title queries before the crawl.
+    Every target still walks its variations in order; names found missing
+    are answered with 404 instead of being requested.
+    """
+    walks = {
+        channel: ([wiki_api.variation_urls(variations, base_urls) for variations in targets], on_records)
+        for channel, (targets, on_records) in walks.items()
+    }
+    # One set of title queries for all channels
+    wiki_api.resolve_urls(url for targets, _ in walks.values() for url_groups in targets
+                          for urls in url_groups for url in urls)
+    if wiki_api.uses_api():
+        parse_key = http_cache.make_parse_key(parse_key, 'api') if parse_key else None
+    if journal is not None:
+        journal.start(parse_key or '')
+    if concurrency:
+        asyncio.run(_crawl_async(walks, parse_page, concurrency, parse_key, journal))
+        return
+
+    pages = {}
+    for channel, (targets, on_records) in walks.items():
+        walker = walk_variations(targets, on_records)
+        try:
+            url = next(walker)
+            while True:
+                if url not in pages:
+                    if journal is not None and url in journal:
+                        pages[url] = journal[url]
+                    else:
+                        response = get_response(url)
+                        pages[url] = finish_page(url, response, parse_page, parse_key, journal)
+                url = walker.send(channel_page(pages[url], channel))
+        except StopIteration:
+            pass
+
+
+def crawl_variations(targets, base_urls, parse, on_records, concurrency=None, parse_key=None, journal=None):
+    """Crawl a single walk; parse is a generator function yielding records for a page."""
+    crawl_channels(
+        {'': (targets, on_records)},
+        base_urls,
+        lambda content: {'': parse_content(parse, content)},
+        concurrency=concurrency,
+        parse_key=parse_key,
+        journal=journal
+    )
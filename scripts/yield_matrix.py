@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Item x material yield matrix for vectorized material queries
+Builds the recycle yields of items.json (via the catalog) once into a dense
+NumPy matrix (items x materials) with sell price and rarity vectors, so
+questions over the whole catalog become single array operations:
+
+    import yield_matrix
+    matrix = yield_matrix.get_matrix()
+    matrix.top_producers(5)                 # best 5 items per material
+    matrix.top_producers(5, per_dollar=True)
+    matrix.yield_per_dollar()               # items x materials
+    matrix.totals({'Candle Holder': 18})    # materials from recycling items
+
+Requires NumPy (pip install numpy); scipy is used for to_sparse() only.
+"""
+
+import argparse
+import functools
+import json
+
+import catalog
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class YieldMatrix:
+    """Recycle yields as arrays; row i is items[i], column j is materials[j]"""
+
+    def __init__(self, items, materials, yields, sell_prices, rarities):
+        self.items = items              # item names, items.json order
+        self.materials = materials      # material names, sorted
+        self.yields = yields            # int32 (items x materials)
+        self.sell_prices = sell_prices  # float64 per item, NaN if unknown
+        self.rarities = rarities        # int8 index into catalog.RARITIES per item, -1 if unknown
+        self.item_index = {name: i for i, name in enumerate(items)}
+        self.material_index = {name: j for j, name in enumerate(materials)}
+
+    @classmethod
+    def from_catalog(cls, data=None):
+        if np is None:
+            raise SystemExit("yield_matrix.py needs NumPy: pip install numpy")
+        data = data or catalog.get_catalog()
+        items = list(data.items.values())
+        materials = list(data.materials)
+        material_index = {name: j for j, name in enumerate(materials)}
+
+        yields = np.zeros((len(items), len(materials)), dtype=np.int32)
+        for i, item in enumerate(items):
+            for material, quantity in item.recycles or ():
+                yields[i, material_index[material]] = quantity
+        sell_prices = np.array([item.sell_price if item.sell_price is not None else np.nan for item in items],
+                               dtype=np.float64)
+        rarity_codes = {rarity: code for code, rarity in enumerate(catalog.RARITIES)}
+        rarities = np.array([rarity_codes.get(item.rarity, -1) for item in items], dtype=np.int8)
+        return cls([item.name for item in items], materials, yields, sell_prices, rarities)
+
+    def to_sparse(self):
+        """The yields as a scipy.sparse CSC matrix (one column per material)"""
+        from scipy import sparse
+        return sparse.csc_matrix(self.yields)
+
+    def yield_per_dollar(self):
+        """Yield per dollar of sell price (items x materials); 0 where the price is unknown or 0"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = self.yields / self.sell_prices[:, None]
+        return np.where(np.isfinite(ratio), ratio, 0.0)
+
+    def top_producers(self, k=5, per_dollar=False):
+        """{material: [(item, yield or yield per dollar)]} of the k best items per material"""
+        scores = self.yield_per_dollar() if per_dollar else self.yields
+        # Stable sort per column: equal scores keep the items.json order
+        top = np.argsort(-scores, axis=0, kind='stable')[:k]
+        top_scores = np.take_along_axis(scores, top, axis=0)
+        return {
+            material: [(self.items[i], score.item()) for i, score in zip(top[:, j], top_scores[:, j]) if score > 0]
+            for j, material in enumerate(self.materials)
+        }
+
+    def producer_counts(self):
+        """{material: number of items that yield it}"""
+        return dict(zip(self.materials, np.count_nonzero(self.yields, axis=0).tolist()))
+
+    def totals(self, counts):
+        """{material: quantity} obtained by recycling {item: count}"""
+        vector = np.zeros(len(self.items), dtype=np.int64)
+        for name, count in counts.items():
+            vector[self.item_index[name]] = count
+        obtained = vector @ self.yields
+        return {material: int(quantity) for material, quantity in zip(self.materials, obtained) if quantity}
+
+    def totals_by_rarity(self):
+        """{rarity: {material: yield summed over one of each item}}"""
+        one_hot = self.rarities[:, None] == np.arange(len(catalog.RARITIES))[None, :]
+        sums = one_hot.T.astype(np.int64) @ self.yields
+        return {rarity: {material: int(quantity) for material, quantity in zip(self.materials, row) if quantity}
+                for rarity, row in zip(catalog.RARITIES, sums)}
+
+
+@functools.lru_cache(maxsize=None)
+def get_matrix():
+    """The yield matrix of the default catalog, built once per process"""
+    return YieldMatrix.from_catalog()
+
+
+def print_top(top, per_dollar):
+    unit = ' per $1000' if per_dollar else ''
+    for material, producers in top.items():
+        print(f"\n{material}:")
+        if not producers:
+            print("  (no producers)")
+        for name, score in producers:
+            value = f"{score * 1000:.2f}" if per_dollar else f"{int(score)}x"
+            print(f"  {value:>8}{unit}  {name}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vectorized material queries over the item x material yield matrix")
+    parser.add_argument('materials', nargs='*', metavar='material', help="Only show these materials (default: all)")
+    parser.add_argument('--top', type=int, default=5, metavar='K', help="Producers to list per material (default: 5)")
+    parser.add_argument('--per-dollar', action='store_true', help="Rank by yield per dollar of sell price")
+    parser.add_argument('--json', metavar='FILE', help="Also write the result as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    matrix = get_matrix()
+    print(f"📊 {len(matrix.items)} items x {len(matrix.materials)} materials "
+          f"({int(np.count_nonzero(matrix.yields))} yields)")
+
+    top = matrix.top_producers(max(1, args.top), per_dollar=args.per_dollar)
+    if args.materials:
+        wanted = {name.lower() for name in args.materials}
+        top = {material: producers for material, producers in top.items() if material.lower() in wanted}
+        if not top:
+            raise SystemExit(f"Unknown materials: {', '.join(args.materials)}")
+    print_top(top, args.per_dollar)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(top, f, indent=2, ensure_ascii=False)
+        print(f"💾 Saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ pkgs.mkShell {
     python3
     python3Packages.requests
     python3Packages.beautifulsoup4
+    python3Packages.lxml
+    python3Packages.pillow
   ];
   
   shellHook = ''